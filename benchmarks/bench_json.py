@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+"""Cost of HTTPCommand.raise_from_response() and JSON decoding on large bodies
+
+raise_from_response() is compared to the previous implementation, which
+decoded every body to a str and parsed it with json. Response decoding
+compares Response.json() to HTTPCommand.decode_json().
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from requests import HTTPError, Response
+
+from wazo_lib_rest_client.command import HTTPCommand
+from wazo_lib_rest_client.json_backend import BACKEND
+
+
+def legacy_raise_from_response(response: Response) -> None:
+    try:
+        response.reason = json.loads(response.text)['message']
+    except (ValueError, KeyError, TypeError):
+        pass
+
+    response.raise_for_status()
+
+
+def _response(status_code: int, content: bytes, content_type: str) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers['Content-Type'] = content_type
+    # Without an explicit charset, Response.text runs charset detection
+    response.encoding = None
+    return response
+
+
+def _bodies(size: int) -> dict[str, Response]:
+    items = [
+        {'uuid': f'{i:032x}', 'firstname': 'Alice', 'lastname': 'Doe', 'lines': []}
+        for i in range(size // 80)
+    ]
+    listing = json.dumps({'items': items, 'total': len(items)}).encode()
+    error_page = (
+        b'<html><body>' + b'<p>Bad gateway</p>' * (size // 18) + b'</body></html>'
+    )
+    error = json.dumps({'message': 'Not found', 'details': {'uuid': 'x' * 32}}).encode()
+    return {
+        'success_listing': _response(200, listing, 'application/json'),
+        'html_error_page': _response(502, error_page, 'text/html'),
+        'large_json_error': _response(400, listing, 'application/json'),
+        'small_json_error': _response(404, error, 'application/json'),
+    }
+
+
+def _per_call_us(function: Callable[[], Any], number: int, repeat: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e6
+
+
+def _raising(
+    raise_from_response: Callable[[Response], None], response: Response
+) -> Callable[[], None]:
+    def call() -> None:
+        try:
+            raise_from_response(response)
+        except HTTPError:
+            pass
+
+    return call
+
+
+def _compare(before: float, after: float) -> dict[str, float]:
+    return {'before_us': before, 'after_us': after, 'speedup': before / after}
+
+
+def run(size: int = 1024 * 1024, number: int = 20, repeat: int = 5) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for name, response in _bodies(size).items():
+        before = _per_call_us(
+            _raising(legacy_raise_from_response, response), number, repeat
+        )
+        after = _per_call_us(
+            _raising(HTTPCommand.raise_from_response, response), number, repeat
+        )
+        results[f'raise_from_response.{name}'] = _compare(before, after)
+
+    listing = _bodies(size)['success_listing']
+    before = _per_call_us(listing.json, number, repeat)
+    after = _per_call_us(lambda: HTTPCommand.decode_json(listing), number, repeat)
+    results['decode.success_listing'] = _compare(before, after)
+
+    return {
+        'benchmark': 'json',
+        'backend': BACKEND,
+        'body_bytes': size,
+        'cases': results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=1024 * 1024)
+    parser.add_argument('--number', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.size, args.number, args.repeat), indent=2))
+
+
+if __name__ == '__main__':
+    main()
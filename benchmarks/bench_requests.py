@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+"""Overhead and throughput of the clients against a local stand-in server
+
+Measures the construction of a client, url(), the requests per second and
+latency percentiles of RESTCommand calls, and the memory used per request.
+Requests are sent with and without keep-alive, over HTTP and HTTPS (with a
+self-signed certificate), from threads and from asyncio tasks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import tempfile
+import threading
+import time
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import requests
+from standin import StandInServer, self_signed_certificate
+
+from wazo_lib_rest_client.client import BaseClient
+from wazo_lib_rest_client.example_cmd import ExampleCommand
+from wazo_lib_rest_client.json_backend import BACKEND
+
+UUID = '6f8ab1b0-7b1c-4d5e-9e2a-3c4b5a6d7e8f'
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+    example: ExampleCommand
+
+
+def _per_call_us(function: Callable[[], Any], number: int, repeat: int = 5) -> float:
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e6
+
+
+def _summarize(latencies: list[float], elapsed: float) -> dict[str, float]:
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentiles[49] * 1000,
+        'p99_ms': percentiles[98] * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000,
+    }
+
+
+def measure_overhead(number: int) -> dict[str, Any]:
+    client = Client('localhost', 9486, version='1.0')
+    return {
+        'construction_us': _per_call_us(
+            lambda: Client('localhost', 9486, version='1.0'), number
+        ),
+        'load_plugins_us': _per_call_us(client._load_plugins, number),
+        'url_base_us': _per_call_us(client.url, number * 10),
+        'url_fragments_us': _per_call_us(
+            lambda: client.url('users', UUID, 'lines'), number * 10
+        ),
+    }
+
+
+def _client_kwargs(port: int, ca: str | None, keep_alive: bool) -> dict[str, Any]:
+    return {
+        'host': '127.0.0.1',
+        'port': port,
+        'version': '1.0',
+        'https': ca is not None,
+        'verify_certificate': ca or False,
+        'keep_alive': keep_alive,
+    }
+
+
+def measure_sync(
+    port: int, ca: str | None, keep_alive: bool, total: int, concurrency: int
+) -> dict[str, float]:
+    client = Client(**_client_kwargs(port, ca, keep_alive), pool_maxsize=concurrency)
+    client.example.test()
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def worker(count: int) -> None:
+        samples = []
+        for _ in range(count):
+            start = time.perf_counter()
+            client.example.test()
+            samples.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(samples)
+
+    threads = [
+        threading.Thread(target=worker, args=(total // concurrency,))
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    client.close()
+    return _summarize(latencies, elapsed)
+
+
+def measure_async(
+    port: int, ca: str | None, keep_alive: bool, total: int, concurrency: int
+) -> dict[str, float]:
+    from wazo_lib_rest_client.async_client import AsyncBaseClient
+
+    class AsyncClient(AsyncBaseClient):
+        namespace = 'test_rest_client.async_commands'
+
+    async def run() -> dict[str, float]:
+        kwargs = _client_kwargs(port, ca, keep_alive)
+        del kwargs['keep_alive']
+        client = AsyncClient(
+            **kwargs,
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency if keep_alive else 0,
+        )
+        latencies: list[float] = []
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                start = time.perf_counter()
+                await client.example.test()
+                latencies.append(time.perf_counter() - start)
+
+        async with client:
+            await client.example.test()
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(worker(total // concurrency) for _ in range(concurrency))
+            )
+            elapsed = time.perf_counter() - start
+        return _summarize(latencies, elapsed)
+
+    return asyncio.run(run())
+
+
+def measure_memory(port: int, total: int) -> dict[str, float]:
+    client = Client(**_client_kwargs(port, None, keep_alive=True))
+    for _ in range(50):
+        client.example.test()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(total):
+        client.example.test()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    client.close()
+    return {
+        'requests': total,
+        'retained_bytes_per_request': (after - before) / total,
+        'peak_bytes': peak - before,
+    }
+
+
+def _environment() -> dict[str, Any]:
+    environment = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'requests': requests.__version__,
+        'json_backend': BACKEND,
+    }
+    try:
+        import httpx
+
+        environment['httpx'] = httpx.__version__
+    except ImportError:
+        pass
+    return environment
+
+
+def run(
+    total: int = 2000,
+    concurrency: int = 8,
+    https: bool = True,
+    use_async: bool = True,
+) -> dict[str, Any]:
+    results: dict[str, Any] = {
+        'benchmark': 'requests',
+        'environment': _environment(),
+        'overhead': measure_overhead(number=200),
+    }
+
+    # requests prefers these variables to the verify setting of the session,
+    # which would reject the self-signed certificate
+    for variable in ('REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE'):
+        os.environ.pop(variable, None)
+
+    throughput: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        schemes: dict[str, tuple[str, str] | None] = {'http': None}
+        certificate = self_signed_certificate(directory) if https else None
+        if certificate is not None:
+            schemes['https'] = certificate
+        elif https:
+            results['skipped'] = ['https: openssl is not installed']
+
+        for scheme, cert in schemes.items():
+            with StandInServer(cert) as server:
+                ca = cert[0] if cert else None
+                for keep_alive in (False, True):
+                    mode = 'keep_alive' if keep_alive else 'close'
+                    args = (server.port, ca, keep_alive, total, concurrency)
+                    throughput[f'sync.{scheme}.{mode}'] = measure_sync(*args)
+                    if use_async:
+                        throughput[f'async.{scheme}.{mode}'] = measure_async(*args)
+
+                if scheme == 'http':
+                    results['memory'] = measure_memory(server.port, total // 4)
+
+    results['throughput'] = throughput
+    results['parameters'] = {'requests': total, 'concurrency': concurrency}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--no-https', dest='https', action='store_false')
+    parser.add_argument('--no-async', dest='use_async', action='store_false')
+    parser.add_argument('-o', '--output', help='write the results to this file')
+    args = parser.parse_args()
+
+    results = run(args.requests, args.concurrency, args.https, args.use_async)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
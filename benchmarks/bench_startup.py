@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+"""Cold start cost of a client: import, plugin loading and construction
+
+Each sample runs in a fresh interpreter, once loading the plugins through
+stevedore and once through a generated plugin index.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any
+
+from wazo_lib_rest_client.plugins import PLUGIN_INDEX_ENV, write_index
+
+NAMESPACE = 'test_rest_client.commands'
+
+SAMPLE = f'''
+import time
+start = time.perf_counter()
+from wazo_lib_rest_client.client import BaseClient
+
+class Client(BaseClient):
+    namespace = {NAMESPACE!r}
+
+Client('localhost', 1234)
+print(time.perf_counter() - start)
+'''
+
+
+def _sample(env: dict[str, str]) -> float:
+    output = subprocess.check_output([sys.executable, '-c', SAMPLE], env=env)
+    return float(output)
+
+
+def _summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        'median_ms': statistics.median(samples) * 1000,
+        'min_ms': min(samples) * 1000,
+        'max_ms': max(samples) * 1000,
+    }
+
+
+def run(repeat: int = 20) -> dict[str, Any]:
+    env = dict(os.environ)
+    env.pop(PLUGIN_INDEX_ENV, None)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path = os.path.join(directory, 'index.json')
+        write_index(index_path, [NAMESPACE])
+        indexed_env = dict(env, **{PLUGIN_INDEX_ENV: index_path})
+
+        stevedore = [_sample(env) for _ in range(repeat)]
+        indexed = [_sample(indexed_env) for _ in range(repeat)]
+
+    return {
+        'benchmark': 'startup',
+        'repeat': repeat,
+        'stevedore': _summarize(stevedore),
+        'plugin_index': _summarize(indexed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat), indent=2))
+
+
+if __name__ == '__main__':
+    main()
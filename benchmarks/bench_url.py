@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+"""Per-call cost of BaseClient.url(), compared to the previous implementation
+
+The previous implementation formatted the base URL on every call.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from typing import Any
+
+from wazo_lib_rest_client.client import BaseClient
+
+UUID = '5e4a4e02-3ea5-4e3c-8d8f-2d8c1fc4bb3b'
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+def legacy_url(client: BaseClient, *fragments: str) -> str:
+    base = client._url_fmt.format(
+        scheme='https' if client._https else 'http',
+        host=client.host,
+        port=f':{client.port}' if client.port else '',
+        prefix=client._prefix,
+        version=f'/{client._version}' if client._version else '',
+    )
+    if fragments:
+        path = '/'.join(str(fragment) for fragment in fragments)
+        base = f"{base}/{path}"
+    return base
+
+
+def _per_call_ns(function: Any, number: int, repeat: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e9
+
+
+def run(number: int = 100_000, repeat: int = 5) -> dict[str, Any]:
+    client = Client('localhost', 9486, version='1.1', prefix='api/confd')
+    cases = {
+        'base': (),
+        'resource': ('users',),
+        'item': ('users', UUID, 'lines'),
+    }
+
+    results: dict[str, Any] = {}
+    for name, fragments in cases.items():
+        assert client.url(*fragments) == legacy_url(client, *fragments)
+        before = _per_call_ns(lambda: legacy_url(client, *fragments), number, repeat)
+        after = _per_call_ns(lambda: client.url(*fragments), number, repeat)
+        results[name] = {
+            'before_ns': before,
+            'after_ns': after,
+            'speedup': before / after,
+        }
+    return {'benchmark': 'url', 'number': number, 'cases': results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.number, args.repeat), indent=2))
+
+
+if __name__ == '__main__':
+    main()
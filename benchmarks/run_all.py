@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+"""Run every benchmark and write their results as a single JSON document
+
+The document is meant to be kept between runs, to compare the results of two
+revisions of the library.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import subprocess
+from typing import Any
+
+import bench_json
+import bench_requests
+import bench_startup
+import bench_url
+
+
+def _revision() -> str | None:
+    try:
+        output = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.strip()
+
+
+def run(quick: bool = False) -> dict[str, Any]:
+    scale = 10 if quick else 1
+    return {
+        'revision': _revision(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'results': [
+            bench_startup.run(repeat=20 // scale),
+            bench_url.run(number=100_000 // scale),
+            bench_json.run(number=20 // scale),
+            bench_requests.run(total=2000 // scale),
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='fewer iterations')
+    parser.add_argument('-o', '--output', help='write the results to this file')
+    args = parser.parse_args()
+
+    output = json.dumps(run(args.quick), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+"""Local HTTP server standing in for a Wazo service in the benchmarks
+
+It answers every GET with a small JSON document, keeps connections alive
+unless asked to close them, and can serve HTTPS with a self-signed certificate.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Self
+
+BODY = b'{"uuid": "6f8ab1b0-7b1c-4d5e-9e2a-3c4b5a6d7e8f", "name": "bench"}'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Send each response in a single segment, without waiting for ACKs
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    do_HEAD = do_GET
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, certificate: tuple[str, str] | None = None) -> None:
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        if certificate is not None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(*certificate)
+            # The handshake happens in the thread handling the connection
+            self.socket = context.wrap_socket(
+                self.socket, server_side=True, do_handshake_on_connect=False
+            )
+        self._thread = threading.Thread(
+            target=self.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def self_signed_certificate(directory: str) -> tuple[str, str] | None:
+    """Create a certificate for 127.0.0.1, None when openssl is not installed"""
+    openssl = shutil.which('openssl')
+    if openssl is None:
+        return None
+
+    certificate = os.path.join(directory, 'server.crt')
+    key = os.path.join(directory, 'server.key')
+    # fmt: off
+    subprocess.run(
+        [
+            openssl, 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+            '-keyout', key, '-out', certificate, '-days', '1',
+            '-subj', '/CN=localhost',
+            '-addext', 'subjectAltName=IP:127.0.0.1,DNS:localhost',
+        ],
+        check=True,
+        capture_output=True,
+    )
+    # fmt: on
+    return certificate, key
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-# Copyright 2015-2025 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0+
 
 from setuptools import find_packages, setup
@@ -18,9 +18,25 @@ setup(
     url='http://wazo.community',
     packages=find_packages(),
     install_requires=REQUIREMENTS,
+    extras_require={
+        'async': ['httpx'],
+        'orjson': ['orjson'],
+        'http2': ['httpx[http2]'],
+        'compression': [
+            'brotli',
+            'zstandard',
+            'backports.zstd; python_version < "3.14"',
+        ],
+    },
     entry_points={
+        'console_scripts': [
+            'wazo-rest-client-plugin-index = wazo_lib_rest_client.plugin_index:main',
+        ],
         'test_rest_client.commands': [
             'example = wazo_lib_rest_client.example_cmd:ExampleCommand',
         ],
+        'test_rest_client.async_commands': [
+            'example = wazo_lib_rest_client.example_async_cmd:AsyncExampleCommand',
+        ],
     },
 )
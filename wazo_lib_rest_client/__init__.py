@@ -1,6 +1,7 @@
-# Copyright 2014-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2014-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0+
 
+from .batch import BatchRequest, BatchResult
 from .command import HTTPCommand, RESTCommand
 
-__all__ = ['HTTPCommand', 'RESTCommand']
+__all__ = ['BatchRequest', 'BatchResult', 'HTTPCommand', 'RESTCommand']
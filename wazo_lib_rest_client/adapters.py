@@ -0,0 +1,63 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from contextvars import ContextVar
+from typing import Any
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+# The command whose session sends the requests, set by HTTPCommand.session and
+# reset by BaseClient.session
+current_command: ContextVar[Any] = ContextVar('current_command', default=None)
+
+
+class AdapterWrapper(BaseAdapter):
+    """Adapter delegating to another one, to add behavior around each request
+
+    Subclasses override _send(), which receives the keyword arguments of send().
+    """
+
+    def __init__(self, adapter: BaseAdapter) -> None:
+        super().__init__()
+        self.adapter = adapter
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: float | tuple[float, float] | tuple[float, None] | None = None,
+        verify: bool | str = True,
+        cert: bytes | str | tuple[bytes | str, bytes | str] | None = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> Response:
+        kwargs = {
+            'stream': stream,
+            'timeout': timeout,
+            'verify': verify,
+            'cert': cert,
+            'proxies': proxies,
+        }
+        return self._send(request, kwargs)
+
+    def _send(self, request: PreparedRequest, kwargs: dict[str, Any]) -> Response:
+        return self.adapter.send(request, **kwargs)
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+class SharedAdapter(AdapterWrapper):
+    """Adapter mounted on several sessions, left open when one of them closes
+
+    Its owner closes it with close_shared(), once no session uses it.
+    """
+
+    def close(self) -> None:
+        pass
+
+    def close_shared(self) -> None:
+        self.adapter.close()
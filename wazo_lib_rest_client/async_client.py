@@ -0,0 +1,337 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import logging
+import ssl
+import time
+from types import TracebackType
+from typing import Any, Self
+
+import httpx
+
+from .adapters import current_command
+from .balancing import Endpoint, EndpointGroup, route
+from .client import BaseClient
+from .coalescing import RequestCoalescer, is_coalescing_enabled
+from .compression import CompressionCounters, CompressionPolicy, command_compression
+from .ratelimit import RateLimiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+class CoalescingTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, coalescer: RequestCoalescer
+    ) -> None:
+        self.transport = transport
+        self.coalescer = coalescer
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = self.coalescer.key(request.method, str(request.url), request.headers)
+        if key is None or not is_coalescing_enabled():
+            return await self.transport.handle_async_request(request)
+
+        async def send() -> httpx.Response:
+            response = await self.transport.handle_async_request(request)
+            # The body is shared with the other callers, it must be read once
+            await response.aread()
+            return response
+
+        def copy(response: httpx.Response) -> httpx.Response:
+            # The shared body is already decoded
+            headers = response.headers.copy()
+            headers.pop('Content-Encoding', None)
+            return httpx.Response(
+                response.status_code,
+                headers=headers,
+                content=response.content,
+                request=request,
+                extensions=response.extensions,
+            )
+
+        return await self.coalescer.run_async(key, send, copy)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class CompressionTransport(httpx.AsyncBaseTransport):
+    """Negotiates compressed responses and compresses the large request bodies
+
+    httpx decodes the codings of the Accept-Encoding header it sends by
+    default, which is narrowed down and ordered with the policy.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        policy: CompressionPolicy,
+        counters: CompressionCounters,
+    ) -> None:
+        self.transport = transport
+        self.policy = policy
+        self.counters = counters
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        policy = command_compression(self.policy)
+        headers = request.headers.copy()
+        supported = headers.get('Accept-Encoding', '').replace(' ', '').split(',')
+        headers['Accept-Encoding'] = policy.accept_encoding(supported)
+        stream = request.stream
+        if isinstance(stream, httpx.ByteStream) and 'Content-Encoding' not in headers:
+            body = request.read()
+            content = policy.compress(body)
+            if content is not None:
+                headers['Content-Encoding'] = policy.request_encoding or ''
+                headers['Content-Length'] = str(len(content))
+                self.counters.record_request(len(body), len(content))
+                stream = httpx.ByteStream(content)
+        request = httpx.Request(
+            request.method,
+            request.url,
+            headers=headers,
+            stream=stream,
+            extensions=request.extensions,
+        )
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class LoadBalancingTransport(httpx.AsyncBaseTransport):
+    """Sends the requests to the client's host to one of its endpoints
+
+    Ejected endpoints are re-added without a probe once their ejection ends.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        group: EndpointGroup,
+        host: str,
+        port: int | None,
+    ) -> None:
+        self.transport = transport
+        self.group = group
+        self.host = host
+        self.port = port
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = self.group.acquire()
+        url = route(str(request.url), self.host, self.port, endpoint)
+        if url is not None:
+            routed_url = httpx.URL(url)
+            headers = request.headers.copy()
+            headers['Host'] = routed_url.netloc.decode('ascii')
+            request = httpx.Request(
+                request.method,
+                routed_url,
+                headers=headers,
+                stream=request.stream,
+                extensions=request.extensions,
+            )
+        start = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError:
+            self.group.release(endpoint, failed=True)
+            raise
+        except BaseException:
+            self.group.release(endpoint)
+            raise
+        failed = response.status_code in self.group.failure_statuses
+        self.group.release(endpoint, time.perf_counter() - start, failed)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class RateLimitingTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, limiter: RateLimiter
+    ) -> None:
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        tenant = request.headers.get('Wazo-Tenant') or None
+        await self.limiter.acquire_async(tenant)
+        status_code = retry_after = None
+        try:
+            response = await self.transport.handle_async_request(request)
+            status_code = response.status_code
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        finally:
+            self.limiter.release(tenant, status_code, retry_after)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+# Arguments of BaseClient configuring its requests adapters, which have no
+# asynchronous transport
+_SYNC_ONLY_ARGUMENTS = frozenset(
+    [
+        'keep_alive',
+        'pool_connections',
+        'pool_maxsize',
+        'pool_block',
+        'pool_idle_timeout',
+        'response_cache',
+        'instrumentation',
+        'retry_policy',
+        'circuit_breaker',
+        'connection_pools',
+        'token_provider',
+    ]
+)
+
+
+class AsyncBaseClient(BaseClient):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        version: str = '',
+        token: str | None = None,
+        tenant: str | None = None,
+        https: bool = True,
+        timeout: int = 10,
+        verify_certificate: bool | str = True,
+        prefix: str | None = None,
+        user_agent: str = '',
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        **kwargs: Any,
+    ) -> None:
+        unsupported = sorted(_SYNC_ONLY_ARGUMENTS.intersection(kwargs))
+        if unsupported:
+            raise TypeError(
+                f'Asynchronous clients do not support {", ".join(unsupported)}'
+            )
+        super().__init__(
+            host,
+            port,
+            version=version,
+            token=token,
+            tenant=tenant,
+            https=https,
+            timeout=timeout,
+            verify_certificate=verify_certificate,
+            prefix=prefix,
+            user_agent=user_agent,
+            **kwargs,
+        )
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._async_session: httpx.AsyncClient | None = None
+
+    def session(self) -> httpx.AsyncClient:  # type: ignore[override]
+        # Requests sent directly through the client do not belong to a command
+        current_command.set(None)
+        self._check_fork()
+
+        # The event loop is single threaded: no lock is needed to share the session
+        session = self._async_session
+        if session is None or session.is_closed:
+            # Connections are kept alive: the static headers of the synchronous
+            # sessions would close them
+            headers = {'User-agent': self._user_agent} if self._user_agent else {}
+            session = self._async_session = httpx.AsyncClient(
+                transport=self._build_transport(),
+                timeout=self.timeout,
+                headers=headers,
+            )
+        self._set_session_headers(session.headers)
+        return session
+
+    def _reset_after_fork(self) -> None:
+        super()._reset_after_fork()
+        # The session belongs to the event loop of the parent
+        self._async_session = None
+
+    def _build_transport(self) -> httpx.AsyncBaseTransport:
+        transport: httpx.AsyncBaseTransport
+        try:
+            transport = httpx.AsyncHTTPTransport(
+                verify=self._build_verify(), limits=self._limits, http2=self._http2
+            )
+        except ImportError:
+            logger.warning('HTTP/2 requires httpx[http2], using HTTP/1.1')
+            transport = httpx.AsyncHTTPTransport(
+                verify=self._build_verify(), limits=self._limits
+            )
+        if self.compression_policy is not None:
+            transport = CompressionTransport(
+                transport, self.compression_policy, self._compression_counters
+            )
+        if self.endpoints is not None:
+            transport = LoadBalancingTransport(
+                transport, self.endpoints, self.host, self.port
+            )
+        if self.rate_limiter is not None:
+            transport = RateLimitingTransport(transport, self.rate_limiter)
+        if self.request_coalescer is not None:
+            transport = CoalescingTransport(transport, self.request_coalescer)
+        return transport
+
+    def _build_verify(self) -> ssl.SSLContext | bool:
+        if not self._https or not self._verify_certificate:
+            return False
+        if isinstance(self._verify_certificate, str):
+            return ssl.create_default_context(cafile=self._verify_certificate)
+        return True
+
+    async def aclose(self) -> None:
+        if self._async_session is not None:
+            await self._async_session.aclose()
+            self._async_session = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def _probe_endpoint(  # type: ignore[override]
+        self, endpoint: Endpoint, timeout: float | None = None
+    ) -> bool:
+        # Like BaseClient's, sent outside of the client's transports
+        base_url = self.url()
+        url = route(base_url, self.host, self.port, endpoint) or base_url
+        try:
+            async with httpx.AsyncClient(verify=self._build_verify()) as session:
+                await session.head(
+                    url, timeout=self.timeout if timeout is None else timeout
+                )
+            return True
+        except httpx.HTTPError as e:
+            logger.debug('Endpoint %s unreachable: %s', endpoint.netloc, e)
+            return False
+
+    async def is_server_reachable(  # type: ignore[override]
+        self, timeout: float | None = None
+    ) -> bool:
+        try:
+            await self.session().head(
+                self.url(),
+                timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+            )
+            return True
+        except httpx.HTTPError as e:
+            logger.debug('Server unreachable: %s', e)
+            return False
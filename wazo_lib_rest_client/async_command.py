@@ -0,0 +1,155 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import IO, Any, NoReturn
+
+import httpx
+from requests import HTTPError
+
+from .adapters import current_command
+from .async_client import AsyncBaseClient
+from .command import (
+    DEFAULT_PAGE_SIZE,
+    MAX_ERROR_BODY_SIZE,
+    HTTPCommand,
+    NextPage,
+    PageParams,
+    RESTCommand,
+    _next_page_params,
+)
+from .json_backend import is_json_content_type, loads
+from .streaming import DEFAULT_CHUNK_SIZE
+
+
+class AsyncHTTPCommand(HTTPCommand):
+
+    _client: AsyncBaseClient
+
+    def __init__(self, client: AsyncBaseClient) -> None:
+        super().__init__(client)
+
+    @property
+    def session(self) -> httpx.AsyncClient:  # type: ignore[override]
+        session = self._client.session()
+        current_command.set(self)
+        return session
+
+    @staticmethod
+    def raise_from_response(response: httpx.Response) -> None:  # type: ignore[override]
+        if not response.is_error:
+            return
+
+        reason = response.reason_phrase
+        content = response.content
+        if (
+            is_json_content_type(response.headers.get('Content-Type'))
+            and len(content) <= MAX_ERROR_BODY_SIZE
+        ):
+            try:
+                reason = loads(content)['message']
+            except (ValueError, KeyError, TypeError):
+                pass
+
+        # Raise the same exception type as the synchronous commands, so callers
+        # can share their error handling
+        kind = 'Client' if response.is_client_error else 'Server'
+        message = (
+            f'{response.status_code} {kind} Error: {reason} for url: {response.url}'
+        )
+        raise HTTPError(message, response=response)  # type: ignore[arg-type]
+
+    async def stream(  # type: ignore[override]
+        self,
+        method: str,
+        url: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> AsyncIterator[bytes]:
+        async with self.session.stream(method, url, **kwargs) as response:
+            # The body is only read as a whole when it is an error message
+            if response.is_error:
+                await response.aread()
+                self.raise_from_response(response)
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+
+    async def download(  # type: ignore[override]
+        self,
+        fileobj: IO[bytes],
+        method: str,
+        url: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> int:
+        size = 0
+        async for chunk in self.stream(method, url, chunk_size=chunk_size, **kwargs):
+            fileobj.write(chunk)
+            size += len(chunk)
+        return size
+
+    def iter_json_items(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(
+            'iter_json_items() is not available to asynchronous commands, '
+            'decode the chunks of stream() instead'
+        )
+
+    def batch(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(
+            'batch() is not available to asynchronous commands, '
+            'await the requests together with asyncio.gather() instead'
+        )
+
+
+class AsyncRESTCommand(AsyncHTTPCommand, RESTCommand):
+    async def paginate(  # type: ignore[override]
+        self,
+        url: str | None = None,
+        params: dict[str, Any] | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        items_key: str = 'items',
+        total_key: str = 'total',
+        prefetch: bool = True,
+        next_page: NextPage | None = None,
+        tenant_uuid: str | None = None,
+    ) -> AsyncIterator[Any]:
+        url = url or self.base_url
+        headers = self._request_headers(tenant_uuid)
+        page_params: PageParams | None = {
+            **(params or {}),
+            'limit': page_size,
+            'offset': 0,
+        }
+
+        async def fetch(page_params: PageParams) -> dict[str, Any]:
+            response = await self.session.get(url, params=page_params, headers=headers)
+            self.raise_from_response(response)
+            return loads(response.content)
+
+        fetched = 0
+        prefetched: asyncio.Task[dict[str, Any]] | None = None
+        try:
+            while page_params is not None:
+                if prefetched is not None:
+                    page = await prefetched
+                else:
+                    page = await fetch(page_params)
+                items = page[items_key]
+                fetched += len(items)
+                page_params = _next_page_params(
+                    page_params, page, items, fetched, page_size, total_key, next_page
+                )
+
+                # The next page is received while the caller handles this one
+                prefetched = None
+                if prefetch and page_params is not None:
+                    prefetched = asyncio.ensure_future(fetch(page_params))
+
+                for item in items:
+                    yield item
+        finally:
+            if prefetched is not None:
+                prefetched.cancel()
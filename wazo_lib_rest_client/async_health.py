@@ -0,0 +1,106 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Iterable, Sequence
+from types import TracebackType
+from typing import Self
+
+from .async_client import AsyncBaseClient
+from .health import (
+    DEFAULT_DEADLINE,
+    DEFAULT_INTERVAL,
+    BaseHealthMonitor,
+    HealthTarget,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def check_reachability(
+    clients: Sequence[AsyncBaseClient], deadline: float = DEFAULT_DEADLINE
+) -> list[bool]:
+    """Check concurrently whether the server of each client is reachable
+
+    Servers which have not answered after `deadline` seconds are unreachable.
+    """
+    checks = [client.is_server_reachable(deadline) for client in clients]
+    return await run_checks(checks, deadline)
+
+
+async def run_checks(checks: Sequence[Awaitable[bool]], deadline: float) -> list[bool]:
+    return list(await asyncio.gather(*(_check(check, deadline) for check in checks)))
+
+
+async def _check(check: Awaitable[bool], deadline: float) -> bool:
+    try:
+        return await asyncio.wait_for(check, deadline)
+    except asyncio.TimeoutError:
+        return False
+    except Exception:
+        logger.exception('Reachability check failed')
+        return False
+
+
+class AsyncHealthMonitor(BaseHealthMonitor):
+    """Health monitor checking the servers from a task of the running event loop"""
+
+    def __init__(
+        self,
+        clients: Iterable[AsyncBaseClient],
+        interval: float = DEFAULT_INTERVAL,
+        deadline: float = DEFAULT_DEADLINE,
+    ) -> None:
+        super().__init__(clients, interval, deadline)
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def __aenter__(self) -> Self:
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.stop()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception:
+                logger.exception('Health check failed')
+            await asyncio.sleep(self.interval)
+
+    async def check(self) -> None:
+        """Check every server now"""
+        targets = self._targets()
+        checked_at = time.monotonic()
+        checks = [self._check_target(target) for target in targets]
+        self._record(targets, await run_checks(checks, self.deadline), checked_at)
+
+    async def _check_target(self, target: HealthTarget) -> bool:
+        if target.endpoint is None:
+            return bool(await target.client.is_server_reachable(self.deadline))
+        return bool(await target.client._probe_endpoint(target.endpoint, self.deadline))
@@ -0,0 +1,139 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+from .adapters import AdapterWrapper
+from .fork import ForkAware
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_AHEAD = 30.0
+
+
+@dataclass(frozen=True)
+class Token:
+    token: str
+    # Seconds until the token expires, None when it does not expire
+    expires_in: float | None = None
+
+
+class TokenProvider(ForkAware):
+    """Tokens fetched with `fetch` and renewed before they expire
+
+    The token is renewed `refresh_ahead` seconds before it expires, by the first
+    caller needing it while the others keep using the current one. When the
+    server rejects a token, a single caller fetches a new one and the other
+    callers rejected with the same token wait for it. A provider can be shared by
+    all the clients using the same credentials.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Token],
+        refresh_ahead: float = DEFAULT_REFRESH_AHEAD,
+    ) -> None:
+        self.fetch = fetch
+        self.refresh_ahead = refresh_ahead
+        # Token and the monotonic time at which it must be renewed
+        self._current: tuple[str, float] | None = None
+        self._lock = threading.Lock()
+        self._track_forks()
+
+    def get_token(self) -> str:
+        self._check_fork()
+        current = self._current
+        if current is None:
+            return self._refresh(None, wait=True)
+
+        token, renew_at = current
+        if time.monotonic() < renew_at:
+            return token
+        # The token has not expired yet: do not wait for another caller renewing it
+        return self._refresh(token, wait=self._has_expired(renew_at))
+
+    def invalidate(self, token: str) -> str:
+        """Return a token replacing `token`, rejected by the server"""
+        self._check_fork()
+        return self._refresh(token, wait=True)
+
+    def _reset_after_fork(self) -> None:
+        # The current token remains valid in the child
+        self._lock = threading.Lock()
+
+    def _has_expired(self, renew_at: float) -> bool:
+        return time.monotonic() >= renew_at + self.refresh_ahead
+
+    def _refresh(self, stale: str | None, wait: bool) -> str:
+        if not self._lock.acquire(blocking=wait):
+            assert stale is not None
+            return stale
+
+        try:
+            current = self._current
+            if current is not None and current[0] != stale:
+                # Renewed by another caller while waiting for the lock
+                return current[0]
+
+            try:
+                token = self.fetch()
+            except Exception:
+                if wait or stale is None:
+                    raise
+                logger.exception('Failed to renew the token ahead of its expiration')
+                return stale
+
+            if token.expires_in is None:
+                renew_at = math.inf
+            else:
+                renew_at = time.monotonic() + token.expires_in - self.refresh_ahead
+            self._current = (token.token, renew_at)
+            return token.token
+        finally:
+            self._lock.release()
+
+
+def _is_replayable(body: Any) -> bool:
+    return body is None or isinstance(body, (bytes, str))
+
+
+class TokenAuthAdapter(AdapterWrapper):
+    """Adapter sending the token of a provider with each request
+
+    A request rejected with a 401 is sent once more with a renewed token.
+    """
+
+    def __init__(self, adapter: BaseAdapter, provider: TokenProvider) -> None:
+        super().__init__(adapter)
+        self.provider = provider
+
+    def _send(self, request: PreparedRequest, kwargs: dict[str, Any]) -> Response:
+        token = self.provider.get_token()
+        request.headers['X-Auth-Token'] = token
+        response = self.adapter.send(request, **kwargs)
+        if response.status_code != 401 or not _is_replayable(request.body):
+            return response
+
+        try:
+            new_token = self.provider.invalidate(token)
+        except Exception:
+            logger.exception('Failed to renew the token rejected by %s', request.url)
+            return response
+
+        # Release the connection of the rejected request before sending again
+        response.content
+        response.close()
+        replay = request.copy()
+        replay.headers['X-Auth-Token'] = new_token
+        return self.adapter.send(replay, **kwargs)
@@ -0,0 +1,291 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import abc
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit, urlunsplit
+
+from requests import PreparedRequest, RequestException, Response
+from requests.adapters import BaseAdapter
+
+from .adapters import AdapterWrapper
+from .fork import ForkAware
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_FAILURES = 3
+DEFAULT_EJECTION_TIME = 30.0
+
+
+@dataclass(eq=False)
+class Endpoint:
+    host: str
+    port: int
+    # Requests sent to the endpoint and not answered yet
+    outstanding: int = 0
+    # Consecutive failed requests
+    failures: int = 0
+    # Monotonic time until which the endpoint is ejected, None while healthy
+    ejected_until: float | None = None
+    _probing: bool = field(default=False, repr=False)
+
+    @property
+    def netloc(self) -> str:
+        return f'{self.host}:{self.port}' if self.port else self.host
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until is None
+
+
+EndpointProbe = Callable[[Endpoint], bool]
+
+
+class Balancer(abc.ABC):
+    """Chooses the endpoint of each request among the healthy ones
+
+    Balancers are called with the lock of their EndpointGroup held.
+    """
+
+    @abc.abstractmethod
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        """Endpoint of the next request, among the non-empty `endpoints`"""
+
+    def record_latency(self, endpoint: Endpoint, latency: float) -> None:
+        pass
+
+
+class RoundRobinBalancer(Balancer):
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        return endpoints[next(self._counter) % len(endpoints)]
+
+
+class LeastOutstandingBalancer(Balancer):
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        # Ties are broken in turn, not always in favor of the first endpoint
+        offset = next(self._counter) % len(endpoints)
+        rotated = [*endpoints[offset:], *endpoints[:offset]]
+        return min(rotated, key=lambda endpoint: endpoint.outstanding)
+
+
+class EWMABalancer(Balancer):
+    """Prefers the endpoints answering fastest, weighted by their load
+
+    Each endpoint is scored with the exponentially weighted moving average of
+    its latencies, multiplied by its outstanding requests plus one. Endpoints
+    without latencies yet are scored like the fastest one.
+    """
+
+    def __init__(self, smoothing: float = 0.3) -> None:
+        self.smoothing = smoothing
+        self._latencies: dict[Endpoint, float] = {}
+        self._counter = itertools.count()
+
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        offset = next(self._counter) % len(endpoints)
+        rotated = [*endpoints[offset:], *endpoints[:offset]]
+        return min(rotated, key=self._score)
+
+    def _score(self, endpoint: Endpoint) -> float:
+        latency = self._latencies.get(endpoint)
+        if latency is None:
+            latency = min(self._latencies.values(), default=0.0)
+        return latency * (endpoint.outstanding + 1)
+
+    def record_latency(self, endpoint: Endpoint, latency: float) -> None:
+        average = self._latencies.get(endpoint)
+        if average is None:
+            self._latencies[endpoint] = latency
+        else:
+            self._latencies[endpoint] = average + self.smoothing * (latency - average)
+
+    def latency(self, endpoint: Endpoint) -> float | None:
+        return self._latencies.get(endpoint)
+
+
+class EndpointGroup(ForkAware):
+    """Endpoints of a service, among which the balancer spreads the requests
+
+    An endpoint failing `max_failures` requests in a row, with a connection
+    error or one of the `failure_statuses`, is ejected for `ejection_time`
+    seconds. It is then probed before receiving requests again, or simply
+    re-added without a probe. When every endpoint is ejected, the one
+    re-added soonest is used anyway. Groups may be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[tuple[str, int]],
+        balancer: Balancer | None = None,
+        max_failures: int = DEFAULT_MAX_FAILURES,
+        ejection_time: float = DEFAULT_EJECTION_TIME,
+        failure_statuses: frozenset[int] = frozenset([502, 503, 504]),
+    ) -> None:
+        if not endpoints:
+            raise ValueError('At least one endpoint is required')
+        self.endpoints = [Endpoint(host, port) for host, port in endpoints]
+        self.balancer = balancer or RoundRobinBalancer()
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.failure_statuses = failure_statuses
+        self._lock = threading.Lock()
+        self._track_forks()
+
+    def acquire(self, probe: EndpointProbe | None = None) -> Endpoint:
+        """Choose the endpoint of a request, to be released with release()"""
+        self._check_fork()
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                due = self._claim_due_endpoint(now, probe is not None)
+                if due is None:
+                    endpoint = self._choose(now)
+                    endpoint.outstanding += 1
+                    return endpoint
+
+            assert probe is not None
+            try:
+                reachable = probe(due)
+            except Exception:
+                logger.exception('Probe of endpoint %s failed', due.netloc)
+                reachable = False
+            with self._lock:
+                due._probing = False
+                self._record_probe(due, reachable)
+
+    def _claim_due_endpoint(self, now: float, probing: bool) -> Endpoint | None:
+        for endpoint in self.endpoints:
+            if endpoint.ejected_until is None or endpoint.ejected_until > now:
+                continue
+            if not probing:
+                self._readd(endpoint)
+            elif not endpoint._probing:
+                endpoint._probing = True
+                return endpoint
+        return None
+
+    def _choose(self, now: float) -> Endpoint:
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.healthy]
+        if healthy:
+            return self.balancer.choose(healthy)
+        return min(self.endpoints, key=lambda endpoint: endpoint.ejected_until or now)
+
+    def release(
+        self,
+        endpoint: Endpoint,
+        latency: float | None = None,
+        failed: bool | None = None,
+    ) -> None:
+        """Record the outcome of a request, None if it says nothing of the endpoint"""
+        self._check_fork()
+        with self._lock:
+            endpoint.outstanding -= 1
+            if latency is not None:
+                self.balancer.record_latency(endpoint, latency)
+
+            if failed is None:
+                return
+            if not failed:
+                endpoint.failures = 0
+                return
+            endpoint.failures += 1
+            if endpoint.healthy and endpoint.failures >= self.max_failures:
+                self._eject(endpoint, time.monotonic())
+
+    def record_probe(self, endpoint: Endpoint, reachable: bool) -> None:
+        """Eject or re-add `endpoint` after a check made outside of the requests"""
+        self._check_fork()
+        with self._lock:
+            self._record_probe(endpoint, reachable)
+
+    def _record_probe(self, endpoint: Endpoint, reachable: bool) -> None:
+        if not reachable:
+            self._eject(endpoint, time.monotonic())
+        elif not endpoint.healthy:
+            self._readd(endpoint)
+
+    def _reset_after_fork(self) -> None:
+        # The requests and probes in flight are the parent's, and so may be the
+        # lock
+        self._lock = threading.Lock()
+        for endpoint in self.endpoints:
+            endpoint.outstanding = 0
+            endpoint._probing = False
+
+    def _eject(self, endpoint: Endpoint, now: float) -> None:
+        if endpoint.healthy:
+            logger.warning('Endpoint %s ejected', endpoint.netloc)
+        endpoint.ejected_until = now + self.ejection_time
+
+    def _readd(self, endpoint: Endpoint) -> None:
+        logger.info('Endpoint %s re-added', endpoint.netloc)
+        endpoint.ejected_until = None
+        endpoint.failures = 0
+
+
+def route(url: str, host: str, port: int | None, endpoint: Endpoint) -> str | None:
+    """`url` sent to `endpoint`, None when it is not a URL of `host` and `port`"""
+    parts = urlsplit(url)
+    default_port = 443 if parts.scheme == 'https' else 80
+    if parts.hostname != host.lower() or (parts.port or default_port) != (
+        port or default_port
+    ):
+        return None
+    return urlunsplit(parts._replace(netloc=endpoint.netloc))
+
+
+class LoadBalancingAdapter(AdapterWrapper):
+    """Sends the requests to the client's host to one of its endpoints"""
+
+    def __init__(
+        self,
+        adapter: BaseAdapter,
+        group: EndpointGroup,
+        host: str,
+        port: int | None,
+        probe: EndpointProbe | None = None,
+    ) -> None:
+        super().__init__(adapter)
+        self.group = group
+        self.host = host
+        self.port = port
+        self.probe = probe
+
+    def _send(self, request: PreparedRequest, kwargs: dict[str, Any]) -> Response:
+        endpoint = self.group.acquire(self.probe)
+        start = time.perf_counter()
+        try:
+            response = self._send_to(endpoint, request, kwargs)
+        except RequestException:
+            self.group.release(endpoint, failed=True)
+            raise
+        except BaseException:
+            self.group.release(endpoint)
+            raise
+        failed = response.status_code in self.group.failure_statuses
+        self.group.release(endpoint, time.perf_counter() - start, failed)
+        return response
+
+    def _send_to(
+        self, endpoint: Endpoint, request: PreparedRequest, kwargs: dict[str, Any]
+    ) -> Response:
+        url = route(request.url or '', self.host, self.port, endpoint)
+        if url is not None:
+            # The caller's request keeps the client's URL, e.g. to be sent again
+            request = request.copy()
+            request.url = url
+        return self.adapter.send(request, **kwargs)
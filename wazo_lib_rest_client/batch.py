@@ -0,0 +1,72 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import contextvars
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any
+
+from requests import RequestException, Response, Session
+
+from .ratelimit import RateLimitExceeded
+
+DEFAULT_MAX_WORKERS = 10
+
+
+@dataclass
+class BatchRequest:
+    method: str
+    url: str
+    params: dict[str, Any] | None = None
+    json: Any = None
+    data: Any = None
+    headers: dict[str, str] | None = None
+    tenant_uuid: str | None = None
+
+
+@dataclass
+class BatchResult:
+    request: BatchRequest
+    response: Response | None = None
+    error: RequestException | RateLimitExceeded | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_batch(
+    session: Session,
+    requests: Iterable[BatchRequest],
+    get_headers: Callable[[BatchRequest], dict[str, str]],
+    raise_from_response: Callable[[Response], None],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    ordered: bool = True,
+) -> Iterator[BatchResult]:
+    def send(request: BatchRequest) -> BatchResult:
+        response = None
+        try:
+            response = session.request(
+                request.method,
+                request.url,
+                params=request.params,
+                json=request.json,
+                data=request.data,
+                headers=get_headers(request),
+            )
+            raise_from_response(response)
+        except (RequestException, RateLimitExceeded) as e:
+            return BatchResult(request, response, e)
+        return BatchResult(request, response)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Each request keeps the context of the caller, e.g. its current command
+        futures = [
+            executor.submit(contextvars.copy_context().run, send, request)
+            for request in requests
+        ]
+        for future in futures if ordered else as_completed(futures):
+            yield future.result()
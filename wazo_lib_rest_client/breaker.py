@@ -0,0 +1,226 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import enum
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from requests import PreparedRequest, RequestException, Response
+from requests.adapters import BaseAdapter
+
+from .adapters import AdapterWrapper
+from .fork import ForkAware
+
+logger = logging.getLogger(__name__)
+
+Probe = Callable[[], bool]
+
+
+class CircuitOpenError(requests.ConnectionError):
+    def __init__(self, key: str) -> None:
+        super().__init__(f'Circuit breaker for {key} is open')
+        self.key = key
+
+
+class CircuitState(enum.Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+@dataclass(frozen=True)
+class CircuitBreakerConfig:
+    # Ratio of failed calls in the window opening the circuit
+    failure_rate_threshold: float = 0.5
+    minimum_calls: int = 10
+    window_size: int = 20
+    # Seconds the circuit stays open before letting probes through
+    open_duration: float = 30
+    # Successful trial calls needed to close the circuit again
+    half_open_probes: int = 1
+    failure_statuses: frozenset[int] = frozenset([502, 503, 504])
+    # Probe with a HEAD request on the base URL instead of a real call
+    use_reachability_probe: bool = False
+
+
+class CircuitBreaker(ForkAware):
+    def __init__(
+        self,
+        key: str,
+        config: CircuitBreakerConfig,
+        probe: Probe | None = None,
+    ) -> None:
+        self.key = key
+        self.config = config
+        self.probe = probe
+        self._state = CircuitState.CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=config.window_size)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+        self._track_forks()
+
+    @property
+    def state(self) -> CircuitState:
+        self._check_fork()
+        with self._lock:
+            return self._state
+
+    def before_request(self) -> None:
+        self._check_fork()
+        with self._lock:
+            if self._state is CircuitState.OPEN:
+                if time.monotonic() < self._opened_at + self.config.open_duration:
+                    raise CircuitOpenError(self.key)
+                logger.info('Circuit breaker for %s is half-open', self.key)
+                self._state = CircuitState.HALF_OPEN
+                self._probes_in_flight = 0
+                self._probe_successes = 0
+
+            if self._state is CircuitState.CLOSED:
+                return
+
+            if self._probes_in_flight >= self.config.half_open_probes:
+                raise CircuitOpenError(self.key)
+            self._probes_in_flight += 1
+
+        if self.probe is None:
+            return
+
+        # The probe replaces the trial calls: its result alone decides the state
+        reachable = self.probe()
+        with self._lock:
+            if reachable:
+                self._close()
+            else:
+                self._open()
+        if not reachable:
+            raise CircuitOpenError(self.key)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._probes_in_flight -= 1
+                self._probe_successes += 1
+                if self._probe_successes >= self.config.half_open_probes:
+                    self._close()
+            else:
+                self._outcomes.append(True)
+
+    def release(self) -> None:
+        """End a request which neither succeeded nor failed, e.g. not sent"""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._open()
+                return
+
+            self._outcomes.append(False)
+            if len(self._outcomes) < self.config.minimum_calls:
+                return
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.config.failure_rate_threshold:
+                self._open()
+
+    def _reset_after_fork(self) -> None:
+        # The trial calls in flight are the parent's, and so may be the lock
+        self._lock = threading.Lock()
+        self._probes_in_flight = 0
+
+    def _close(self) -> None:
+        logger.info('Circuit breaker for %s is closed', self.key)
+        self._state = CircuitState.CLOSED
+        self._outcomes.clear()
+
+    def _open(self) -> None:
+        logger.warning('Circuit breaker for %s is open', self.key)
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+
+class _CircuitBreakerRegistry(ForkAware):
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._track_forks()
+
+    def get(
+        self, key: str, config: CircuitBreakerConfig, probe: Probe | None
+    ) -> CircuitBreaker:
+        self._check_fork()
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(key, config, probe)
+            return breaker
+
+    def _reset_after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent
+        self._lock = threading.Lock()
+
+
+_BREAKERS = _CircuitBreakerRegistry()
+
+
+def get_circuit_breaker(
+    key: str,
+    config: CircuitBreakerConfig,
+    probe: Probe | None = None,
+) -> CircuitBreaker:
+    """Return the breaker shared by all the clients of the process using `key`
+
+    The first client creating the breaker of an endpoint sets its configuration.
+    """
+    return _BREAKERS.get(key, config, probe)
+
+
+def head_probe(url: str, timeout: float | None, verify: bool | str) -> Probe:
+    def probe() -> bool:
+        try:
+            requests.head(url, timeout=timeout, verify=verify)
+        except RequestException as e:
+            logger.debug('Circuit breaker probe on %s failed: %s', url, e)
+            return False
+        return True
+
+    return probe
+
+
+class CircuitBreakerAdapter(AdapterWrapper):
+    def __init__(self, adapter: BaseAdapter, breaker: CircuitBreaker) -> None:
+        super().__init__(adapter)
+        self.breaker = breaker
+
+    def _send(self, request: PreparedRequest, kwargs: dict[str, Any]) -> Response:
+        self.breaker.before_request()
+        success = None
+        try:
+            response = self.adapter.send(request, **kwargs)
+            success = response.status_code not in self.breaker.config.failure_statuses
+        except RequestException:
+            success = False
+            raise
+        finally:
+            if success is None:
+                # Other errors do not come from the server, e.g. RateLimitExceeded,
+                # but the trial call they end must make way for another
+                self.breaker.release()
+            elif success:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+        return response
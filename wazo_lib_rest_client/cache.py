@@ -0,0 +1,234 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .adapters import AdapterWrapper
+from .fork import ForkAware
+
+CacheKey = tuple[str, str, str, str]
+
+MUTATING_METHODS = frozenset(['POST', 'PUT', 'PATCH', 'DELETE'])
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    status_code: int
+    reason: str
+    headers: CaseInsensitiveDict[str]
+    content: bytes
+    encoding: str | None
+    expires_at: float
+    size: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.size = len(self.content)
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get('Last-Modified')
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def to_response(self, request: PreparedRequest) -> Response:
+        response = Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.headers = self.headers.copy()
+        response._content = self.content
+        response.encoding = self.encoding
+        response.url = self.url
+        response.request = request
+        return response
+
+
+class ResponseCache(ForkAware):
+    def __init__(
+        self,
+        ttl: float = 60,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._track_forks()
+
+    @staticmethod
+    def key(request: PreparedRequest) -> CacheKey:
+        token = request.headers.get('X-Auth-Token') or ''
+        # Keep the token identity without keeping the token itself in memory
+        token_id = hashlib.sha256(token.encode()).hexdigest() if token else ''
+        return (
+            request.method or '',
+            request.url or '',
+            request.headers.get('Wazo-Tenant') or '',
+            token_id,
+        )
+
+    def get(self, key: CacheKey) -> CacheEntry | None:
+        self._check_fork()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: CacheKey, response: Response) -> None:
+        entry = CacheEntry(
+            url=response.url,
+            status_code=response.status_code,
+            reason=response.reason,
+            headers=response.headers.copy(),
+            content=response.content,
+            encoding=response.encoding,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        if entry.size > self.max_bytes:
+            return
+
+        self._check_fork()
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._size += entry.size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def refresh(self, key: CacheKey) -> None:
+        self._check_fork()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl
+
+    def invalidate(self, url_prefix: str | None = None) -> None:
+        self._check_fork()
+        with self._lock:
+            if url_prefix is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            for key in [key for key in self._entries if key[1].startswith(url_prefix)]:
+                self._remove(key)
+
+    def invalidate_resource(self, url: str) -> None:
+        # A change to a resource also changes the collection that lists it
+        url = url.split('?', 1)[0].rstrip('/')
+        collection = url.rpartition('/')[0]
+        self._check_fork()
+        with self._lock:
+            for key in list(self._entries):
+                path = key[1].split('?', 1)[0]
+                if path in (url, collection) or path.startswith(f'{url}/'):
+                    self._remove(key)
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def record(self, **counters: int) -> None:
+        self._check_fork()
+        with self._lock:
+            for name, increment in counters.items():
+                setattr(self._stats, name, getattr(self._stats, name) + increment)
+
+    def stats(self) -> CacheStats:
+        self._check_fork()
+        with self._lock:
+            return replace(self._stats, entries=len(self._entries), size=self._size)
+
+    def _reset_after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent, the
+        # entries are still valid
+        self._lock = threading.Lock()
+
+
+class CachingAdapter(AdapterWrapper):
+    def __init__(self, adapter: BaseAdapter, cache: ResponseCache) -> None:
+        super().__init__(adapter)
+        self.cache = cache
+
+    def _send(self, request: PreparedRequest, kwargs: dict[str, Any]) -> Response:
+        if request.method != 'GET' or kwargs['stream']:
+            response = self.adapter.send(request, **kwargs)
+            if request.method in MUTATING_METHODS and response.ok and request.url:
+                self.cache.invalidate_resource(request.url)
+            return response
+
+        key = self.cache.key(request)
+        entry = self.cache.get(key)
+        if entry is None:
+            return self._fetch(key, request, kwargs)
+
+        if entry.is_fresh(time.monotonic()):
+            self.cache.record(hits=1)
+            return entry.to_response(request)
+
+        if not (entry.etag or entry.last_modified):
+            return self._fetch(key, request, kwargs)
+
+        conditional = request.copy()
+        if entry.etag:
+            conditional.headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            conditional.headers['If-Modified-Since'] = entry.last_modified
+
+        response = self.adapter.send(conditional, **kwargs)
+        if response.status_code != 304:
+            self.cache.record(misses=1)
+            self._store(key, response)
+            return response
+
+        response.content  # reads the empty body, releasing the connection
+        self.cache.refresh(key)
+        self.cache.record(hits=1, revalidations=1)
+        return entry.to_response(request)
+
+    def _fetch(
+        self, key: CacheKey, request: PreparedRequest, kwargs: dict[str, Any]
+    ) -> Response:
+        self.cache.record(misses=1)
+        response = self.adapter.send(request, **kwargs)
+        self._store(key, response)
+        return response
+
+    def _store(self, key: CacheKey, response: Response) -> None:
+        if response.status_code != 200:
+            return
+        if 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+        self.cache.set(key, response)
@@ -6,17 +6,49 @@ from __future__ import annotations
 import logging
 import os
 import sys
-from functools import partial
-from typing import Any
+import threading
+import time
+from collections.abc import MutableMapping, Sequence
+from types import TracebackType
+from typing import Any, Self
 
-from requests import HTTPError, RequestException, Session
+from requests import HTTPError, PreparedRequest, RequestException, Response, Session
+from requests.adapters import (
+    DEFAULT_POOLBLOCK,
+    DEFAULT_POOLSIZE,
+    BaseAdapter,
+)
 from requests.packages.urllib3 import disable_warnings
-from stevedore import extension
+
+from .adapters import SharedAdapter, current_command
+from .auth import TokenAuthAdapter, TokenProvider
+from .balancing import Endpoint, EndpointGroup, LoadBalancingAdapter, route
+from .breaker import (
+    CircuitBreaker,
+    CircuitBreakerAdapter,
+    CircuitBreakerConfig,
+    get_circuit_breaker,
+    head_probe,
+)
+from .cache import CachingAdapter, ResponseCache
+from .coalescing import CoalescingAdapter, RequestCoalescer
+from .compression import (
+    CompressingAdapter,
+    CompressionCounters,
+    CompressionPolicy,
+    CompressionStats,
+)
+from .fork import ForkAware
+from .instrumentation import Instrumentation, InstrumentingAdapter
+from .plugins import PluginRegistry
+from .pool import ConnectionPoolRegistry, PoolKey, SharedPoolAdapter
+from .ratelimit import RateLimiter, RateLimitingAdapter
+from .retry import RetryingHTTPAdapter, RetryPolicy
 
 logger = logging.getLogger(__name__)
 
 global PLUGINS_CACHE
-PLUGINS_CACHE: dict[str, list[extension.Extension]] = {}
+PLUGINS_CACHE = PluginRegistry()
 
 
 class InvalidArgumentError(Exception):
@@ -24,10 +56,24 @@ class InvalidArgumentError(Exception):
         super().__init__(f'Invalid value for argument "{argument_name}"')
 
 
-class BaseClient:
+class ClientSession(Session):
+    """Session sending the requests without a timeout with the client's one"""
+
+    timeout: float | None = None
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class BaseClient(ForkAware):
 
     namespace: str | None = None
     _url_fmt = '{scheme}://{host}{port}{prefix}{version}'
+    # url() is built from these attributes, and cached until one of them changes
+    _url_attributes = frozenset(['host', 'port', '_https', '_prefix', '_version'])
+    _base_url: str | None = None
 
     def __init__(
         self,
@@ -38,9 +84,25 @@ class BaseClient:
         tenant: str | None = None,
         https: bool = True,
         timeout: int = 10,
-        verify_certificate: bool = True,
+        verify_certificate: bool | str = True,
         prefix: str | None = None,
         user_agent: str = '',
+        keep_alive: bool = False,
+        pool_connections: int = DEFAULT_POOLSIZE,
+        pool_maxsize: int = DEFAULT_POOLSIZE,
+        pool_block: bool = DEFAULT_POOLBLOCK,
+        pool_idle_timeout: float | None = None,
+        response_cache: ResponseCache | None = None,
+        instrumentation: Instrumentation | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreakerConfig | None = None,
+        connection_pools: ConnectionPoolRegistry | None = None,
+        token_provider: TokenProvider | None = None,
+        request_coalescer: RequestCoalescer | None = None,
+        http2: bool = False,
+        endpoints: EndpointGroup | Sequence[tuple[str, int]] | None = None,
+        compression_policy: CompressionPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
         **kwargs: Any,
     ) -> None:
         if not host:
@@ -56,6 +118,31 @@ class BaseClient:
         self._verify_certificate = verify_certificate
         self._prefix = self._build_prefix(prefix)
         self._user_agent = user_agent
+        self._keep_alive = keep_alive
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._pool_idle_timeout = pool_idle_timeout
+        self._http2 = http2
+        self._cached_session: ClientSession | None = None
+        self._cached_session_last_used = 0.0
+        self._cached_session_lock = threading.Lock()
+        self._shared_adapter: SharedAdapter | None = None
+        self._static_headers: MutableMapping[str, str | bytes] | None = None
+        self._track_forks()
+        self.response_cache = response_cache
+        self.instrumentation = instrumentation
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.connection_pools = connection_pools
+        self.token_provider = token_provider
+        self.request_coalescer = request_coalescer
+        if endpoints is not None and not isinstance(endpoints, EndpointGroup):
+            endpoints = EndpointGroup(endpoints)
+        self.endpoints = endpoints
+        self.compression_policy = compression_policy
+        self._compression_counters = CompressionCounters()
+        self.rate_limiter = rate_limiter
         if kwargs:
             logger.debug(
                 '%s received unexpected arguments: %s',
@@ -74,32 +161,78 @@ class BaseClient:
         return prefix
 
     def _load_plugins(self) -> None:
-        global PLUGINS_CACHE
-
         if not self.namespace:
             raise ValueError('You must redefine BaseClient.namespace')
 
-        if self.namespace not in PLUGINS_CACHE:
-            PLUGINS_CACHE[self.namespace] = list(
-                extension.ExtensionManager(self.namespace)
-            )
-
-        plugins = PLUGINS_CACHE[self.namespace]
+        plugins = PLUGINS_CACHE.get(self.namespace)
         if not plugins:
             logger.warning('No commands found')
             return
 
-        for ext in plugins:
-            setattr(self, ext.name, ext.plugin(self))
+        # Commands are instantiated on first access, see __getattr__
+        self._plugins = plugins
+        for ext in plugins.values():
+            if hasattr(type(self), ext.name):
+                # __getattr__ is not called for names defined on the class
+                setattr(self, ext.name, ext.plugin(self))
+
+    def __getattr__(self, name: str) -> Any:
+        plugins = self.__dict__.get('_plugins', {})
+        if name not in plugins:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            )
+        command = plugins[name].plugin(self)
+        return self.__dict__.setdefault(name, command)
+
+    def __dir__(self) -> list[str]:
+        plugins = self.__dict__.get('_plugins', {})
+        return sorted(set(super().__dir__()) | set(plugins))
 
     def session(self) -> Session:
-        session = Session()
-        session.headers = {'Connection': 'close'}
+        # Requests sent directly through the client do not belong to a command
+        current_command.set(None)
+        self._check_fork()
 
-        if self.timeout is not None:
-            session.request = partial(  # type: ignore[method-assign]
-                session.request, timeout=self.timeout
-            )
+        if not self._keep_alive:
+            # Each call gets a session of its own, so that what a caller
+            # changes on it does not carry over to the others. The adapters
+            # are built once and shared
+            return self._new_session(self._get_shared_adapter())
+
+        # The session is built once: each call only refreshes what may have
+        # changed since the previous one
+        with self._cached_session_lock:
+            now = time.monotonic()
+            session = self._cached_session
+            if session is not None and self._is_session_expired(now):
+                session.close()
+                session = None
+            if session is None:
+                session = self._cached_session = self._new_session()
+            else:
+                session.timeout = self.timeout
+                self._set_session_headers(session.headers)
+            self._cached_session_last_used = now
+        return session
+
+    def _get_shared_adapter(self) -> SharedAdapter:
+        with self._cached_session_lock:
+            if self._shared_adapter is None:
+                self._shared_adapter = SharedAdapter(self._build_adapter())
+            return self._shared_adapter
+
+    def _new_session(self, adapter: BaseAdapter | None = None) -> ClientSession:
+        session = ClientSession()
+        if self._static_headers is None:
+            self._static_headers = self._build_static_headers()
+        session.headers = dict(self._static_headers)
+        session.timeout = self.timeout
+
+        if adapter is None:
+            adapter = self._build_adapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
 
         if self._https:
             if not self._verify_certificate:
@@ -108,16 +241,145 @@ class BaseClient:
             else:
                 session.verify = self._verify_certificate
 
+        self._set_session_headers(session.headers)
+        return session
+
+    def _build_static_headers(self) -> MutableMapping[str, str | bytes]:
+        headers: MutableMapping[str, str | bytes] = {}
+        if self._user_agent:
+            headers['User-agent'] = self._user_agent
+        # HTTP/2 connections are shared by the requests in flight, and not closed
+        if not self._keep_alive and self.connection_pools is None and not self._http2:
+            headers['Connection'] = 'close'
+        return headers
+
+    def _build_adapter(self) -> BaseAdapter:
+        adapter: BaseAdapter
+        if self.connection_pools is None:
+            adapter = self._build_http_adapter()
+        else:
+            adapter = SharedPoolAdapter(
+                self.connection_pools, self._pool_key(), self._build_http_adapter
+            )
+        if self.compression_policy is not None:
+            # Innermost, so that the other layers see the requests uncompressed
+            adapter = CompressingAdapter(
+                adapter, self.compression_policy, self._compression_counters
+            )
+        if self.instrumentation is not None:
+            adapter = InstrumentingAdapter(adapter, self.instrumentation)
+        if self.endpoints is not None:
+            adapter = LoadBalancingAdapter(
+                adapter, self.endpoints, self.host, self.port, self._probe_endpoint
+            )
+        if self.rate_limiter is not None:
+            # Requests rejected by the breaker or answered from the cache are
+            # not limited
+            adapter = RateLimitingAdapter(adapter, self.rate_limiter)
+        if self.circuit_breaker is not None:
+            adapter = CircuitBreakerAdapter(adapter, self._get_circuit_breaker())
+        if self.response_cache is not None:
+            adapter = CachingAdapter(adapter, self.response_cache)
+        if self.request_coalescer is not None:
+            adapter = CoalescingAdapter(adapter, self.request_coalescer)
+        if self.token_provider is not None:
+            # Outermost, so that the cache and coalescing see the token sent
+            adapter = TokenAuthAdapter(adapter, self.token_provider)
+        return adapter
+
+    def _build_http_adapter(self) -> BaseAdapter:
+        max_retries = self.retry_policy.retry if self.retry_policy else 0
+        if self._http2:
+            try:
+                from .http2 import HTTP2Adapter
+            except ImportError:
+                logger.warning('HTTP/2 requires httpx[http2], using HTTP/1.1')
+            else:
+                return HTTP2Adapter(max_retries, pool_maxsize=self._pool_maxsize)
+        return RetryingHTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            max_retries=max_retries,
+            pool_block=self._pool_block,
+        )
+
+    def _pool_key(self) -> PoolKey:
+        return PoolKey(
+            scheme='https' if self._https else 'http',
+            host=self.host,
+            port=self.port,
+            verify=self._verify_certificate if self._https else True,
+            retry_policy=self.retry_policy,
+            http2=self._http2,
+        )
+
+    def _get_circuit_breaker(self) -> CircuitBreaker:
+        assert self.circuit_breaker is not None
+        base_url = self.url()
+        probe = None
+        if self.circuit_breaker.use_reachability_probe:
+            verify = self._verify_certificate if self._https else True
+            probe = head_probe(base_url, self.timeout, verify)
+        return get_circuit_breaker(base_url, self.circuit_breaker, probe)
+
+    def _set_session_headers(self, headers: MutableMapping[str, Any]) -> None:
+        # The session outlives set_token() and tenant_uuid changes, so stale
+        # values must be removed as well as current ones set
         if self._token_id:
-            session.headers['X-Auth-Token'] = self._token_id
+            headers['X-Auth-Token'] = self._token_id
+        else:
+            headers.pop('X-Auth-Token', None)
 
         if self.tenant_uuid:
-            session.headers['Wazo-Tenant'] = self.tenant_uuid
+            headers['Wazo-Tenant'] = self.tenant_uuid
+        else:
+            headers.pop('Wazo-Tenant', None)
 
-        if self._user_agent:
-            session.headers['User-agent'] = self._user_agent
+    def _is_session_expired(self, now: float) -> bool:
+        if not self._keep_alive or self._pool_idle_timeout is None:
+            return False
+        idle_time = now - self._cached_session_last_used
+        return idle_time > self._pool_idle_timeout
 
-        return session
+    def warm_up(self) -> None:
+        """Load all the client needs before the process forks
+
+        The commands and the modules they import are then shared with the
+        children instead of being loaded by each of them. No connection is
+        opened, the children could not use it.
+        """
+        for name in self.__dict__.get('_plugins', {}):
+            getattr(self, name)
+        self.url()
+        self._build_adapter().close()
+
+    def _reset_after_fork(self) -> None:
+        # The session's connections are shared with the parent: forget them
+        # without closing them
+        self._cached_session_lock = threading.Lock()
+        self._cached_session = None
+        self._shared_adapter = None
+
+    def close(self) -> None:
+        self._check_fork()
+        with self._cached_session_lock:
+            if self._cached_session is not None:
+                self._cached_session.close()
+                self._cached_session = None
+            if self._shared_adapter is not None:
+                self._shared_adapter.close_shared()
+                self._shared_adapter = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
 
     def set_tenant(self, tenant_uuid: str) -> None:
         logger.warning('set_tenant() is deprecated. Please use tenant_uuid')
@@ -130,22 +392,56 @@ class BaseClient:
     def set_token(self, token: str) -> None:
         self._token_id = token
 
-    def url(self, *fragments: str) -> str:
-        base = self._url_fmt.format(
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in self._url_attributes:
+            super().__setattr__('_base_url', None)
+
+    def _build_base_url(self) -> str:
+        return self._url_fmt.format(
             scheme='https' if self._https else 'http',
             host=self.host,
             port=f':{self.port}' if self.port else '',
             prefix=self._prefix,
             version=f'/{self._version}' if self._version else '',
         )
-        if fragments:
-            path = '/'.join(str(fragment) for fragment in fragments)
-            base = f"{base}/{path}"
-        return base
 
-    def is_server_reachable(self) -> bool:
+    def url(self, *fragments: str) -> str:
+        base = self._base_url
+        if base is None:
+            base = self._base_url = self._build_base_url()
+        if not fragments:
+            return base
+        if len(fragments) == 1:
+            return f'{base}/{fragments[0]}'
+        path = '/'.join(str(fragment) for fragment in fragments)
+        return f'{base}/{path}'
+
+    def compression_stats(self) -> CompressionStats:
+        return self._compression_counters.stats()
+
+    def _probe_endpoint(self, endpoint: Endpoint, timeout: float | None = None) -> bool:
+        # Probes are sent in the middle of a request: a bare session keeps them
+        # off the client's adapters, i.e. the rate limits, the circuit breaker
+        # and the token, and leaves the current command as is
+        base_url = self.url()
+        url = route(base_url, self.host, self.port, endpoint) or base_url
+        verify = self._verify_certificate if self._https else True
+        try:
+            with Session() as session:
+                session.head(
+                    url,
+                    timeout=self.timeout if timeout is None else timeout,
+                    verify=verify,
+                )
+            return True
+        except RequestException as e:
+            logger.debug('Endpoint %s unreachable: %s', endpoint.netloc, e)
+            return False
+
+    def is_server_reachable(self, timeout: float | None = None) -> bool:
         try:
-            self.session().head(self.url())
+            self.session().head(self.url(), timeout=timeout)
             return True
         except HTTPError:
             return True
@@ -0,0 +1,187 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+from .adapters import AdapterWrapper, current_command
+from .fork import ForkAware
+
+T = TypeVar('T')
+
+CoalescingKey = tuple[str, str, str, str, str]
+
+COALESCED_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    # Requests sent to the server
+    requests: int = 0
+    # Requests answered with the response of an identical request in flight
+    coalesced: int = 0
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: Any = None
+        self.error: BaseException | None = None
+
+
+class RequestCoalescer(ForkAware):
+    """Identical requests in flight at the same time share a single call
+
+    Only requests without side effects are coalesced. Requests are identical
+    when their method, URL (including the query), tenant, token and accepted
+    content type are the same. Each caller receives its own copy of the
+    response, or the exception raised by the shared call.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[CoalescingKey, _Call] = {}
+        self._tasks: dict[
+            tuple[asyncio.AbstractEventLoop, CoalescingKey], asyncio.Task[Any]
+        ] = {}
+        self._requests = 0
+        self._coalesced = 0
+        self._lock = threading.Lock()
+        self._track_forks()
+
+    @staticmethod
+    def key(method: str, url: str, headers: Mapping[str, Any]) -> CoalescingKey | None:
+        if method.upper() not in COALESCED_METHODS:
+            return None
+        return (
+            method.upper(),
+            url,
+            headers.get('Wazo-Tenant') or '',
+            headers.get('X-Auth-Token') or '',
+            headers.get('Accept') or '',
+        )
+
+    def run(
+        self, key: CoalescingKey, send: Callable[[], T], copy: Callable[[T], T]
+    ) -> T:
+        self._check_fork()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._requests += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy(call.response)
+
+        try:
+            call.response = send()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.response
+
+    async def run_async(
+        self,
+        key: CoalescingKey,
+        send: Callable[[], Awaitable[T]],
+        copy: Callable[[T], T],
+    ) -> T:
+        self._check_fork()
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            leader = task is None
+            if task is None:
+                # The call is a task of its own, so that cancelling the caller
+                # which started it does not cancel it for the others
+                task = self._tasks[task_key] = loop.create_task(_await(send))
+                task.add_done_callback(lambda _: self._forget_task(task_key))
+                self._requests += 1
+            else:
+                self._coalesced += 1
+
+        response = await asyncio.shield(task)
+        return response if leader else copy(response)
+
+    def _forget_task(
+        self, task_key: tuple[asyncio.AbstractEventLoop, CoalescingKey]
+    ) -> None:
+        with self._lock:
+            task = self._tasks.pop(task_key)
+        # Errors are raised to the callers, if any is still waiting
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> CoalescingStats:
+        with self._lock:
+            return CoalescingStats(requests=self._requests, coalesced=self._coalesced)
+
+    def _reset_after_fork(self) -> None:
+        # The calls in flight are sent by the parent, not awaited in the child
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+
+async def _await(send: Callable[[], Awaitable[T]]) -> T:
+    return await send()
+
+
+def copy_response(response: Response, request: PreparedRequest) -> Response:
+    copy = Response()
+    copy.status_code = response.status_code
+    copy.reason = response.reason
+    copy.headers = response.headers.copy()
+    copy._content = response.content
+    copy.encoding = response.encoding
+    copy.url = response.url
+    copy.elapsed = response.elapsed
+    copy.request = request
+    return copy
+
+
+def is_coalescing_enabled() -> bool:
+    # Commands opt out with their coalesce_requests attribute
+    return bool(getattr(current_command.get(), 'coalesce_requests', True))
+
+
+class CoalescingAdapter(AdapterWrapper):
+    def __init__(self, adapter: BaseAdapter, coalescer: RequestCoalescer) -> None:
+        super().__init__(adapter)
+        self.coalescer = coalescer
+
+    def _send(self, request: PreparedRequest, kwargs: dict[str, Any]) -> Response:
+        key = self.coalescer.key(
+            request.method or '', request.url or '', request.headers
+        )
+        if key is None or kwargs['stream'] or not is_coalescing_enabled():
+            return self.adapter.send(request, **kwargs)
+
+        def send() -> Response:
+            response = self.adapter.send(request, **kwargs)
+            # The body is shared with the other callers, it must be read once
+            response.content
+            return response
+
+        return self.coalescer.run(
+            key, send, lambda response: copy_response(response, request)
+        )
@@ -1,33 +1,187 @@
-# Copyright 2014-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2014-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0+
 
 from __future__ import annotations
 
 import abc
-import json
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any
 
 from requests import Response, Session
 
+from wazo_lib_rest_client.adapters import current_command
+from wazo_lib_rest_client.batch import (
+    DEFAULT_MAX_WORKERS,
+    BatchRequest,
+    BatchResult,
+    run_batch,
+)
 from wazo_lib_rest_client.client import BaseClient
+from wazo_lib_rest_client.compression import CompressionPolicy
+from wazo_lib_rest_client.json_backend import is_json_content_type, loads
+from wazo_lib_rest_client.retry import RetryPolicy
+from wazo_lib_rest_client.streaming import DEFAULT_CHUNK_SIZE, iter_json_array
+
+DEFAULT_PAGE_SIZE = 100
+
+# Error bodies larger than this are not read to find their message
+MAX_ERROR_BODY_SIZE = 64 * 1024
+
+PageParams = dict[str, Any]
+NextPage = Callable[[PageParams, dict[str, Any]], PageParams | None]
+
+
+def _read_error_body(response: Response) -> bytes | None:
+    if not is_json_content_type(response.headers.get('Content-Type')):
+        return None
+
+    length = response.headers.get('Content-Length')
+    if length is not None:
+        if not length.isdigit() or int(length) > MAX_ERROR_BODY_SIZE:
+            return None
+        return response.content
+
+    # Without a length, only read the body if it is already in memory
+    if getattr(response, '_content', None) is False:
+        return None
+    content = response.content
+    return content if len(content) <= MAX_ERROR_BODY_SIZE else None
+
+
+def _next_page_params(
+    params: PageParams,
+    page: dict[str, Any],
+    items: list[Any],
+    fetched: int,
+    page_size: int,
+    total_key: str,
+    next_page: NextPage | None,
+) -> PageParams | None:
+    if next_page is not None:
+        return next_page(params, page)
+    if len(items) < page_size or fetched >= page.get(total_key, fetched + 1):
+        return None
+    return {**params, 'offset': params['offset'] + len(items)}
 
 
 class HTTPCommand:
+
+    # Overrides the client's retry policy for the requests of this command
+    retry_policy: RetryPolicy | None = None
+    # Share identical requests in flight, when the client has a RequestCoalescer
+    coalesce_requests: bool = True
+    # Overrides the client's compression policy, when the client has one
+    compression_policy: CompressionPolicy | None = None
+
     def __init__(self, client: BaseClient) -> None:
         self._client = client
 
     @property
     def session(self) -> Session:
-        return self._client.session()
+        session = self._client.session()
+        current_command.set(self)
+        return session
 
     @staticmethod
     def raise_from_response(response: Response) -> None:
-        try:
-            response.reason = json.loads(response.text)['message']
-        except (ValueError, KeyError, TypeError):
-            pass
+        # raise_for_status() only raises for these status codes
+        if not 400 <= response.status_code < 600:
+            return
+
+        body = _read_error_body(response)
+        if body is not None:
+            try:
+                response.reason = loads(body)['message']
+            except (ValueError, KeyError, TypeError):
+                pass
 
         response.raise_for_status()
 
+    @staticmethod
+    def decode_json(response: Response) -> Any:
+        """Decode a JSON response with the fastest available backend"""
+        return loads(response.content)
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> Iterator[bytes]:
+        with self.session.request(method, url, stream=True, **kwargs) as response:
+            # The body is only read as a whole when it is an error message
+            if response.status_code >= 400:
+                self.raise_from_response(response)
+            yield from response.iter_content(chunk_size)
+
+    def download(
+        self,
+        fileobj: IO[bytes],
+        method: str,
+        url: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> int:
+        size = 0
+        for chunk in self.stream(method, url, chunk_size=chunk_size, **kwargs):
+            fileobj.write(chunk)
+            size += len(chunk)
+        return size
+
+    def iter_json_items(
+        self,
+        method: str,
+        url: str,
+        key: str | None = 'items',
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        chunks = self.stream(method, url, chunk_size=chunk_size, **kwargs)
+        return iter_json_array(chunks, key=key)
+
+    def batch(
+        self,
+        requests: Iterable[BatchRequest],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult]:
+        session = self.session
+        # Without keep-alive, the requests of the batch still share their
+        # connections, on an adapter of the batch's session closed once the
+        # batch is done. The client's adapter, shared by its sessions, stays open
+        close_connections = session.headers.get('Connection') == 'close'
+        if close_connections:
+            adapter = self._client._build_adapter()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+
+        def get_headers(request: BatchRequest) -> dict[str, str]:
+            headers = self._get_batch_headers(request)
+            if close_connections:
+                headers['Connection'] = 'keep-alive'
+            return headers
+
+        try:
+            yield from run_batch(
+                session,
+                requests,
+                get_headers,
+                self.raise_from_response,
+                max_workers=max_workers,
+                ordered=ordered,
+            )
+        finally:
+            if close_connections:
+                session.close()
+
+    def _get_batch_headers(self, request: BatchRequest) -> dict[str, str]:
+        headers = dict(request.headers or {})
+        if request.tenant_uuid:
+            headers['Wazo-Tenant'] = str(request.tenant_uuid)
+        return headers
+
 
 class RESTCommand(HTTPCommand):
 
@@ -43,11 +197,68 @@ class RESTCommand(HTTPCommand):
         super().__init__(client)
         self.base_url = self._client.url(self.resource)
         self.timeout = self._client.timeout
+        # Sent with every request of the command, never modified
+        self._constant_headers: Mapping[str, str] = dict(self._headers)
 
     def _get_headers(self, **kwargs: str) -> dict[str, str]:
-        headers = dict(self._headers)
+        # A copy, that the caller may modify
+        headers = dict(self._constant_headers)
         # The requests session will use self.tenant_uuid by default
-        tenant_uuid = kwargs.pop('tenant_uuid', None)
+        tenant_uuid = kwargs.get('tenant_uuid')
         if tenant_uuid:
             headers['Wazo-Tenant'] = str(tenant_uuid)
         return headers
+
+    def _request_headers(self, tenant_uuid: str | None) -> Mapping[str, str]:
+        """Headers of a request, not to be modified: shared without a tenant"""
+        if not tenant_uuid:
+            return self._constant_headers
+        return {**self._constant_headers, 'Wazo-Tenant': str(tenant_uuid)}
+
+    def _get_batch_headers(self, request: BatchRequest) -> dict[str, str]:
+        return {
+            **self._request_headers(request.tenant_uuid),
+            **(request.headers or {}),
+        }
+
+    def paginate(
+        self,
+        url: str | None = None,
+        params: dict[str, Any] | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        items_key: str = 'items',
+        total_key: str = 'total',
+        prefetch: bool = True,
+        next_page: NextPage | None = None,
+        tenant_uuid: str | None = None,
+    ) -> Iterator[Any]:
+        url = url or self.base_url
+        headers = self._request_headers(tenant_uuid)
+        page_params: PageParams | None = {
+            **(params or {}),
+            'limit': page_size,
+            'offset': 0,
+        }
+
+        def fetch(page_params: PageParams) -> dict[str, Any]:
+            response = self.session.get(url, params=page_params, headers=headers)
+            self.raise_from_response(response)
+            return self.decode_json(response)
+
+        fetched = 0
+        prefetched: Future[dict[str, Any]] | None = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while page_params is not None:
+                page = prefetched.result() if prefetched else fetch(page_params)
+                items = page[items_key]
+                fetched += len(items)
+                page_params = _next_page_params(
+                    page_params, page, items, fetched, page_size, total_key, next_page
+                )
+
+                # The next page is received while the caller handles this one
+                prefetched = None
+                if prefetch and page_params is not None:
+                    prefetched = executor.submit(fetch, page_params)
+
+                yield from items
@@ -0,0 +1,203 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+"""Compressed responses and request bodies
+
+gzip and deflate are always available. br needs the brotli package, and zstd
+the zstd module of Python 3.14 or backports.zstd before (the `compression`
+extra). Responses are decoded while they are read, by urllib3 or httpx.
+"""
+
+from __future__ import annotations
+
+import gzip
+import sys
+import threading
+import zlib
+from collections.abc import Callable, Collection
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Any
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .adapters import AdapterWrapper, current_command
+from .fork import ForkAware
+
+Compressor = Callable[[bytes], bytes]
+
+
+def _load_compressors() -> dict[str, Compressor]:
+    compressors: dict[str, Compressor] = {
+        'gzip': partial(gzip.compress, mtime=0),
+        'deflate': zlib.compress,
+    }
+    try:
+        import brotli  # type: ignore[import-not-found, import-untyped, unused-ignore]
+    except ImportError:
+        pass
+    else:
+        compressors['br'] = brotli.compress
+    try:
+        if sys.version_info >= (3, 14):
+            from compression import zstd
+        else:
+            from backports import zstd
+    except ImportError:
+        pass
+    else:
+        compressors['zstd'] = zstd.compress
+    return compressors
+
+
+COMPRESSORS = _load_compressors()
+
+# The content codings of the responses urllib3 is able to decode
+DECODED_ENCODINGS = frozenset(ACCEPT_ENCODING.split(','))
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    # Content codings accepted for the responses, in order of preference
+    accept_encodings: tuple[str, ...] = ('zstd', 'br', 'gzip', 'deflate')
+    # Request bodies of at least min_request_size bytes are sent with this
+    # coding, or not compressed when it is None
+    request_encoding: str | None = 'gzip'
+    min_request_size: int = 1024
+
+    def __post_init__(self) -> None:
+        if self.request_encoding not in (None, *COMPRESSORS):
+            raise ValueError(f'Unsupported request encoding: {self.request_encoding}')
+
+    def accept_encoding(self, supported: Collection[str]) -> str:
+        """Accept-Encoding header value, among the `supported` codings"""
+        encodings = [
+            encoding for encoding in self.accept_encodings if encoding in supported
+        ]
+        return ', '.join(encodings) or 'identity'
+
+    def compress(self, body: bytes) -> bytes | None:
+        """`body` compressed with request_encoding, None if it is not compressed"""
+        if self.request_encoding is None or len(body) < self.min_request_size:
+            return None
+        return COMPRESSORS[self.request_encoding](body)
+
+
+# Commands sending or receiving already compressed content opt out with it
+NO_COMPRESSION = CompressionPolicy(accept_encodings=(), request_encoding=None)
+
+
+def command_compression(default: CompressionPolicy) -> CompressionPolicy:
+    policy = getattr(current_command.get(), 'compression_policy', None)
+    if isinstance(policy, CompressionPolicy):
+        return policy
+    return default
+
+
+@dataclass(frozen=True)
+class CompressionStats:
+    # Request bodies compressed, and their sizes before and after compression
+    requests_compressed: int = 0
+    request_bytes: int = 0
+    request_bytes_sent: int = 0
+    # Compressed responses read whole, and their sizes received and decoded
+    responses_compressed: int = 0
+    response_bytes_received: int = 0
+    response_bytes: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return (
+            self.request_bytes
+            - self.request_bytes_sent
+            + self.response_bytes
+            - self.response_bytes_received
+        )
+
+
+class CompressionCounters(ForkAware):
+    def __init__(self) -> None:
+        self._stats = CompressionStats()
+        self._lock = threading.Lock()
+        self._track_forks()
+
+    def record_request(self, size: int, sent: int) -> None:
+        self._check_fork()
+        with self._lock:
+            stats = self._stats
+            self._stats = replace(
+                stats,
+                requests_compressed=stats.requests_compressed + 1,
+                request_bytes=stats.request_bytes + size,
+                request_bytes_sent=stats.request_bytes_sent + sent,
+            )
+
+    def record_response(self, received: int, size: int) -> None:
+        self._check_fork()
+        with self._lock:
+            stats = self._stats
+            self._stats = replace(
+                stats,
+                responses_compressed=stats.responses_compressed + 1,
+                response_bytes_received=stats.response_bytes_received + received,
+                response_bytes=stats.response_bytes + size,
+            )
+
+    def stats(self) -> CompressionStats:
+        self._check_fork()
+        with self._lock:
+            return self._stats
+
+    def _reset_after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent
+        self._lock = threading.Lock()
+
+
+class CompressingAdapter(AdapterWrapper):
+    """Negotiates compressed responses and compresses the large request bodies
+
+    Commands override the client's policy with their `compression_policy`
+    attribute. Only responses read whole are counted, not streamed ones.
+    """
+
+    def __init__(
+        self,
+        adapter: BaseAdapter,
+        policy: CompressionPolicy,
+        counters: CompressionCounters,
+    ) -> None:
+        super().__init__(adapter)
+        self.policy = policy
+        self.counters = counters
+
+    def _send(self, request: PreparedRequest, kwargs: dict[str, Any]) -> Response:
+        policy = command_compression(self.policy)
+        accept_encoding = policy.accept_encoding(DECODED_ENCODINGS)
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        compressed = None
+        if isinstance(body, bytes) and 'Content-Encoding' not in request.headers:
+            compressed = policy.compress(body)
+
+        # The caller's request is left as is, e.g. to be sent again
+        request = request.copy()
+        request.headers.setdefault('Accept-Encoding', accept_encoding)
+        if compressed is not None:
+            request.body = compressed
+            request.headers['Content-Encoding'] = policy.request_encoding or ''
+            request.headers['Content-Length'] = str(len(compressed))
+            self.counters.record_request(len(body or b''), len(compressed))
+
+        response = self.adapter.send(request, **kwargs)
+        if not kwargs['stream'] and response.headers.get('Content-Encoding'):
+            self._record_response(response)
+        return response
+
+    def _record_response(self, response: Response) -> None:
+        tell = getattr(response.raw, 'tell', None)
+        size = len(response.content)
+        if tell is not None:
+            self.counters.record_response(tell(), size)
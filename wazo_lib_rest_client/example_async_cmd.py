@@ -0,0 +1,17 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from .async_command import AsyncRESTCommand
+
+
+class AsyncExampleCommand(AsyncRESTCommand):
+
+    resource = 'test'
+
+    async def __call__(self) -> bytes:
+        return await self.test()
+
+    async def test(self) -> bytes:
+        r = await self.session.get(self.base_url)
+        self.raise_from_response(r)
+        return r.content
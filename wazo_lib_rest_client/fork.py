@@ -0,0 +1,47 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+"""Per-process state of the objects inherited by forked children
+
+Connections and sessions must not be used by both a process and its forked
+children, and a lock held by another thread of the parent when it forked is
+never released in the child. Objects keeping such state reset it in the child,
+right after fork() from os.register_at_fork(), or otherwise when they are next
+used from the child, e.g. in uWSGI workers forked without the Python fork hooks.
+"""
+
+from __future__ import annotations
+
+import abc
+import os
+import weakref
+
+
+class ForkAware(abc.ABC):
+    _pid: int
+
+    def _track_forks(self) -> None:
+        self._pid = os.getpid()
+        _OBJECTS.add(self)
+
+    def _check_fork(self) -> None:
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._reset_after_fork()
+
+    @abc.abstractmethod
+    def _reset_after_fork(self) -> None:
+        """Forget the state of the parent, without closing what it still uses"""
+
+
+_OBJECTS: weakref.WeakSet[ForkAware] = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for obj in list(_OBJECTS):
+        obj._check_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
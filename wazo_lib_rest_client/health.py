@@ -0,0 +1,240 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+from types import TracebackType
+from typing import Any, Self
+
+from .balancing import Endpoint, route
+from .client import BaseClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEADLINE = 2.0
+DEFAULT_INTERVAL = 10.0
+# Threads of a HealthMonitor checking the servers, started as needed
+MAX_CHECK_THREADS = 32
+
+
+@dataclass(frozen=True)
+class HealthState:
+    reachable: bool
+    # time.monotonic() when the check started
+    checked_at: float
+
+
+@dataclass(frozen=True)
+class HealthTarget:
+    # The client's URL, sent to `endpoint` when the client has endpoints
+    url: str
+    client: Any
+    endpoint: Endpoint | None = None
+
+
+def health_targets(client: BaseClient) -> list[HealthTarget]:
+    base_url = client.url()
+    if client.endpoints is None:
+        return [HealthTarget(base_url, client)]
+    return [
+        HealthTarget(
+            route(base_url, client.host, client.port, endpoint) or base_url,
+            client,
+            endpoint,
+        )
+        for endpoint in client.endpoints.endpoints
+    ]
+
+
+def check_reachability(
+    clients: Sequence[BaseClient], deadline: float = DEFAULT_DEADLINE
+) -> list[bool]:
+    """Check concurrently whether the server of each client is reachable
+
+    Each check is an is_server_reachable() call timing out after `deadline`
+    seconds, and servers which have not answered by then are unreachable.
+    """
+    checks = [partial(client.is_server_reachable, deadline) for client in clients]
+    return run_checks(checks, deadline)
+
+
+def run_checks(
+    checks: Sequence[Callable[[], bool]],
+    deadline: float,
+    executor: ThreadPoolExecutor | None = None,
+) -> list[bool]:
+    """Run the checks concurrently, on `executor` or on threads of their own"""
+    if not checks:
+        return []
+    if executor is not None:
+        return _run_checks(executor, checks, deadline)
+    executor = ThreadPoolExecutor(len(checks), thread_name_prefix='reachability')
+    try:
+        return _run_checks(executor, checks, deadline)
+    finally:
+        # Checks still running are not waited for, they end with their timeout
+        executor.shutdown(wait=False)
+
+
+def _run_checks(
+    executor: ThreadPoolExecutor,
+    checks: Sequence[Callable[[], bool]],
+    deadline: float,
+) -> list[bool]:
+    futures = [executor.submit(check) for check in checks]
+    done, _ = wait(futures, timeout=deadline)
+    return [_result(future) if future in done else False for future in futures]
+
+
+def _result(future: Future[bool]) -> bool:
+    try:
+        return future.result()
+    except Exception:
+        logger.exception('Reachability check failed')
+        return False
+
+
+class BaseHealthMonitor:
+    """Checks the servers of clients in the background, and keeps their state
+
+    Every `interval` seconds, the servers are checked concurrently like with
+    check_reachability(). Each endpoint of a client with endpoints is checked,
+    and ejected from or re-added to its EndpointGroup. Readiness checks read
+    the states kept instead of sending requests.
+    """
+
+    def __init__(
+        self,
+        clients: Iterable[BaseClient],
+        interval: float = DEFAULT_INTERVAL,
+        deadline: float = DEFAULT_DEADLINE,
+    ) -> None:
+        self.clients = list(clients)
+        self.interval = interval
+        self.deadline = deadline
+        self._states: dict[str, HealthState] = {}
+        self._states_lock = threading.Lock()
+
+    def _targets(self) -> list[HealthTarget]:
+        return [target for client in self.clients for target in health_targets(client)]
+
+    def _record(
+        self,
+        targets: Sequence[HealthTarget],
+        results: Sequence[bool],
+        checked_at: float,
+    ) -> None:
+        for target, reachable in zip(targets, results):
+            if target.endpoint is not None:
+                target.client.endpoints.record_probe(target.endpoint, reachable)
+        with self._states_lock:
+            for target, reachable in zip(targets, results):
+                self._states[target.url] = HealthState(reachable, checked_at)
+
+    def states(self) -> dict[str, HealthState]:
+        """The state of each server and endpoint, by URL"""
+        with self._states_lock:
+            return dict(self._states)
+
+    def is_ready(self, max_age: float | None = None) -> bool:
+        """Whether each client reached at least one of its servers when last checked
+
+        States older than `max_age` seconds count as unreachable.
+        """
+        states = self.states()
+        now = time.monotonic()
+
+        def reachable(target: HealthTarget) -> bool:
+            state = states.get(target.url)
+            if state is None or (
+                max_age is not None and now - state.checked_at > max_age
+            ):
+                return False
+            return state.reachable
+
+        return all(
+            any(reachable(target) for target in health_targets(client))
+            for client in self.clients
+        )
+
+
+class HealthMonitor(BaseHealthMonitor):
+    """Health monitor checking the servers from a thread of its own
+
+    Once started, the servers are checked from a pool of up to
+    MAX_CHECK_THREADS threads, shut down by stop().
+    """
+
+    def __init__(
+        self,
+        clients: Iterable[BaseClient],
+        interval: float = DEFAULT_INTERVAL,
+        deadline: float = DEFAULT_DEADLINE,
+    ) -> None:
+        super().__init__(clients, interval, deadline)
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        # Used by each check until the monitor stops
+        self._executor = ThreadPoolExecutor(
+            MAX_CHECK_THREADS, thread_name_prefix='health-monitor-check'
+        )
+        self._thread = threading.Thread(
+            target=self._run, name='health-monitor', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            # Checks still running are not waited for, they end with their timeout
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.check()
+            except Exception:
+                logger.exception('Health check failed')
+            self._stopped.wait(self.interval)
+
+    def check(self) -> None:
+        """Check every server now"""
+        targets = self._targets()
+        checked_at = time.monotonic()
+        checks = [partial(self._check_target, target) for target in targets]
+        results = run_checks(checks, self.deadline, self._executor)
+        self._record(targets, results, checked_at)
+
+    def _check_target(self, target: HealthTarget) -> bool:
+        if target.endpoint is None:
+            return bool(target.client.is_server_reachable(self.deadline))
+        return bool(target.client._probe_endpoint(target.endpoint, self.deadline))
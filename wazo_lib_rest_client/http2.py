@@ -0,0 +1,263 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import ssl
+import threading
+from collections.abc import Iterator, Mapping
+from http.client import HTTPMessage
+from typing import Any
+
+import h2  # noqa: F401 httpx only imports it when the first connection is opened
+import httpx
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.exceptions import (
+    ConnectionError,
+    ConnectTimeout,
+    ReadTimeout,
+    RequestException,
+    RetryError,
+    SSLError,
+)
+from requests.structures import CaseInsensitiveDict
+from requests.utils import (
+    DEFAULT_CA_BUNDLE_PATH,
+    get_encoding_from_headers,
+    select_proxy,
+)
+from urllib3 import exceptions as urllib3_exceptions
+from urllib3.util.retry import Retry
+
+from .retry import command_retry
+
+# Headers about the connection itself, which HTTP/2 forbids
+HOP_BY_HOP_HEADERS = frozenset(
+    ['connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade']
+)
+
+Timeout = float | tuple[float | None, float | None] | None
+Cert = bytes | str | tuple[bytes | str, bytes | str] | None
+
+
+class HTTP2Adapter(BaseAdapter):
+    """Adapter sending the requests of a session with httpx, over HTTP/2
+
+    HTTP/2 is negotiated with the server during the TLS handshake, and each
+    host is then reached through a single connection multiplexing concurrent
+    requests. Servers which do not offer HTTP/2, and plain HTTP, are reached
+    with HTTP/1.1. Responses are requests' own, so that commands and
+    raise_from_response() do not depend on the protocol.
+    """
+
+    def __init__(self, max_retries: Retry | int = 0, pool_maxsize: int = 10) -> None:
+        super().__init__()
+        self.max_retries = max_retries
+        self._limits = httpx.Limits(
+            max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize
+        )
+        self._transports: dict[tuple[Any, ...], httpx.HTTPTransport] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_retries(self) -> Retry:
+        return command_retry(self._max_retries)
+
+    @max_retries.setter
+    def max_retries(self, retries: Retry | int) -> None:
+        self._max_retries = Retry.from_int(retries)
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: Timeout = None,
+        verify: bool | str = True,
+        cert: Cert = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> Response:
+        method = request.method or 'GET'
+        url = request.url or ''
+        proxy = select_proxy(url, proxies) if proxies else None
+        transport = self._get_transport(verify, cert, proxy)
+        headers = [
+            (name, value)
+            for name, value in request.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        extensions = {'timeout': _httpx_timeout(timeout).as_dict()}
+
+        # The retries follow urllib3's, as with RetryingHTTPAdapter
+        retries = self.max_retries
+        while True:
+            httpx_request = httpx.Request(
+                method,
+                url,
+                headers=headers,
+                content=request.body,
+                extensions=extensions,
+            )
+            try:
+                response = transport.handle_request(httpx_request)
+            except httpx.TransportError as e:
+                try:
+                    retries = retries.increment(method, url, error=_urllib3_error(e))
+                except urllib3_exceptions.HTTPError:
+                    raise _requests_error(e, request) from e
+                retries.sleep()
+                continue
+
+            has_retry_after = 'Retry-After' in response.headers
+            if not retries.is_retry(method, response.status_code, has_retry_after):
+                break
+            try:
+                retries = retries.increment(
+                    method, url, response=_RetriedResponse(response)  # type: ignore[arg-type]
+                )
+            except urllib3_exceptions.MaxRetryError as e:
+                if retries.raise_on_status:
+                    response.close()
+                    raise RetryError(e, request=request) from e
+                break
+            response.close()
+            retries.sleep(_RetriedResponse(response))  # type: ignore[arg-type]
+
+        return self.build_response(request, response, retries)
+
+    def build_response(
+        self, request: PreparedRequest, response: httpx.Response, retries: Retry
+    ) -> Response:
+        result = Response()
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        result.headers = CaseInsensitiveDict(response.headers)
+        result.encoding = get_encoding_from_headers(result.headers)
+        result.raw = RawResponse(response, retries)
+        result.url = request.url or ''
+        result.request = request
+        result.connection = self  # type: ignore[assignment]
+        extract_cookies_to_jar(  # type: ignore[no-untyped-call]
+            result.cookies, request, result.raw
+        )
+        return result
+
+    def _get_transport(
+        self, verify: bool | str, cert: Cert, proxy: str | None
+    ) -> httpx.HTTPTransport:
+        key = (verify, cert, proxy)
+        with self._lock:
+            transport = self._transports.get(key)
+            if transport is None:
+                transport = self._transports[key] = httpx.HTTPTransport(
+                    verify=_ssl_context(verify, cert),
+                    http2=True,
+                    limits=self._limits,
+                    proxy=proxy,
+                )
+            return transport
+
+    def close(self) -> None:
+        with self._lock:
+            transports = list(self._transports.values())
+            self._transports.clear()
+        for transport in transports:
+            transport.close()
+
+
+class RawResponse:
+    """Body of an httpx response, read by requests like urllib3's responses
+
+    `http_version` is the protocol negotiated with the server, e.g. 'HTTP/2'.
+    """
+
+    def __init__(self, response: httpx.Response, retries: Retry) -> None:
+        self.http_version = response.http_version
+        self.retries = retries
+        self._response = response
+        self._chunks: Iterator[bytes] = response.iter_bytes()
+        self._buffer = b''
+        # Read by requests to extract the cookies
+        self._original_response = self
+        self.msg = HTTPMessage()
+        for name, value in response.headers.multi_items():
+            self.msg[name] = value
+
+    def read(self, amt: int | None = None, decode_content: bool = True) -> bytes:
+        try:
+            while amt is None or len(self._buffer) < amt:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    self.close()
+                    break
+                self._buffer += chunk
+        except httpx.TransportError as e:
+            raise _requests_error(e, None) from e
+
+        if amt is None:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class _RetriedResponse:
+    # What urllib3's Retry reads of a response
+
+    def __init__(self, response: httpx.Response) -> None:
+        self.status = response.status_code
+        self.headers = response.headers
+
+    def get_redirect_location(self) -> bool:
+        return False
+
+
+def _httpx_timeout(timeout: Timeout) -> httpx.Timeout:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _ssl_context(verify: bool | str, cert: Cert) -> ssl.SSLContext:
+    cafile = verify if isinstance(verify, str) else DEFAULT_CA_BUNDLE_PATH
+    context = ssl.create_default_context(cafile=cafile)
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if isinstance(cert, tuple):
+        context.load_cert_chain(*cert)
+    elif cert:
+        context.load_cert_chain(cert)
+    return context
+
+
+def _urllib3_error(error: httpx.TransportError) -> Exception:
+    # The errors urllib3's Retry counts as connect or read errors
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+        return urllib3_exceptions.ConnectTimeoutError(str(error))
+    if isinstance(error, httpx.TimeoutException):
+        return urllib3_exceptions.ReadTimeoutError(None, '', str(error))  # type: ignore
+    return urllib3_exceptions.ProtocolError(str(error))
+
+
+def _is_ssl_error(error: BaseException | None) -> bool:
+    while error is not None:
+        if isinstance(error, ssl.SSLError):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _requests_error(error: httpx.TransportError, request: Any) -> RequestException:
+    if isinstance(error, httpx.ConnectTimeout):
+        return ConnectTimeout(error, request=request)
+    if isinstance(error, httpx.TimeoutException):
+        return ReadTimeout(error, request=request)
+    if _is_ssl_error(error):
+        return SSLError(error, request=request)
+    return ConnectionError(error, request=request)
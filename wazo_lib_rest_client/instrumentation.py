@@ -0,0 +1,230 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+from .adapters import AdapterWrapper, current_command
+from .fork import ForkAware
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestInfo:
+    method: str
+    url: str
+    command: str | None
+    resource: str | None
+    bytes_sent: int | None
+
+
+@dataclass
+class RequestTimings:
+    total: float
+    # Time until the response headers were parsed
+    first_byte: float | None = None
+    # Not exposed by requests, set by transports able to measure them
+    dns: float | None = None
+    connect: float | None = None
+    tls: float | None = None
+
+
+@dataclass
+class RequestEvent:
+    request: RequestInfo
+    timings: RequestTimings
+    status_code: int | None = None
+    bytes_received: int | None = None
+    retries: int = 0
+    # A RequestException, or the error of another adapter, e.g. RateLimitExceeded
+    error: Exception | None = None
+
+
+PreRequestHook = Callable[[RequestInfo], None]
+PostRequestHook = Callable[[RequestEvent], None]
+
+
+class Instrumentation:
+    def __init__(self) -> None:
+        self._pre_request_hooks: list[PreRequestHook] = []
+        self._post_request_hooks: list[PostRequestHook] = []
+
+    def add_pre_request_hook(self, hook: PreRequestHook) -> None:
+        self._pre_request_hooks.append(hook)
+
+    def add_post_request_hook(self, hook: PostRequestHook) -> None:
+        self._post_request_hooks.append(hook)
+
+    def before_request(self, info: RequestInfo) -> None:
+        for hook in self._pre_request_hooks:
+            try:
+                hook(info)
+            except Exception:
+                logger.exception('Pre-request hook %s failed', hook)
+
+    def after_request(self, event: RequestEvent) -> None:
+        for hook in self._post_request_hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception('Post-request hook %s failed', hook)
+
+
+def _body_size(body: Any) -> int | None:
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    return None
+
+
+class InstrumentingAdapter(AdapterWrapper):
+    def __init__(self, adapter: BaseAdapter, instrumentation: Instrumentation) -> None:
+        super().__init__(adapter)
+        self.instrumentation = instrumentation
+
+    def _send(self, request: PreparedRequest, kwargs: dict[str, Any]) -> Response:
+        command = current_command.get()
+        info = RequestInfo(
+            method=request.method or '',
+            url=request.url or '',
+            command=type(command).__name__ if command is not None else None,
+            resource=getattr(command, 'resource', None),
+            bytes_sent=_body_size(request.body),
+        )
+        self.instrumentation.before_request(info)
+
+        start = time.perf_counter()
+        try:
+            # The adapter returns once the response headers are parsed, before
+            # the body is read
+            response = self.adapter.send(request, **kwargs)
+            first_byte = time.perf_counter() - start
+            bytes_received = None if kwargs['stream'] else len(response.content)
+        except Exception as e:
+            timings = RequestTimings(total=time.perf_counter() - start)
+            self.instrumentation.after_request(RequestEvent(info, timings, error=e))
+            raise
+
+        timings = RequestTimings(
+            total=time.perf_counter() - start, first_byte=first_byte
+        )
+        retries = getattr(getattr(response.raw, 'retries', None), 'history', ())
+        event = RequestEvent(
+            info,
+            timings,
+            status_code=response.status_code,
+            bytes_received=bytes_received,
+            retries=len(retries),
+        )
+        self.instrumentation.after_request(event)
+        return response
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    def escape(value: str) -> str:
+        return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+@dataclass
+class _Histogram:
+    counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+
+class HistogramCollector(ForkAware):
+    """Post-request hook keeping request durations, dumped as Prometheus text"""
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        prefix: str = 'wazo_rest_client',
+    ) -> None:
+        self.buckets = sorted(buckets)
+        self.prefix = prefix
+        self._histograms: dict[tuple[str, str, str], _Histogram] = {}
+        self._lock = threading.Lock()
+        self._track_forks()
+
+    def __call__(self, event: RequestEvent) -> None:
+        labels = (
+            event.request.command or '',
+            event.request.method,
+            str(event.status_code) if event.status_code is not None else 'error',
+        )
+        duration = event.timings.total
+        self._check_fork()
+        with self._lock:
+            histogram = self._histograms.get(labels)
+            if histogram is None:
+                histogram = self._histograms[labels] = _Histogram(
+                    [0] * len(self.buckets)
+                )
+            bucket = bisect.bisect_left(self.buckets, duration)
+            if bucket < len(self.buckets):
+                histogram.counts[bucket] += 1
+            histogram.sum += duration
+            histogram.count += 1
+            histogram.bytes_sent += event.request.bytes_sent or 0
+            histogram.bytes_received += event.bytes_received or 0
+
+    def to_prometheus(self) -> str:
+        duration = f'{self.prefix}_request_duration_seconds'
+        sent = f'{self.prefix}_request_bytes_total'
+        received = f'{self.prefix}_response_bytes_total'
+        lines = [
+            f'# HELP {duration} Duration of the requests sent by the REST clients',
+            f'# TYPE {duration} histogram',
+        ]
+        counters = [
+            f'# HELP {sent} Size of the request bodies sent by the REST clients',
+            f'# TYPE {sent} counter',
+        ]
+        received_counters = [
+            f'# HELP {received} Size of the response bodies received by the REST clients',
+            f'# TYPE {received} counter',
+        ]
+
+        self._check_fork()
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        for (command, method, status), histogram in histograms:
+            labels = {'command': command, 'method': method, 'status': status}
+            cumulative = 0
+            for bound, count in zip(self.buckets, histogram.counts):
+                cumulative += count
+                bucket_labels = _format_labels(dict(labels, le=repr(float(bound))))
+                lines.append(f'{duration}_bucket{{{bucket_labels}}} {cumulative}')
+            inf_labels = _format_labels(dict(labels, le='+Inf'))
+            lines.append(f'{duration}_bucket{{{inf_labels}}} {histogram.count}')
+            formatted = _format_labels(labels)
+            lines.append(f'{duration}_sum{{{formatted}}} {histogram.sum}')
+            lines.append(f'{duration}_count{{{formatted}}} {histogram.count}')
+            counters.append(f'{sent}{{{formatted}}} {histogram.bytes_sent}')
+            received_counters.append(
+                f'{received}{{{formatted}}} {histogram.bytes_received}'
+            )
+
+        return '\n'.join(lines + counters + received_counters) + '\n'
+
+    def _reset_after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent
+        self._lock = threading.Lock()
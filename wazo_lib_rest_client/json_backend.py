@@ -0,0 +1,38 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+"""JSON decoding shared by the commands
+
+orjson is used when it is installed (the `orjson` extra), json otherwise. Both
+decode bytes directly, without decoding them to a str first.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+JSONInput = bytes | bytearray | str
+
+
+def _load_backend() -> tuple[str, Callable[[JSONInput], Any]]:
+    try:
+        import orjson
+    except ImportError:
+        return 'json', json.loads
+    return 'orjson', orjson.loads
+
+
+BACKEND, loads = _load_backend()
+
+
+def is_json_content_type(content_type: str | None) -> bool:
+    """Whether a body of `content_type` may be JSON
+
+    A missing Content-Type is accepted, since some services do not send one.
+    """
+    if not content_type:
+        return True
+    media_type = content_type.partition(';')[0].strip().lower()
+    return media_type == 'application/json' or media_type.endswith('+json')
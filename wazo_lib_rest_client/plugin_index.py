@@ -0,0 +1,29 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+"""Command writing the plugin index
+
+It is a module of its own, not imported by the package, so that running it
+with `python -m` does not import it twice.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from .plugins import write_index
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Write the plugin index used by wazo REST clients',
+    )
+    parser.add_argument('-o', '--output', required=True, help='index file to write')
+    parser.add_argument('namespaces', nargs='+', help='plugin namespaces to index')
+    args = parser.parse_args(argv)
+
+    write_index(args.output, args.namespaces)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from importlib import metadata
+from typing import Any, Protocol
+
+from stevedore import extension
+
+from .fork import ForkAware
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_INDEX_ENV = 'WAZO_REST_CLIENT_PLUGIN_INDEX'
+DEFAULT_MAX_NAMESPACES = 64
+
+_INDEX_CACHE: dict[str, dict[str, Any]] = {}
+
+# Names of the metadata and path files of the installed distributions
+_DISTRIBUTION_SUFFIXES = ('.dist-info', '.egg-info', '.egg-link', '.pth')
+
+
+class Extension(Protocol):
+    name: str
+
+    @property
+    def plugin(self) -> Any:
+        """Object loaded from the entry point of the extension"""
+
+
+class IndexedExtension:
+    def __init__(self, name: str, target: str) -> None:
+        self.name = name
+        self.target = target
+        self._plugin: Any = None
+
+    @property
+    def plugin(self) -> Any:
+        # The plugin module is only imported when the command is first used
+        if self._plugin is None:
+            module_name, _, attributes = self.target.partition(':')
+            plugin = importlib.import_module(module_name)
+            for attribute in attributes.split('.'):
+                plugin = getattr(plugin, attribute)
+            self._plugin = plugin
+        return self._plugin
+
+
+def _installation_paths() -> list[str]:
+    # The script and working directories depend on how the process is started,
+    # not on what is installed
+    excluded = {os.path.abspath(sys.path[0]) if sys.path else '', os.getcwd()}
+    return [path for path in sys.path if path and os.path.abspath(path) not in excluded]
+
+
+def _fingerprint() -> str:
+    """Identifies the installed distributions, by their names and versions
+
+    The metadata directory of a distribution is named after both, so listing
+    the directories of sys.path is enough, without reading any metadata.
+    """
+    digest = hashlib.sha256()
+    for path in _installation_paths():
+        try:
+            names = sorted(
+                name
+                for name in os.listdir(path)
+                if name.endswith(_DISTRIBUTION_SUFFIXES)
+            )
+        except OSError:
+            names = []
+        digest.update('\0'.join([path, *names, '\n']).encode())
+    return digest.hexdigest()
+
+
+def build_index(namespaces: Iterable[str]) -> dict[str, Any]:
+    return {
+        'fingerprint': _fingerprint(),
+        'namespaces': {
+            namespace: {
+                entry_point.name: entry_point.value
+                for entry_point in metadata.entry_points(group=namespace)
+            }
+            for namespace in namespaces
+        },
+    }
+
+
+def write_index(path: str, namespaces: Iterable[str]) -> None:
+    index = build_index(namespaces)
+    with open(path, 'w') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    _INDEX_CACHE.pop(path, None)
+
+
+def read_index(path: str) -> dict[str, Any] | None:
+    if path not in _INDEX_CACHE:
+        try:
+            with open(path) as f:
+                _INDEX_CACHE[path] = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug('Could not read plugin index %s: %s', path, e)
+            return None
+    return _INDEX_CACHE[path]
+
+
+def _load_indexed_extensions(namespace: str) -> list[IndexedExtension] | None:
+    path = os.environ.get(PLUGIN_INDEX_ENV)
+    if not path:
+        return None
+
+    index = read_index(path)
+    if index is None:
+        return None
+
+    plugins = index.get('namespaces', {}).get(namespace)
+    if plugins is None:
+        logger.debug('Namespace %s is missing from plugin index %s', namespace, path)
+        return None
+
+    if index.get('fingerprint') != _fingerprint():
+        logger.debug('Plugin index %s is stale', path)
+        return None
+
+    return [IndexedExtension(name, target) for name, target in plugins.items()]
+
+
+def load_extensions(namespace: str) -> list[Extension]:
+    indexed = _load_indexed_extensions(namespace)
+    if indexed is not None:
+        return list(indexed)
+    return list(extension.ExtensionManager(namespace))
+
+
+@dataclass(frozen=True)
+class RegistryStats:
+    hits: int
+    misses: int
+    namespaces: int
+
+
+class PluginRegistry(ForkAware):
+    """Plugins of each namespace, loaded once per process
+
+    The plugins loaded before a fork are kept by the children.
+    """
+
+    def __init__(self, max_namespaces: int | None = DEFAULT_MAX_NAMESPACES) -> None:
+        self._max_namespaces = max_namespaces
+        self._plugins: OrderedDict[str, dict[str, Extension]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._namespace_locks: dict[str, threading.Lock] = {}
+        self._hits = 0
+        self._misses = 0
+        self._track_forks()
+
+    def get(self, namespace: str) -> Mapping[str, Extension]:
+        self._check_fork()
+        with self._lock:
+            plugins = self._lookup(namespace)
+            if plugins is not None:
+                return plugins
+            namespace_lock = self._namespace_locks.setdefault(
+                namespace, threading.Lock()
+            )
+
+        # Only one thread scans a namespace, the others wait for its result
+        with namespace_lock:
+            try:
+                with self._lock:
+                    plugins = self._lookup(namespace)
+                    if plugins is not None:
+                        return plugins
+                    self._misses += 1
+
+                plugins = {ext.name: ext for ext in load_extensions(namespace)}
+
+                with self._lock:
+                    self._plugins[namespace] = plugins
+                    if self._max_namespaces is not None:
+                        while len(self._plugins) > self._max_namespaces:
+                            self._plugins.popitem(last=False)
+            finally:
+                # The lock is only kept while the namespace is scanned: the
+                # threads waiting for it already hold it, the next ones find
+                # the plugins, or a new lock once they are evicted
+                with self._lock:
+                    if self._namespace_locks.get(namespace) is namespace_lock:
+                        del self._namespace_locks[namespace]
+        return plugins
+
+    def _lookup(self, namespace: str) -> dict[str, Extension] | None:
+        plugins = self._plugins.get(namespace)
+        if plugins is not None:
+            self._plugins.move_to_end(namespace)
+            self._hits += 1
+        return plugins
+
+    def invalidate(self, namespace: str | None = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._plugins.clear()
+            else:
+                self._plugins.pop(namespace, None)
+
+    def reload(self, namespace: str) -> Mapping[str, Extension]:
+        self.invalidate(namespace)
+        return self.get(namespace)
+
+    def prewarm(self, namespaces: Iterable[str]) -> None:
+        for namespace in namespaces:
+            for ext in self.get(namespace).values():
+                ext.plugin  # imports the plugin module
+
+    def stats(self) -> RegistryStats:
+        with self._lock:
+            return RegistryStats(self._hits, self._misses, len(self._plugins))
+
+    def _reset_after_fork(self) -> None:
+        # Only the locks are reset: the plugins need not be loaded again
+        self._lock = threading.Lock()
+        self._namespace_locks = {}
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def __contains__(self, namespace: object) -> bool:
+        return namespace in self._plugins
+
+    def __getitem__(self, namespace: str) -> list[Extension]:
+        return list(self._plugins[namespace].values())
+
+    def __len__(self) -> int:
+        return len(self._plugins)
@@ -0,0 +1,155 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+from .fork import ForkAware
+from .retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_POOLS = 64
+DEFAULT_IDLE_TIMEOUT = 60.0
+
+
+@dataclass(frozen=True)
+class PoolKey:
+    scheme: str
+    host: str
+    port: int | None
+    verify: bool | str
+    # Requests are retried by the pool's adapter, so its policy is in the key
+    retry_policy: RetryPolicy | None = None
+    http2: bool = False
+
+
+@dataclass
+class _Pool:
+    adapter: BaseAdapter
+    last_used: float
+
+
+class ConnectionPoolRegistry(ForkAware):
+    """Connection pools shared by all the clients of an endpoint
+
+    Clients borrow the pool of their endpoint for each request and keep their
+    own headers, so creating a client per request or per token does not open
+    new connections. Pools idle for more than `idle_timeout` seconds drop their
+    connections, and the least recently used pools are closed past `max_pools`.
+    The registry is emptied in the child after a fork, since connections
+    inherited from the parent must not be used by both processes.
+    """
+
+    def __init__(
+        self,
+        max_pools: int = DEFAULT_MAX_POOLS,
+        idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        self.max_pools = max_pools
+        self.idle_timeout = idle_timeout
+        self._pools: OrderedDict[PoolKey, _Pool] = OrderedDict()
+        self._lock = threading.Lock()
+        self._track_forks()
+
+    def acquire(self, key: PoolKey, factory: Callable[[], BaseAdapter]) -> BaseAdapter:
+        """Return the adapter of `key`, created with `factory` if needed
+
+        The first client of an endpoint sets the size of its pool.
+        """
+        self._check_fork()
+        now = time.monotonic()
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _Pool(factory(), now)
+                self._evict_least_recently_used()
+            else:
+                self._pools.move_to_end(key)
+                if self._is_idle(pool, now):
+                    logger.debug('Dropping idle connections to %s', key.host)
+                    pool.adapter.close()
+            pool.last_used = now
+            return pool.adapter
+
+    def evict_idle(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for pool in self._pools.values():
+                if self._is_idle(pool, now):
+                    pool.adapter.close()
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, OrderedDict()
+        for pool in pools.values():
+            pool.adapter.close()
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def __contains__(self, key: PoolKey) -> bool:
+        return key in self._pools
+
+    def _is_idle(self, pool: _Pool, now: float) -> bool:
+        if self.idle_timeout is None:
+            return False
+        return now - pool.last_used > self.idle_timeout
+
+    def _evict_least_recently_used(self) -> None:
+        while len(self._pools) > self.max_pools:
+            _, pool = self._pools.popitem(last=False)
+            pool.adapter.close()
+
+    def _reset_after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent, and the
+        # sockets are shared with the parent: forget both without closing them
+        self._lock = threading.Lock()
+        self._pools = OrderedDict()
+
+
+SHARED_POOLS = ConnectionPoolRegistry()
+
+
+class SharedPoolAdapter(BaseAdapter):
+    """Adapter sending the requests of a client through a shared pool
+
+    The pool is looked up on each request, so a pool evicted or reset after a
+    fork is transparently replaced. Closing a client's session leaves the
+    shared pool open.
+    """
+
+    def __init__(
+        self,
+        registry: ConnectionPoolRegistry,
+        key: PoolKey,
+        factory: Callable[[], BaseAdapter],
+    ) -> None:
+        super().__init__()
+        self.registry = registry
+        self.key = key
+        self.factory = factory
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: float | tuple[float, float] | tuple[float, None] | None = None,
+        verify: bool | str = True,
+        cert: bytes | str | tuple[bytes | str, bytes | str] | None = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> Response:
+        adapter = self.registry.acquire(self.key, self.factory)
+        return adapter.send(request, stream, timeout, verify, cert, proxies)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,331 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+from .adapters import AdapterWrapper
+from .fork import ForkAware
+
+logger = logging.getLogger(__name__)
+
+# Tenants of which the limits are kept, the idle ones are forgotten past it
+MAX_TENANTS = 1024
+# A 429 response divides the rate and the concurrency limit by this factor...
+BACKOFF_FACTOR = 2
+# ...down to this ratio of the configured rate
+MIN_RATE_RATIO = 0.05
+# Each other response then adds this ratio of the configured rate
+RECOVERY_RATIO = 0.1
+# Interval at which asynchronous requests check for a request in flight ending
+ASYNC_POLL_INTERVAL = 0.01
+
+
+class RateLimitExceeded(Exception):
+    """The request was not sent, to keep within the limits
+
+    It is not a RequestException: the server was not involved, so neither the
+    circuit breaker nor the load balancer count it as a failure.
+    """
+
+    def __init__(self, key: str, retry_after: float | None) -> None:
+        super().__init__(f'Rate limit of {key} exceeded')
+        self.key = key
+        # Seconds before the request could be sent, None when it waits for
+        # requests in flight
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    # Requests per second, unlimited when None
+    rate: float | None = None
+    # Requests sent at once after an idle period, the rate rounded up by default
+    burst: int | None = None
+    # Requests in flight at the same time, unlimited when None
+    max_concurrency: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError('rate must be positive')
+        if self.burst is not None and self.burst < 1:
+            raise ValueError('burst must be at least 1')
+        if self.max_concurrency is not None and self.max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+
+
+UNLIMITED = RateLimit()
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header, in seconds or as a date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        logger.debug('Invalid Retry-After header: %s', value)
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class _Bucket:
+    """Token bucket and requests in flight of a limit, adapted to 429 responses"""
+
+    def __init__(self, limit: RateLimit, now: float) -> None:
+        self.limit = limit
+        self.rate = limit.rate
+        self.capacity = float(limit.burst or math.ceil(limit.rate or 1))
+        self.tokens = self.capacity
+        self.updated = now
+        self.concurrency = limit.max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+
+    def delay(self, now: float) -> float:
+        """Seconds before a request may be sent, inf until a request ends"""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.concurrency is not None and self.in_flight >= self.concurrency:
+            return math.inf
+        if self.rate is None:
+            return 0.0
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.in_flight += 1
+        if self.rate is not None:
+            self.tokens -= 1
+
+    def throttle(self, now: float, retry_after: float | None) -> None:
+        if retry_after is not None:
+            self.paused_until = max(self.paused_until, now + retry_after)
+        if self.rate is not None and self.limit.rate is not None:
+            self._refill(now)
+            minimum = self.limit.rate * MIN_RATE_RATIO
+            self.rate = max(self.rate / BACKOFF_FACTOR, minimum)
+        if self.concurrency is not None:
+            self.concurrency = max(1, self.concurrency // BACKOFF_FACTOR)
+
+    def recover(self, now: float) -> None:
+        if self.rate is not None and self.limit.rate is not None:
+            self._refill(now)
+            recovered = self.rate + self.limit.rate * RECOVERY_RATIO
+            self.rate = min(recovered, self.limit.rate)
+        if self.concurrency is not None and self.limit.max_concurrency is not None:
+            self.concurrency = min(self.concurrency + 1, self.limit.max_concurrency)
+
+    def is_idle(self, now: float) -> bool:
+        """Whether the bucket is back to its initial state"""
+        if self.rate is not None:
+            self._refill(now)
+            if self.tokens < self.capacity:
+                return False
+        return (
+            self.in_flight == 0
+            and now >= self.paused_until
+            and self.rate == self.limit.rate
+            and self.concurrency == self.limit.max_concurrency
+        )
+
+    def _refill(self, now: float) -> None:
+        assert self.rate is not None
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+
+class RateLimiter(ForkAware):
+    """Requests per second and requests in flight, in total and per tenant
+
+    `limit` applies to all the requests, and `tenant_limit` to the requests of
+    each Wazo-Tenant separately, unless `tenant_limits` has one for the
+    tenant. A request is sent once each of its limits lets it through: until
+    then, it waits up to `timeout` seconds when `blocking`, or fails right away
+    with RateLimitExceeded.
+
+    A 429 response pauses the requests of its tenant, or all of them without
+    a tenant, for the time of its Retry-After header, and halves their rate
+    and concurrency limits. The limits recover with the responses that follow.
+    A limiter can be shared by the clients of a service.
+    """
+
+    def __init__(
+        self,
+        limit: RateLimit | None = None,
+        tenant_limit: RateLimit | None = None,
+        tenant_limits: Mapping[str, RateLimit] | None = None,
+        blocking: bool = True,
+        timeout: float | None = None,
+    ) -> None:
+        self.limit = limit or UNLIMITED
+        self.tenant_limit = tenant_limit or UNLIMITED
+        self.tenant_limits = dict(tenant_limits or {})
+        self.blocking = blocking
+        self.timeout = timeout
+        self._global = _Bucket(self.limit, time.monotonic())
+        self._tenants: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._track_forks()
+
+    def acquire(
+        self,
+        tenant: str | None = None,
+        blocking: bool | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """Wait until a request of `tenant` may be sent, and count it in flight
+
+        `blocking` and `timeout` override the limiter's. Each acquire() must be
+        followed by a release().
+        """
+        self._check_fork()
+        blocking = self.blocking if blocking is None else blocking
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while True:
+                delay = self._try_acquire(tenant)
+                if delay is None:
+                    return
+                wait = self._wait_time(tenant, delay, blocking, deadline)
+                self._released.wait(None if math.isinf(wait) else wait)
+
+    async def acquire_async(
+        self,
+        tenant: str | None = None,
+        blocking: bool | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """Like acquire(), waiting without blocking the event loop"""
+        self._check_fork()
+        blocking = self.blocking if blocking is None else blocking
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                delay = self._try_acquire(tenant)
+                if delay is None:
+                    return
+                wait = self._wait_time(tenant, delay, blocking, deadline)
+            await asyncio.sleep(min(wait, ASYNC_POLL_INTERVAL))
+
+    def release(
+        self,
+        tenant: str | None = None,
+        status_code: int | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        """End a request of `tenant`, adapting the limits to its response status"""
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._buckets(tenant, now)
+            for bucket in buckets:
+                bucket.in_flight = max(0, bucket.in_flight - 1)
+            if status_code == 429:
+                # The tenant is slowed down, the others are not
+                logger.debug(
+                    'Requests of %s throttled by the server', tenant or 'all tenants'
+                )
+                buckets[-1].throttle(now, retry_after)
+            elif status_code is not None:
+                for bucket in buckets:
+                    bucket.recover(now)
+            self._released.notify_all()
+
+    def _try_acquire(self, tenant: str | None) -> float | None:
+        """None when the request is acquired, else the seconds before a retry"""
+        now = time.monotonic()
+        buckets = self._buckets(tenant, now)
+        delay = max(bucket.delay(now) for bucket in buckets)
+        if delay > 0:
+            return delay
+        for bucket in buckets:
+            bucket.take()
+        return None
+
+    def _wait_time(
+        self,
+        tenant: str | None,
+        delay: float,
+        blocking: bool,
+        deadline: float | None,
+    ) -> float:
+        key = f'tenant {tenant}' if tenant else 'all tenants'
+        retry_after = None if math.isinf(delay) else delay
+        if not blocking:
+            raise RateLimitExceeded(key, retry_after)
+        if deadline is None:
+            return delay
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RateLimitExceeded(key, retry_after)
+        return min(delay, remaining)
+
+    def _buckets(self, tenant: str | None, now: float) -> list[_Bucket]:
+        """The buckets of a request, the most specific last"""
+        if not tenant:
+            return [self._global]
+        bucket = self._tenants.get(tenant)
+        if bucket is None:
+            if len(self._tenants) >= MAX_TENANTS:
+                self._forget_idle_tenants(now)
+            limit = self.tenant_limits.get(tenant, self.tenant_limit)
+            bucket = self._tenants[tenant] = _Bucket(limit, now)
+        return [self._global, bucket]
+
+    def _forget_idle_tenants(self, now: float) -> None:
+        for tenant, bucket in list(self._tenants.items()):
+            if bucket.is_idle(now):
+                del self._tenants[tenant]
+
+    def _reset_after_fork(self) -> None:
+        # The requests in flight are the parent's, and so may be the lock
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        for bucket in (self._global, *self._tenants.values()):
+            bucket.in_flight = 0
+
+
+class RateLimitingAdapter(AdapterWrapper):
+    """Sends the requests within the limits of a RateLimiter
+
+    The tenant of a request is its Wazo-Tenant header, set by the client or
+    by a command called with a tenant_uuid. A request is in flight until its
+    response headers are received.
+    """
+
+    def __init__(self, adapter: BaseAdapter, limiter: RateLimiter) -> None:
+        super().__init__(adapter)
+        self.limiter = limiter
+
+    def _send(self, request: PreparedRequest, kwargs: dict[str, Any]) -> Response:
+        tenant = request.headers.get('Wazo-Tenant') or None
+        self.limiter.acquire(tenant)
+        status_code = retry_after = None
+        try:
+            response = self.adapter.send(request, **kwargs)
+            status_code = response.status_code
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        finally:
+            self.limiter.release(tenant, status_code, retry_after)
+        return response
@@ -0,0 +1,148 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from types import TracebackType
+from typing import Any
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import ConnectionPool
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.response import BaseHTTPResponse
+from urllib3.util.retry import Retry
+
+from .adapters import current_command
+from .fork import ForkAware
+
+IDEMPOTENT_METHODS = frozenset(['DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'])
+
+
+class RetryBudget(ForkAware):
+    """Token bucket limiting the retries of all the clients sharing it
+
+    Each retry takes a token, and tokens are added back at `refill_rate` per
+    second up to `capacity`. When a backend is down, retries stop once the
+    bucket is empty instead of multiplying the load on the backend.
+    """
+
+    def __init__(self, capacity: float = 100, refill_rate: float = 10) -> None:
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._track_forks()
+
+    def try_acquire(self) -> bool:
+        self._check_fork()
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+            self._updated_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _reset_after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent
+        self._lock = threading.Lock()
+
+
+DEFAULT_RETRY_BUDGET = RetryBudget()
+
+
+class BudgetedRetry(Retry):
+    budget: RetryBudget | None = None
+    backoff_cap: float = Retry.DEFAULT_BACKOFF_MAX
+    jitter: bool = False
+
+    def new(self, **kwargs: Any) -> BudgetedRetry:
+        retry = super().new(**kwargs)
+        retry.budget = self.budget
+        retry.backoff_cap = self.backoff_cap
+        retry.jitter = self.jitter
+        return retry
+
+    def get_backoff_time(self) -> float:
+        backoff = min(super().get_backoff_time(), self.backoff_cap)
+        if self.jitter:
+            # Spread the retries of concurrent callers over half the backoff
+            return backoff / 2 + random.uniform(0, backoff / 2)
+        return backoff
+
+    def increment(
+        self,
+        method: str | None = None,
+        url: str | None = None,
+        response: BaseHTTPResponse | None = None,
+        error: Exception | None = None,
+        _pool: ConnectionPool | None = None,
+        _stacktrace: TracebackType | None = None,
+    ) -> BudgetedRetry:
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        if self.budget is not None and not self.budget.try_acquire():
+            reason = error or ResponseError('retry budget exhausted')
+            raise MaxRetryError(_pool, url or '', reason)  # type: ignore[arg-type]
+        return retry
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    total: int = 3
+    status_forcelist: frozenset[int] = frozenset([429, 502, 503, 504])
+    allowed_methods: frozenset[str] = IDEMPOTENT_METHODS
+    connect_errors: bool = True
+    read_errors: bool = True
+    backoff_factor: float = 0.5
+    backoff_max: float = 30
+    jitter: bool = True
+    respect_retry_after_header: bool = True
+    budget: RetryBudget | None = DEFAULT_RETRY_BUDGET
+
+    @cached_property
+    def retry(self) -> BudgetedRetry:
+        retry = BudgetedRetry(
+            total=self.total,
+            connect=None if self.connect_errors else 0,
+            read=None if self.read_errors else 0,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=self.allowed_methods,
+            backoff_factor=self.backoff_factor,
+            respect_retry_after_header=self.respect_retry_after_header,
+            # The last response is returned when retries are exhausted
+            raise_on_status=False,
+        )
+        retry.budget = self.budget
+        retry.backoff_cap = self.backoff_max
+        retry.jitter = self.jitter
+        return retry
+
+
+def command_retry(default: Retry) -> Retry:
+    policy = getattr(current_command.get(), 'retry_policy', None)
+    if isinstance(policy, RetryPolicy):
+        return policy.retry
+    return default
+
+
+class RetryingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter using the retry policy of the command sending the request
+
+    Commands override the client's policy with their `retry_policy` attribute.
+    """
+
+    @property
+    def max_retries(self) -> Retry:
+        return command_retry(self._max_retries)
+
+    @max_retries.setter
+    def max_retries(self, retries: Retry | int) -> None:
+        self._max_retries = Retry.from_int(retries)
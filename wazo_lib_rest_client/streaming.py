@@ -0,0 +1,107 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+# What may follow the part of a number received so far, e.g. `.5` after `10`
+_NUMBER_CONTINUATION = re.compile(r'[0-9.eE+-]*\Z')
+
+
+class _JSONReader:
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        try:
+            text = self._decoder.decode(next(self._chunks))
+        except StopIteration:
+            text = self._decoder.decode(b'', final=True)
+            self._eof = True
+        # Drop what was already parsed, to keep only the current item in memory
+        self._buffer = self._buffer[self._position :] + text
+        self._position = 0
+        return True
+
+    def peek(self) -> str | None:
+        while True:
+            while self._position < len(self._buffer):
+                char = self._buffer[self._position]
+                if char not in _WHITESPACE:
+                    return char
+                self._position += 1
+            if not self._fill():
+                return None
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if char is None or char not in chars:
+            found = 'end of document' if char is None else repr(char)
+            raise ValueError(f'Expected one of {chars!r}, found {found}')
+        self._position += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            if (
+                type(value) in (int, float)
+                and _NUMBER_CONTINUATION.match(self._buffer, end)
+                and self._fill()
+            ):
+                # The number may go on in the next chunk: `10.` is decoded as
+                # 10 until the `5` that follows is received
+                continue
+            self._position = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str | None = None) -> Iterator[Any]:
+    """Yield the items of a JSON array as the chunks of the document are received
+
+    The array is either the whole document, or the value of `key` in the
+    document's top-level object, e.g. `items` in `{"items": [...], "total": 2}`.
+    """
+    reader = _JSONReader(chunks)
+
+    if key is not None:
+        reader.expect('{')
+        if reader.peek() == '}':
+            raise ValueError(f'Key {key!r} not found')
+        while True:
+            name = reader.value()
+            reader.expect(':')
+            if name == key:
+                break
+            reader.value()
+            if reader.expect(',}') == '}':
+                raise ValueError(f'Key {key!r} not found')
+
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(',]') == ']':
+            return
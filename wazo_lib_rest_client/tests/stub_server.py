@@ -0,0 +1,100 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import socket
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from email.message import Message
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    headers: Message
+    body: bytes | None = None
+
+
+@dataclass
+class StubResponse:
+    status: int = 200
+    body: bytes = b''
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+Responder = Callable[[StubRequest], StubResponse]
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local HTTP server answering each request with `respond(request)`
+
+    The requests received and the connections accepted are recorded. With
+    `keep_alive`, the connections are kept open between requests (HTTP/1.1).
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, respond: Responder | None = None, keep_alive: bool = False
+    ) -> None:
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.respond = respond or (lambda request: StubResponse())
+        self.protocol_version = 'HTTP/1.1' if keep_alive else 'HTTP/1.0'
+        self.requests: list[StubRequest] = []
+        self.connections = 0
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self, test: TestCase) -> StubServer:
+        """Serve from a thread until the end of `test`"""
+        thread = threading.Thread(target=self.serve_forever, args=(0.01,), daemon=True)
+        thread.start()
+        test.addCleanup(self.server_close)
+        test.addCleanup(self.shutdown)
+        return self
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def setup(self) -> None:
+        self.protocol_version = self.server.protocol_version
+        super().setup()
+
+    def do_GET(self) -> None:
+        length = self.headers.get('Content-Length')
+        body = self.rfile.read(int(length)) if length else None
+        request = StubRequest(self.command, self.path, self.headers, body)
+        self.server.requests.append(request)
+        response = self.server.respond(request)
+
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        if 'Content-Length' not in response.headers:
+            self.send_header('Content-Length', str(len(response.body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(response.body)
+
+    do_HEAD = do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+def unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
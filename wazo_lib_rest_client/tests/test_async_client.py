@@ -0,0 +1,183 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import io
+import unittest
+
+import httpx
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_string,
+    equal_to,
+    has_entries,
+    is_,
+    raises,
+)
+from requests.exceptions import HTTPError
+
+from ..async_client import AsyncBaseClient
+from ..async_command import AsyncHTTPCommand, AsyncRESTCommand
+from ..example_async_cmd import AsyncExampleCommand
+
+
+class AsyncClient(AsyncBaseClient):
+
+    namespace = 'test_rest_client.async_commands'
+    example: AsyncExampleCommand
+
+    def __init__(self, handler, **kwargs):
+        super().__init__('localhost', 1234, version='1.1', https=False, **kwargs)
+        self._handler = handler
+
+    def _build_transport(self):
+        return httpx.MockTransport(self._handler)
+
+
+class TestAsyncBaseClient(unittest.IsolatedAsyncioTestCase):
+    async def test_command_request(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, content=b'{"foo": "bar"}')
+
+        async with AsyncClient(handler, token='the-one-ring', tenant='t1') as client:
+            result = await client.example()
+
+        assert_that(result, equal_to(b'{"foo": "bar"}'))
+        assert_that(str(requests[0].url), equal_to('http://localhost:1234/1.1/test'))
+        assert_that(
+            dict(requests[0].headers),
+            has_entries({'x-auth-token': 'the-one-ring', 'wazo-tenant': 't1'}),
+        )
+
+    async def test_user_agent_sent(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200)
+
+        async with AsyncClient(handler, user_agent='myagent') as client:
+            await client.example()
+
+        assert_that(requests[0].headers['User-Agent'], equal_to('myagent'))
+        assert_that(requests[0].headers['Connection'], equal_to('keep-alive'))
+
+    async def test_session_is_shared_and_follows_token(self):
+        client = AsyncClient(lambda request: httpx.Response(204))
+        session = client.session()
+
+        client.set_token('new-token')
+
+        assert_that(client.session(), is_(session))
+        assert_that(session.headers['X-Auth-Token'], equal_to('new-token'))
+        await client.aclose()
+
+    async def test_command_error_is_raised_as_http_error(self):
+        def handler(request):
+            return httpx.Response(404, json={'message': 'No such thing'})
+
+        async with AsyncClient(handler) as client:
+            with self.assertRaises(HTTPError) as context:
+                await client.example()
+
+        assert_that(
+            str(context.exception),
+            equal_to(
+                '404 Client Error: No such thing for url: http://localhost:1234/1.1/test'
+            ),
+        )
+        assert_that(context.exception.response.status_code, equal_to(404))
+
+    def test_sync_only_arguments_raise_type_error(self):
+        with self.assertRaises(TypeError) as context:
+            AsyncBaseClient('localhost', 443, retry_policy=None, keep_alive=True)
+
+        assert_that(str(context.exception), contains_string('keep_alive, retry_policy'))
+
+    async def test_is_server_reachable(self):
+        def handler(request):
+            raise httpx.ConnectError('refused', request=request)
+
+        async with AsyncClient(handler) as client:
+            result = await client.is_server_reachable()
+
+        assert_that(result, is_(False))
+
+
+class UsersCommand(AsyncRESTCommand):
+    resource = 'users'
+
+
+class TestAsyncCommandHelpers(unittest.IsolatedAsyncioTestCase):
+    def new_command(self, handler):
+        client = AsyncClient(handler)
+        self.addAsyncCleanup(client.aclose)
+        return UsersCommand(client)
+
+    async def test_paginate(self):
+        offsets = []
+
+        def handler(request):
+            offset = int(request.url.params['offset'])
+            offsets.append(offset)
+            items = list(range(offset, min(offset + 2, 5)))
+            return httpx.Response(200, json={'items': items, 'total': 5})
+
+        command = self.new_command(handler)
+
+        items = [item async for item in command.paginate(page_size=2)]
+
+        assert_that(items, equal_to([0, 1, 2, 3, 4]))
+        assert_that(offsets, equal_to([0, 2, 4]))
+
+    async def test_stream_and_download(self):
+        body = b'x' * 1000
+        command = self.new_command(lambda request: httpx.Response(200, content=body))
+        fileobj = io.BytesIO()
+
+        chunks = [chunk async for chunk in command.stream('GET', command.base_url, 100)]
+        size = await command.download(fileobj, 'GET', command.base_url)
+
+        assert_that(b''.join(chunks), equal_to(body))
+        assert_that(max(len(chunk) for chunk in chunks), equal_to(100))
+        assert_that(size, equal_to(1000))
+        assert_that(fileobj.getvalue(), equal_to(body))
+
+    async def test_stream_error(self):
+        def handler(request):
+            return httpx.Response(404, json={'message': 'No such user'})
+
+        command = self.new_command(handler)
+
+        with self.assertRaises(HTTPError) as context:
+            async for _ in command.stream('GET', command.base_url):
+                pass
+
+        assert_that(str(context.exception), contains_string('No such user'))
+
+    async def test_sync_only_helpers_raise_type_error(self):
+        command = self.new_command(lambda request: httpx.Response(200))
+
+        self.assertRaises(TypeError, command.batch, [])
+        self.assertRaises(TypeError, command.iter_json_items, 'GET', command.base_url)
+
+
+class TestAsyncHTTPCommand(unittest.TestCase):
+    def test_raise_from_response_success(self):
+        response = httpx.Response(200, text='not json')
+
+        AsyncHTTPCommand.raise_from_response(response)
+
+    def test_raise_from_response_without_message(self):
+        request = httpx.Request('GET', 'http://localhost/')
+        response = httpx.Response(503, text='oops', request=request)
+
+        assert_that(
+            calling(AsyncHTTPCommand.raise_from_response).with_args(response),
+            raises(HTTPError, 'Service Unavailable'),
+        )
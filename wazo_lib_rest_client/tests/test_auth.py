@@ -0,0 +1,168 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+from hamcrest import assert_that, equal_to, only_contains
+from requests import Request, Response
+
+from ..auth import Token, TokenAuthAdapter, TokenProvider
+from ..client import BaseClient
+from .stub_server import StubResponse, StubServer
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+class Tokens:
+    def __init__(self, expires_in=None, delay=0.0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        threading.Event().wait(self.delay)
+        with self._lock:
+            self.count += 1
+            return Token(f'token-{self.count}', self.expires_in)
+
+
+@patch('wazo_lib_rest_client.auth.time.monotonic')
+class TestTokenProvider(unittest.TestCase):
+    def test_token_fetched_once(self, monotonic):
+        monotonic.return_value = 0
+        fetch = Tokens()
+        provider = TokenProvider(fetch)
+
+        tokens = [provider.get_token() for _ in range(3)]
+
+        assert_that(tokens, only_contains('token-1'))
+        assert_that(fetch.count, equal_to(1))
+
+    def test_token_renewed_ahead_of_expiration(self, monotonic):
+        provider = TokenProvider(Tokens(expires_in=100), refresh_ahead=30)
+        monotonic.return_value = 0
+        provider.get_token()
+
+        monotonic.return_value = 69
+        assert_that(provider.get_token(), equal_to('token-1'))
+        monotonic.return_value = 71
+        assert_that(provider.get_token(), equal_to('token-2'))
+
+    def test_current_token_used_while_renewed_by_another_caller(self, monotonic):
+        provider = TokenProvider(Tokens(expires_in=100), refresh_ahead=30)
+        monotonic.return_value = 0
+        provider.get_token()
+        monotonic.return_value = 80
+
+        with provider._lock:
+            assert_that(provider.get_token(), equal_to('token-1'))
+
+    def test_renewal_failure_ahead_of_expiration_keeps_token(self, monotonic):
+        fetch = Mock(side_effect=[Token('token-1', 100), Exception('auth is down')])
+        provider = TokenProvider(fetch, refresh_ahead=30)
+        monotonic.return_value = 0
+        provider.get_token()
+
+        monotonic.return_value = 80
+        assert_that(provider.get_token(), equal_to('token-1'))
+
+        fetch.side_effect = Exception('auth is down')
+        monotonic.return_value = 101
+        self.assertRaises(Exception, provider.get_token)
+
+    def test_rejected_token_renewed_once_for_concurrent_callers(self, monotonic):
+        monotonic.return_value = 0
+        fetch = Tokens(delay=0.05)
+        provider = TokenProvider(fetch)
+        stale = provider.get_token()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = list(executor.map(provider.invalidate, [stale] * 8))
+
+        assert_that(tokens, only_contains('token-2'))
+        assert_that(fetch.count, equal_to(2))
+
+
+class TestTokenAuthAdapter(unittest.TestCase):
+    def setUp(self):
+        self.adapter = Mock()
+        self.provider = TokenProvider(Tokens())
+        self.auth_adapter = TokenAuthAdapter(self.adapter, self.provider)
+
+    @staticmethod
+    def new_response(status_code):
+        response = Response()
+        response.status_code = status_code
+        response._content = b''
+        return response
+
+    def sent_tokens(self):
+        return [
+            call.args[0].headers['X-Auth-Token']
+            for call in self.adapter.send.call_args_list
+        ]
+
+    def test_token_sent(self):
+        self.adapter.send.return_value = self.new_response(200)
+        request = Request('GET', 'http://localhost/test').prepare()
+
+        self.auth_adapter.send(request)
+
+        assert_that(self.sent_tokens(), equal_to(['token-1']))
+
+    def test_rejected_request_replayed_once_with_new_token(self):
+        self.adapter.send.side_effect = [self.new_response(401)] * 3
+        request = Request('POST', 'http://localhost/test', json={}).prepare()
+
+        response = self.auth_adapter.send(request)
+
+        assert_that(response.status_code, equal_to(401))
+        assert_that(self.sent_tokens(), equal_to(['token-1', 'token-2']))
+
+    def test_streamed_body_not_replayed(self):
+        self.adapter.send.return_value = self.new_response(401)
+        request = Request('POST', 'http://localhost/test', data=iter([b'a'])).prepare()
+
+        self.auth_adapter.send(request)
+
+        assert_that(self.sent_tokens(), equal_to(['token-1']))
+
+
+class TestTokenRenewal(unittest.TestCase):
+    def setUp(self):
+        self.valid_token = 'token-1'
+        self.server = StubServer(self.respond, keep_alive=True).start(self)
+
+    def respond(self, request):
+        token = request.headers['X-Auth-Token']
+        return StubResponse(200 if token == self.valid_token else 401)
+
+    def test_expired_token_renewed_once_for_concurrent_requests(self):
+        fetch = Tokens(delay=0.05)
+        provider = TokenProvider(fetch)
+        client = Client(
+            '127.0.0.1',
+            self.server.port,
+            https=False,
+            keep_alive=True,
+            token_provider=provider,
+        )
+        client.session().get(client.url('test'))
+        self.valid_token = 'token-2'
+
+        def get(_):
+            return client.session().get(client.url('test')).status_code
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            statuses = list(executor.map(get, range(8)))
+
+        assert_that(statuses, only_contains(200))
+        assert_that(fetch.count, equal_to(2))
@@ -0,0 +1,266 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import Mock, patch
+
+import httpx
+from hamcrest import assert_that, contains_exactly, equal_to, is_
+from requests.exceptions import ConnectionError
+
+from ..async_client import AsyncBaseClient, LoadBalancingTransport
+from ..balancing import (
+    Balancer,
+    Endpoint,
+    EndpointGroup,
+    EWMABalancer,
+    LeastOutstandingBalancer,
+    RoundRobinBalancer,
+    route,
+)
+from ..client import BaseClient
+from ..ratelimit import RateLimit, RateLimiter
+from .stub_server import StubServer, unused_port
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+class TestBalancers(unittest.TestCase):
+    def setUp(self):
+        self.endpoints = [Endpoint('a', 443), Endpoint('b', 443), Endpoint('c', 443)]
+
+    def test_choose_required(self):
+        class Incomplete(Balancer):
+            pass
+
+        self.assertRaises(TypeError, Incomplete)
+
+    def test_round_robin(self):
+        balancer = RoundRobinBalancer()
+
+        chosen = [balancer.choose(self.endpoints).host for _ in range(4)]
+
+        assert_that(chosen, contains_exactly('a', 'b', 'c', 'a'))
+
+    def test_least_outstanding(self):
+        balancer = LeastOutstandingBalancer()
+        self.endpoints[0].outstanding = 2
+        self.endpoints[1].outstanding = 1
+        self.endpoints[2].outstanding = 3
+
+        assert_that(balancer.choose(self.endpoints).host, equal_to('b'))
+
+    def test_ewma_prefers_fastest_endpoint_weighted_by_load(self):
+        balancer = EWMABalancer(smoothing=0.5)
+        a, b, c = self.endpoints
+        balancer.record_latency(a, 0.1)
+        balancer.record_latency(b, 0.4)
+        balancer.record_latency(b, 0.2)
+        balancer.record_latency(c, 0.5)
+
+        assert_that(balancer.latency(b), equal_to(0.30000000000000004))
+        assert_that(balancer.choose(self.endpoints).host, equal_to('a'))
+
+        a.outstanding = 3
+        assert_that(balancer.choose(self.endpoints).host, equal_to('b'))
+
+    def test_ewma_tries_endpoints_without_latency(self):
+        balancer = EWMABalancer()
+        balancer.record_latency(self.endpoints[0], 0.1)
+        balancer.record_latency(self.endpoints[1], 0.1)
+        self.endpoints[0].outstanding = 1
+        self.endpoints[1].outstanding = 1
+
+        assert_that(balancer.choose(self.endpoints).host, equal_to('c'))
+
+
+@patch('wazo_lib_rest_client.balancing.time.monotonic')
+class TestEndpointGroup(unittest.TestCase):
+    def setUp(self):
+        self.group = EndpointGroup(
+            [('a', 443), ('b', 443)], max_failures=2, ejection_time=30
+        )
+        self.a, self.b = self.group.endpoints
+
+    def record_failures(self, endpoint, times):
+        for _ in range(times):
+            endpoint.outstanding += 1
+            self.group.release(endpoint, failed=True)
+
+    def test_ejected_after_consecutive_failures(self, monotonic):
+        monotonic.return_value = 100
+        self.record_failures(self.a, 1)
+        self.group.release(self.a, failed=False)
+        self.record_failures(self.a, 1)
+
+        assert_that(self.a.healthy, is_(True))
+
+        self.record_failures(self.a, 1)
+
+        assert_that(self.a.healthy, is_(False))
+        chosen = [self.group.acquire().host for _ in range(3)]
+        assert_that(chosen, contains_exactly('b', 'b', 'b'))
+
+    def test_readded_after_ejection_time_when_probe_succeeds(self, monotonic):
+        monotonic.return_value = 100
+        self.record_failures(self.a, 2)
+        probe = Mock(return_value=False)
+
+        monotonic.return_value = 131
+        self.group.acquire(probe)
+
+        probe.assert_called_once_with(self.a)
+        assert_that(self.a.healthy, is_(False))
+
+        monotonic.return_value = 162
+        probe.return_value = True
+        self.group.acquire(probe)
+
+        assert_that(self.a.healthy, is_(True))
+        assert_that(self.a.failures, equal_to(0))
+
+    def test_readded_after_ejection_time_without_probe(self, monotonic):
+        monotonic.return_value = 100
+        self.record_failures(self.a, 2)
+
+        monotonic.return_value = 131
+        self.group.acquire()
+
+        assert_that(self.a.healthy, is_(True))
+
+    def test_every_endpoint_ejected(self, monotonic):
+        monotonic.return_value = 100
+        self.record_failures(self.a, 2)
+        monotonic.return_value = 110
+        self.record_failures(self.b, 2)
+
+        assert_that(self.group.acquire().host, equal_to('a'))
+
+    def test_outstanding_requests(self, monotonic):
+        monotonic.return_value = 100
+        endpoint = self.group.acquire()
+
+        assert_that(endpoint.outstanding, equal_to(1))
+
+        self.group.release(endpoint, 0.01, failed=False)
+
+        assert_that(endpoint.outstanding, equal_to(0))
+
+
+class TestRoute(unittest.TestCase):
+    def test_route(self):
+        endpoint = Endpoint('wazo-2', 8443)
+
+        assert_that(
+            route('https://wazo:443/api/1.0/users?a=1', 'wazo', 443, endpoint),
+            equal_to('https://wazo-2:8443/api/1.0/users?a=1'),
+        )
+        assert_that(
+            route('https://wazo/api', 'wazo', 443, endpoint),
+            equal_to('https://wazo-2:8443/api'),
+        )
+        assert_that(
+            route('https://other/api', 'wazo', 443, endpoint) is None, is_(True)
+        )
+        assert_that(
+            route('https://wazo:9/api', 'wazo', 443, endpoint) is None, is_(True)
+        )
+
+
+class TestLoadBalancingAdapter(unittest.TestCase):
+    def start_server(self):
+        return StubServer().start(self)
+
+    @staticmethod
+    def paths(server):
+        return [request.path for request in server.requests]
+
+    def test_commands_spread_over_endpoints(self):
+        servers = [self.start_server(), self.start_server()]
+        endpoints = [('127.0.0.1', server.port) for server in servers]
+        client = Client('wazo', 443, version='1.0', https=False, endpoints=endpoints)
+
+        for _ in range(4):
+            client.example.test()
+
+        assert_that(client.example.base_url, equal_to('http://wazo:443/1.0/test'))
+        for server in servers:
+            assert_that(self.paths(server), contains_exactly('/1.0/test', '/1.0/test'))
+
+    def test_unreachable_endpoint_ejected(self):
+        server = self.start_server()
+        group = EndpointGroup(
+            [('127.0.0.1', unused_port()), ('127.0.0.1', server.port)],
+            max_failures=1,
+        )
+        client = Client('wazo', 443, version='1.0', https=False, endpoints=group)
+
+        self.assertRaises(ConnectionError, client.example.test)
+        for _ in range(3):
+            client.example.test()
+
+        assert_that(group.endpoints[0].healthy, is_(False))
+        assert_that(len(server.requests), equal_to(3))
+
+    def test_ejected_endpoint_probed(self):
+        server = self.start_server()
+        group = EndpointGroup([('127.0.0.1', server.port)])
+        group.endpoints[0].ejected_until = 0
+        client = Client('wazo', 443, version='1.0', https=False, endpoints=group)
+
+        client.example.test()
+
+        assert_that(self.paths(server), contains_exactly('/1.0', '/1.0/test'))
+        assert_that(group.endpoints[0].healthy, is_(True))
+
+    def test_probe_sent_outside_of_the_rate_limits(self):
+        server = self.start_server()
+        group = EndpointGroup([('127.0.0.1', server.port)])
+        group.endpoints[0].ejected_until = 0
+        limiter = RateLimiter(RateLimit(max_concurrency=1), timeout=5)
+        client = Client(
+            'wazo',
+            443,
+            version='1.0',
+            https=False,
+            endpoints=group,
+            rate_limiter=limiter,
+        )
+
+        client.example.test()
+
+        assert_that(self.paths(server), contains_exactly('/1.0', '/1.0/test'))
+
+
+class TestLoadBalancingTransport(unittest.IsolatedAsyncioTestCase):
+    async def test_requests_spread_over_endpoints(self):
+        hosts = []
+
+        def handler(request):
+            hosts.append(request.headers['Host'])
+            return httpx.Response(503 if request.url.host == 'wazo-1' else 200)
+
+        group = EndpointGroup([('wazo-1', 443), ('wazo-2', 443)], max_failures=1)
+        transport = LoadBalancingTransport(
+            httpx.MockTransport(handler), group, 'wazo', 443
+        )
+
+        async with httpx.AsyncClient(transport=transport) as session:
+            for _ in range(3):
+                await session.get('https://wazo/api/users')
+
+        assert_that(hosts, contains_exactly('wazo-1', 'wazo-2', 'wazo-2'))
+
+    def test_client_builds_transport(self):
+        class AsyncClient(AsyncBaseClient):
+            namespace = 'test_rest_client.async_commands'
+
+        client = AsyncClient('wazo', 443, endpoints=[('wazo-1', 443)])
+
+        transport = client._build_transport()
+
+        assert_that(isinstance(transport, LoadBalancingTransport), is_(True))
@@ -0,0 +1,149 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+import unittest
+from unittest.mock import Mock, patch
+
+from hamcrest import assert_that, equal_to, is_, same_instance
+from requests import Request, Response
+from requests.exceptions import ConnectionError
+
+from ..breaker import (
+    CircuitBreaker,
+    CircuitBreakerAdapter,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    CircuitState,
+)
+from ..client import BaseClient
+
+CONFIG = CircuitBreakerConfig(
+    failure_rate_threshold=0.5,
+    minimum_calls=4,
+    window_size=4,
+    open_duration=10,
+)
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+@patch('wazo_lib_rest_client.breaker.time.monotonic', Mock(return_value=100))
+class TestCircuitBreaker(unittest.TestCase):
+    def new_open_breaker(self, probe=None):
+        breaker = CircuitBreaker('key', CONFIG, probe)
+        for _ in range(4):
+            breaker.record_failure()
+        return breaker
+
+    def test_opens_on_failure_rate(self):
+        breaker = CircuitBreaker('key', CONFIG)
+
+        for outcome in (True, False, True):
+            breaker.record_success() if outcome else breaker.record_failure()
+        assert_that(breaker.state, equal_to(CircuitState.CLOSED))
+        breaker.record_failure()
+
+        assert_that(breaker.state, equal_to(CircuitState.OPEN))
+        self.assertRaises(CircuitOpenError, breaker.before_request)
+
+    def test_half_open_trial_closes(self):
+        breaker = self.new_open_breaker()
+
+        with patch('wazo_lib_rest_client.breaker.time.monotonic', return_value=111):
+            breaker.before_request()
+            assert_that(breaker.state, equal_to(CircuitState.HALF_OPEN))
+            self.assertRaises(CircuitOpenError, breaker.before_request)
+            breaker.record_success()
+
+        assert_that(breaker.state, equal_to(CircuitState.CLOSED))
+
+    def test_half_open_trial_failure_reopens(self):
+        breaker = self.new_open_breaker()
+
+        with patch('wazo_lib_rest_client.breaker.time.monotonic', return_value=111):
+            breaker.before_request()
+            breaker.record_failure()
+
+        assert_that(breaker.state, equal_to(CircuitState.OPEN))
+
+    def test_reachability_probe(self):
+        probe = Mock(return_value=False)
+        breaker = self.new_open_breaker(probe)
+
+        with patch('wazo_lib_rest_client.breaker.time.monotonic', return_value=111):
+            self.assertRaises(CircuitOpenError, breaker.before_request)
+            assert_that(breaker.state, equal_to(CircuitState.OPEN))
+
+        probe.return_value = True
+        with patch('wazo_lib_rest_client.breaker.time.monotonic', return_value=122):
+            breaker.before_request()
+
+        assert_that(breaker.state, equal_to(CircuitState.CLOSED))
+
+
+class TestCircuitBreakerAdapter(unittest.TestCase):
+    def setUp(self):
+        self.inner = Mock()
+        self.breaker = Mock(config=CONFIG)
+        self.adapter = CircuitBreakerAdapter(self.inner, self.breaker)
+        self.request = Request('GET', 'http://localhost/').prepare()
+
+    def test_failure_status(self):
+        response = Response()
+        response.status_code = 503
+        self.inner.send.return_value = response
+
+        self.adapter.send(self.request)
+
+        self.breaker.record_failure.assert_called_once_with()
+
+    def test_connection_error(self):
+        self.inner.send.side_effect = ConnectionError()
+
+        self.assertRaises(ConnectionError, self.adapter.send, self.request)
+
+        self.breaker.record_failure.assert_called_once_with()
+
+    def test_other_error_releases_half_open_trial(self):
+        breaker = CircuitBreaker('key', CONFIG)
+        adapter = CircuitBreakerAdapter(self.inner, breaker)
+        self.inner.send.side_effect = RuntimeError()
+        with patch('wazo_lib_rest_client.breaker.time.monotonic', return_value=100):
+            for _ in range(4):
+                breaker.record_failure()
+
+        with patch('wazo_lib_rest_client.breaker.time.monotonic', return_value=111):
+            self.assertRaises(RuntimeError, adapter.send, self.request)
+            self.assertRaises(RuntimeError, adapter.send, self.request)
+
+        assert_that(breaker.state, equal_to(CircuitState.HALF_OPEN))
+        assert_that(self.inner.send.call_count, equal_to(2))
+
+    def test_open_circuit_fails_fast(self):
+        self.breaker.before_request.side_effect = CircuitOpenError('key')
+
+        self.assertRaises(CircuitOpenError, self.adapter.send, self.request)
+
+        self.inner.send.assert_not_called()
+
+
+class TestClientCircuitBreaker(unittest.TestCase):
+    def test_breaker_shared_by_clients_of_same_endpoint(self):
+        first = Client('breaker-host', 9486, https=False, circuit_breaker=CONFIG)
+        second = Client('breaker-host', 9486, https=False, circuit_breaker=CONFIG)
+        other = Client('breaker-host', 9487, https=False, circuit_breaker=CONFIG)
+
+        breakers = [client._get_circuit_breaker() for client in (first, second, other)]
+
+        assert_that(breakers[0], is_(same_instance(breakers[1])))
+        assert_that(breakers[0] is breakers[2], is_(False))
+
+    def test_open_circuit_makes_server_unreachable(self):
+        client = Client('open-host', 9486, https=False, circuit_breaker=CONFIG)
+        breaker = client._get_circuit_breaker()
+        for _ in range(4):
+            breaker.record_failure()
+
+        assert_that(client.is_server_reachable(), is_(False))
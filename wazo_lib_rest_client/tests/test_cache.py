@@ -0,0 +1,119 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+import unittest
+from unittest.mock import Mock, patch
+
+from hamcrest import assert_that, equal_to, has_entries, has_properties, is_
+from requests import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+from ..cache import CacheStats, CachingAdapter, ResponseCache
+
+URL = 'https://localhost:9486/1.0/users'
+
+
+def new_request(method='GET', url=URL, token='token', tenant='tenant'):
+    headers = {'X-Auth-Token': token, 'Wazo-Tenant': tenant}
+    return Request(method, url, headers=headers).prepare()
+
+
+def new_response(status_code=200, content=b'{}', headers=None):
+    response = Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = URL
+    return response
+
+
+class TestCachingAdapter(unittest.TestCase):
+    def setUp(self):
+        self.inner = Mock()
+        self.cache = ResponseCache(ttl=10)
+        self.adapter = CachingAdapter(self.inner, self.cache)
+
+    def test_fresh_response_is_served_from_cache(self):
+        self.inner.send.return_value = new_response(content=b'[1]')
+
+        self.adapter.send(new_request())
+        response = self.adapter.send(new_request())
+
+        assert_that(response.content, equal_to(b'[1]'))
+        assert_that(self.inner.send.call_count, equal_to(1))
+        assert_that(self.cache.stats(), has_properties(hits=1, misses=1, entries=1))
+
+    def test_key_includes_token_tenant_and_query(self):
+        self.inner.send.return_value = new_response()
+
+        self.adapter.send(new_request())
+        self.adapter.send(new_request(token='other'))
+        self.adapter.send(new_request(tenant='other'))
+        self.adapter.send(new_request(url=f'{URL}?limit=1'))
+
+        assert_that(self.inner.send.call_count, equal_to(4))
+
+    @patch('wazo_lib_rest_client.cache.time.monotonic')
+    def test_stale_response_revalidated(self, monotonic):
+        monotonic.return_value = 0
+        headers = {'etag': '"v1"', 'Last-Modified': 'Mon, 19 Oct 2026 10:00:00 GMT'}
+        self.inner.send.return_value = new_response(content=b'[1]', headers=headers)
+        self.adapter.send(new_request())
+
+        monotonic.return_value = 11
+        self.inner.send.return_value = new_response(status_code=304, content=b'')
+        response = self.adapter.send(new_request())
+
+        assert_that(response.status_code, equal_to(200))
+        assert_that(response.content, equal_to(b'[1]'))
+        conditional = self.inner.send.call_args[0][0]
+        assert_that(
+            conditional.headers,
+            has_entries(
+                {
+                    'If-None-Match': '"v1"',
+                    'If-Modified-Since': 'Mon, 19 Oct 2026 10:00:00 GMT',
+                }
+            ),
+        )
+        assert_that(self.cache.stats(), has_properties(hits=1, revalidations=1))
+
+    def test_errors_are_not_cached(self):
+        self.inner.send.return_value = new_response(status_code=503)
+
+        self.adapter.send(new_request())
+        self.adapter.send(new_request())
+
+        assert_that(self.inner.send.call_count, equal_to(2))
+
+    def test_mutating_call_invalidates_resource_and_collection(self):
+        self.inner.send.return_value = new_response()
+        self.adapter.send(new_request(url=URL))
+        self.adapter.send(new_request(url=f'{URL}/1'))
+        self.adapter.send(new_request(url=f'{URL}/1/lines'))
+        self.adapter.send(new_request(url=f'{URL}/12'))
+
+        self.adapter.send(new_request('PUT', url=f'{URL}/1'))
+
+        assert_that(self.cache.stats().entries, equal_to(1))
+
+    def test_stream_bypasses_cache(self):
+        self.inner.send.return_value = new_response()
+
+        self.adapter.send(new_request(), stream=True)
+
+        assert_that(self.cache.stats(), equal_to(CacheStats()))
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_least_recently_used_evicted_over_memory_cap(self):
+        cache = ResponseCache(max_bytes=10)
+        first, second, third = (new_request(url=f'{URL}/{i}') for i in range(3))
+
+        cache.set(cache.key(first), new_response(content=b'12345'))
+        cache.set(cache.key(second), new_response(content=b'12345'))
+        cache.get(cache.key(first))
+        cache.set(cache.key(third), new_response(content=b'12345'))
+
+        assert_that(cache.get(cache.key(second)) is None, is_(True))
+        assert_that(cache.stats(), has_properties(entries=2, size=10, evictions=1))
@@ -1,4 +1,4 @@
-# Copyright 2014-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2014-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0+
 
 from __future__ import annotations
@@ -12,16 +12,23 @@ from unittest.mock import ANY, Mock, patch
 import requests
 from hamcrest import (
     assert_that,
+    calling,
     close_to,
     contains_string,
     ends_with,
     equal_to,
     has_entry,
+    has_item,
+    instance_of,
     is_,
+    not_,
+    raises,
+    same_instance,
 )
 from requests import Session
 from requests.exceptions import HTTPError, RequestException, Timeout
 
+from ..cache import CachingAdapter, ResponseCache
 from ..client import BaseClient, logger
 from ..example_cmd import ExampleCommand
 
@@ -214,6 +221,35 @@ class TestBaseClient(unittest.TestCase):
 
         assert_that(client.url('resource'), ends_with('/resource'))
 
+    def test_given_fragments_then_joined_with_slashes(self):
+        client = self.new_client(host='myhost', port=80, version='1.0')
+
+        assert_that(
+            client.url('users', 42, 'lines'),
+            equal_to('http://myhost:80/1.0/users/42/lines'),
+        )
+
+    def test_url_base_is_cached(self):
+        client = self.new_client(host='myhost', port=80)
+
+        with patch.object(
+            client, '_build_base_url', wraps=client._build_base_url
+        ) as build:
+            client.url()
+            client.url('users')
+
+        build.assert_called_once_with()
+
+    def test_url_base_is_rebuilt_when_connection_parameters_change(self):
+        client = self.new_client(host='myhost', port=80, version='1.0')
+        client.url()
+
+        client.host = 'otherhost'
+        client.port = 443
+        client._https = True
+
+        assert_that(client.url('users'), equal_to('https://otherhost:443/1.0/users'))
+
     def test_given_username_and_password_then_session_authenticated(self):
         client = self.new_client(username='username', password='password')
         session = client.session()
@@ -278,6 +314,139 @@ class TestBaseClient(unittest.TestCase):
 
         assert_that(result, equal_to(tenant_id))
 
+    def test_commands_are_instantiated_on_first_access(self):
+        client = self.new_client()
+
+        assert_that('example' in vars(client), is_(False))
+        command = client.example
+
+        assert_that(command, instance_of(ExampleCommand))
+        assert_that(client.example, is_(same_instance(command)))
+
+    def test_commands_are_listed_by_dir(self):
+        client = self.new_client()
+
+        assert_that(dir(client), has_item('example'))
+
+    def test_unknown_attribute_raises_attribute_error(self):
+        client = self.new_client()
+
+        assert_that(
+            calling(getattr).with_args(client, 'unknown'), raises(AttributeError)
+        )
+
+    def test_connection_close_by_default(self):
+        client = self.new_client()
+
+        first, second = client.session(), client.session()
+
+        assert_that(first, is_(not_(same_instance(second))))
+        assert_that(first.headers, has_entry('Connection', 'close'))
+        assert_that(
+            first.get_adapter('http://localhost'),
+            is_(same_instance(second.get_adapter('http://localhost'))),
+        )
+
+    def test_session_changes_do_not_outlive_session_call_by_default(self):
+        client = self.new_client()
+        session = client.session()
+        session.headers.update({'X-Custom': 'value'})
+        session.auth = ('user', 'password')
+        session.verify = False
+
+        session = client.session()
+
+        assert_that('X-Custom' in session.headers, is_(False))
+        assert_that(session.auth is None, is_(True))
+        assert_that(session.verify, is_(True))
+
+    def test_closing_a_session_leaves_the_shared_adapter_open(self):
+        client = self.new_client()
+        adapter = client.session().get_adapter('http://localhost').adapter
+        close = Mock(wraps=adapter.close)
+        adapter.close = close
+
+        with client.session():
+            pass
+        close.assert_not_called()
+
+        client.close()
+        close.assert_called_once_with()
+
+    def test_cookies_do_not_outlive_session_call_by_default(self):
+        client = self.new_client()
+        client.session().cookies.set('session', 'value')
+
+        assert_that(len(client.session().cookies), equal_to(0))
+
+    def test_timeout_sent_with_requests_without_one(self):
+        client = self.new_client(timeout=3)
+        session = client.session()
+        adapter = Mock()
+        adapter.send.return_value = requests.Response()
+        session.mount('http://', adapter)
+
+        session.get('http://localhost/a')
+        session.get('http://localhost/b', timeout=1)
+
+        timeouts = [call.kwargs['timeout'] for call in adapter.send.call_args_list]
+        assert_that(timeouts, equal_to([3, 1]))
+
+    def test_keep_alive_session_is_reused(self):
+        client = self.new_client(keep_alive=True)
+
+        first, second = client.session(), client.session()
+
+        assert_that(first, is_(same_instance(second)))
+        assert_that('Connection' in first.headers, is_(False))
+
+    def test_keep_alive_pool_size(self):
+        client = self.new_client(keep_alive=True, pool_maxsize=42)
+
+        adapter = client.session().get_adapter('http://localhost')
+
+        assert_that(adapter._pool_maxsize, equal_to(42))
+
+    def test_keep_alive_session_headers_follow_token_and_tenant(self):
+        client = self.new_client(keep_alive=True, token='first', tenant='tenant')
+        session = client.session()
+
+        client.set_token('second')
+        client.tenant_uuid = None
+
+        assert_that(client.session(), is_(same_instance(session)))
+        assert_that(session.headers, has_entry('X-Auth-Token', 'second'))
+        assert_that('Wazo-Tenant' in session.headers, is_(False))
+
+    @patch('wazo_lib_rest_client.client.time.monotonic')
+    def test_keep_alive_session_expires_when_idle(self, monotonic):
+        client = self.new_client(keep_alive=True, pool_idle_timeout=30)
+        monotonic.return_value = 100
+        first = client.session()
+
+        monotonic.return_value = 120
+        second = client.session()
+        monotonic.return_value = 151
+        third = client.session()
+
+        assert_that(second, is_(same_instance(first)))
+        assert_that(third, is_(not_(same_instance(first))))
+
+    def test_response_cache_shared_by_sessions(self):
+        cache = ResponseCache()
+        client = self.new_client(response_cache=cache)
+
+        adapters = [client._build_adapter() for _ in range(2)]
+
+        assert_that(adapters[0], instance_of(CachingAdapter))
+        assert_that(adapters[0].cache, is_(same_instance(adapters[1].cache)))
+
+    def test_close_discards_keep_alive_session(self):
+        with self.new_client(keep_alive=True) as client:
+            session = client.session()
+
+        assert_that(client.session(), is_(not_(same_instance(session))))
+
     def test_given_no_exception_when_is_server_reachable_then_true(self):
         session = Mock()
         client = MockSessionClient(session)
@@ -0,0 +1,165 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import httpx
+from hamcrest import assert_that, equal_to, has_properties, is_, only_contains
+from requests import Request
+from requests.exceptions import ConnectionError
+
+from ..adapters import current_command
+from ..async_client import CoalescingTransport
+from ..client import BaseClient
+from ..coalescing import CoalescingAdapter, RequestCoalescer, is_coalescing_enabled
+from ..command import RESTCommand
+from .stub_server import StubResponse, StubServer
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    def test_key(self):
+        headers = {'Wazo-Tenant': 't1', 'X-Auth-Token': 'token'}
+        key = RequestCoalescer.key
+
+        assert_that(key('get', 'url', headers), equal_to(key('GET', 'url', headers)))
+        assert_that(key('GET', 'url', headers) == key('GET', 'url', {}), is_(False))
+        assert_that(
+            key('GET', 'url', headers) == key('GET', 'url?a=1', headers), is_(False)
+        )
+        assert_that(key('POST', 'url', headers) is None, is_(True))
+
+    def test_error_raised_to_every_caller(self):
+        coalescer = RequestCoalescer()
+        started = threading.Event()
+        release = threading.Event()
+
+        def send():
+            started.set()
+            release.wait()
+            raise ConnectionError('unreachable')
+
+        def call():
+            try:
+                coalescer.run(('GET', 'url', '', '', ''), send, Mock())
+            except ConnectionError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            leader = executor.submit(call)
+            started.wait()
+            followers = [executor.submit(call) for _ in range(2)]
+            while coalescer.stats().coalesced < 2:
+                threading.Event().wait(0.001)
+            release.set()
+            errors = [future.result() for future in [leader, *followers]]
+
+        assert_that(errors, only_contains(errors[0]))
+        assert_that(coalescer.stats(), has_properties(requests=1, coalesced=2))
+
+    def test_command_opts_out(self):
+        class NotCoalescedCommand(RESTCommand):
+            resource = 'events'
+            coalesce_requests = False
+
+        token = current_command.set(NotCoalescedCommand(Mock()))
+        self.addCleanup(current_command.reset, token)
+
+        assert_that(is_coalescing_enabled(), is_(False))
+
+    def test_stream_not_coalesced(self):
+        coalescer = RequestCoalescer()
+        adapter = CoalescingAdapter(Mock(), coalescer)
+        request = Request('GET', 'http://localhost/test').prepare()
+
+        adapter.send(request, stream=True)
+
+        assert_that(coalescer.stats(), has_properties(requests=0, coalesced=0))
+
+
+class TestCoalescingAdapter(unittest.TestCase):
+    def setUp(self):
+        def respond(request):
+            threading.Event().wait(0.2)
+            return StubResponse(
+                body=b'{"uuid": "user"}',
+                headers={'Content-Type': 'application/json'},
+            )
+
+        self.server = StubServer(respond).start(self)
+
+    def test_concurrent_identical_requests_share_one_call(self):
+        coalescer = RequestCoalescer()
+        client = Client(
+            '127.0.0.1',
+            self.server.port,
+            https=False,
+            keep_alive=True,
+            request_coalescer=coalescer,
+        )
+
+        def get(_):
+            return client.session().get(client.url('users', 'user'))
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(executor.map(get, range(5)))
+
+        assert_that(len(self.server.requests), equal_to(1))
+        assert_that([r.json() for r in responses], only_contains({'uuid': 'user'}))
+        assert_that(len({id(r) for r in responses}), equal_to(5))
+        assert_that(coalescer.stats(), has_properties(requests=1, coalesced=4))
+
+
+class TestCoalescingTransport(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests: list[httpx.Request] = []
+        self.coalescer = RequestCoalescer()
+
+        async def handler(request):
+            self.requests.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={'uuid': 'user'})
+
+        transport = CoalescingTransport(httpx.MockTransport(handler), self.coalescer)
+        self.session = httpx.AsyncClient(transport=transport)
+
+    async def asyncTearDown(self):
+        await self.session.aclose()
+
+    async def test_concurrent_identical_requests_share_one_call(self):
+        responses = await asyncio.gather(
+            *(self.session.get('http://localhost/users/user') for _ in range(5))
+        )
+
+        assert_that(len(self.requests), equal_to(1))
+        assert_that([r.json() for r in responses], only_contains({'uuid': 'user'}))
+        assert_that(self.coalescer.stats(), has_properties(requests=1, coalesced=4))
+
+    async def test_cancelled_first_caller_does_not_cancel_the_others(self):
+        first = asyncio.ensure_future(self.session.get('http://localhost/users/user'))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(self.session.get('http://localhost/users/user'))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        response = await second
+
+        assert_that(response.json(), equal_to({'uuid': 'user'}))
+        assert_that(len(self.requests), equal_to(1))
+
+    async def test_different_tenants_not_coalesced(self):
+        await asyncio.gather(
+            self.session.get('http://localhost/config', headers={'Wazo-Tenant': 't1'}),
+            self.session.get('http://localhost/config', headers={'Wazo-Tenant': 't2'}),
+        )
+
+        assert_that(len(self.requests), equal_to(2))
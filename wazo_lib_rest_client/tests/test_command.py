@@ -1,53 +1,106 @@
-# Copyright 2014-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2014-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0+
 
+import json
+import threading
 import unittest
-from unittest.mock import Mock, sentinel
+from unittest.mock import Mock, call, sentinel
 
-from hamcrest import assert_that, equal_to
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    equal_to,
+    has_entry,
+    has_properties,
+    is_,
+    less_than_or_equal_to,
+    raises,
+)
+from requests import Response
+from requests.exceptions import ConnectionError, HTTPError
 
+from ..batch import BatchRequest
 from ..command import HTTPCommand, RESTCommand
 
 
+def new_response(status_code, content=b'', content_type='application/json'):
+    response = Response()
+    response.status_code = status_code
+    response.reason = 'Reason'
+    response._content = content
+    if content_type:
+        response.headers['Content-Type'] = content_type
+    return response
+
+
 class TestHTTPCommand(unittest.TestCase):
     def test_raise_from_response_no_message(self):
-        class ExpectedError(Exception):
-            pass
+        response = new_response(400, b'not a dict with message')
 
-        response = Mock(
-            text='not a dict with message',
-            raise_for_status=Mock(side_effect=ExpectedError),
-        )
-
-        self.assertRaises(ExpectedError, HTTPCommand.raise_from_response, response)
+        self.assertRaises(HTTPError, HTTPCommand.raise_from_response, response)
+        assert_that(response.reason, equal_to('Reason'))
 
     def test_raise_from_response_substitute_reason_for_the_message(self):
-        class ExpectedError(Exception):
-            pass
+        response = new_response(400, b'{"message": "Expected reason"}')
 
-        response = Mock(
-            text='{"message": "Expected reason"}',
-            raise_for_status=Mock(side_effect=ExpectedError),
-        )
-
-        self.assertRaises(ExpectedError, HTTPCommand.raise_from_response, response)
+        self.assertRaises(HTTPError, HTTPCommand.raise_from_response, response)
         assert_that(response.reason, equal_to('Expected reason'))
 
     def test_raise_from_response_does_not_raise_keyerror_or_valueerror(self):
-        response = Mock(text='not a dict with message')
+        response = new_response(500, b'not a dict with message')
 
         try:
             HTTPCommand.raise_from_response(response)
         except (KeyError, ValueError):
             self.fail('KeyError or ValueError unexpectedly raised')
+        except HTTPError:
+            pass
 
     def test_raise_from_response_does_not_raise_typeerror(self):
-        response = Mock(text=None)
+        response = new_response(500, b'null')
 
         try:
             HTTPCommand.raise_from_response(response)
         except TypeError:
             self.fail('TypeError unexpectedly raised')
+        except HTTPError:
+            pass
+
+    def test_raise_from_response_ignores_successful_responses(self):
+        response = new_response(200, b'{"message": "Created"}')
+
+        HTTPCommand.raise_from_response(response)
+
+        assert_that(response.reason, equal_to('Reason'))
+
+    def test_raise_from_response_ignores_non_json_bodies(self):
+        response = new_response(502, b'{"message": "Gateway"}', 'text/html')
+
+        self.assertRaises(HTTPError, HTTPCommand.raise_from_response, response)
+        assert_that(response.reason, equal_to('Reason'))
+
+    def test_raise_from_response_ignores_large_bodies(self):
+        content = b'{"message": "Too large", "details": "%s"}' % (b'x' * 100_000)
+        response = new_response(400, content)
+
+        self.assertRaises(HTTPError, HTTPCommand.raise_from_response, response)
+        assert_that(response.reason, equal_to('Reason'))
+
+    def test_raise_from_response_does_not_read_large_streamed_bodies(self):
+        response = new_response(400, content_type='application/problem+json')
+        response.headers['Content-Length'] = '100000'
+        response._content = False
+        response.raw = Mock()
+
+        self.assertRaises(HTTPError, HTTPCommand.raise_from_response, response)
+        response.raw.read.assert_not_called()
+        response.raw.stream.assert_not_called()
+
+    def test_decode_json(self):
+        response = new_response(200, '{"name": "café"}'.encode())
+
+        assert_that(HTTPCommand.decode_json(response), equal_to({'name': 'café'}))
 
 
 class TestRESTCommand(unittest.TestCase):
@@ -87,3 +140,218 @@ class TestRESTCommand(unittest.TestCase):
             'Wazo-Tenant': 'custom-tenant',
         }
         assert_that(c._get_headers(**kwargs), equal_to(expected_headers))
+
+    def test_request_headers_computed_once(self):
+        c = self.TestCommand(Mock())
+
+        headers = c._request_headers(None)
+
+        assert_that(c._request_headers(None) is headers, is_(True))
+        assert_that(c._get_headers() is headers, is_(False))
+        assert_that(
+            c._request_headers('custom-tenant'),
+            equal_to({'Accept': 'application/json', 'Wazo-Tenant': 'custom-tenant'}),
+        )
+        assert_that(headers, equal_to({'Accept': 'application/json'}))
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        class TestCommand(RESTCommand):
+            resource = 'test'
+
+        self.client = Mock()
+        self.session = self.client.session.return_value
+        self.session.headers = {'Connection': 'close'}
+        self.command = TestCommand(self.client)
+
+    @staticmethod
+    def new_response(status_code):
+        return new_response(status_code, b'{"message": "failed"}')
+
+    def test_results_in_order_with_errors_per_item(self):
+        responses = {
+            'a': self.new_response(200),
+            'b': self.new_response(404),
+        }
+
+        def request(method, url, **kwargs):
+            if url == 'c':
+                raise ConnectionError()
+            return responses[url]
+
+        self.session.request.side_effect = request
+        requests = [BatchRequest('GET', url) for url in 'abc']
+
+        results = list(self.command.batch(requests))
+
+        assert_that(
+            results,
+            contains_exactly(
+                has_properties(request=requests[0], response=responses['a'], ok=True),
+                has_properties(request=requests[1], response=responses['b'], ok=False),
+                has_properties(request=requests[2], response=None, ok=False),
+            ),
+        )
+        assert_that(results[1].error, is_(HTTPError))
+        assert_that(results[2].error, is_(ConnectionError))
+
+    def test_requests_share_kept_alive_connections(self):
+        self.session.request.return_value = self.new_response(200)
+
+        list(self.command.batch([BatchRequest('GET', 'a'), BatchRequest('GET', 'b')]))
+
+        self.client.session.assert_called_once_with()
+        for request_call in self.session.request.call_args_list:
+            assert_that(
+                request_call.kwargs['headers'], has_entry('Connection', 'keep-alive')
+            )
+        assert_that(self.session.headers, equal_to({'Connection': 'close'}))
+        # The connections are closed with an adapter of the batch's own
+        adapter = self.client._build_adapter.return_value
+        self.session.mount.assert_called_with('https://', adapter)
+        self.session.close.assert_called_once_with()
+
+    def test_keep_alive_session_left_open(self):
+        self.session.headers = {}
+        self.session.request.return_value = self.new_response(200)
+
+        list(self.command.batch([BatchRequest('GET', 'a')]))
+
+        assert_that(
+            self.session.request.call_args.kwargs['headers'],
+            equal_to({'Accept': 'application/json'}),
+        )
+        self.session.close.assert_not_called()
+
+    def test_headers_and_tenant(self):
+        self.session.request.return_value = self.new_response(200)
+        request = BatchRequest(
+            'POST',
+            'a',
+            json={'name': 'foo'},
+            headers={'X-Custom': 'value'},
+            tenant_uuid='tenant',
+        )
+
+        list(self.command.batch([request]))
+
+        self.session.request.assert_called_once_with(
+            'POST',
+            'a',
+            params=None,
+            json={'name': 'foo'},
+            data=None,
+            headers={
+                'Accept': 'application/json',
+                'Wazo-Tenant': 'tenant',
+                'X-Custom': 'value',
+                'Connection': 'keep-alive',
+            },
+        )
+
+    def test_concurrency_is_limited(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def request(method, url, **kwargs):
+            with lock:
+                running.append(url)
+                peak.append(len(running))
+            threading.Event().wait(0.01)
+            with lock:
+                running.remove(url)
+            return self.new_response(200)
+
+        self.session.request.side_effect = request
+        requests = [BatchRequest('GET', str(i)) for i in range(20)]
+
+        results = list(self.command.batch(requests, max_workers=3))
+
+        assert_that(len(results), equal_to(20))
+        assert_that(max(peak), less_than_or_equal_to(3))
+
+
+class TestPaginate(unittest.TestCase):
+    def setUp(self):
+        class TestCommand(RESTCommand):
+            resource = 'test'
+
+        self.client = Mock()
+        self.client.url.return_value = 'base-url'
+        self.session = self.client.session.return_value
+        self.command = TestCommand(self.client)
+
+    def set_pages(self, *pages):
+        responses = [new_response(200, json.dumps(page).encode()) for page in pages]
+        self.session.get.side_effect = responses
+
+    def test_pages_until_total(self):
+        self.set_pages(
+            {'items': [1, 2], 'total': 4},
+            {'items': [3, 4], 'total': 4},
+        )
+
+        items = list(self.command.paginate(page_size=2, params={'order': 'name'}))
+
+        assert_that(items, equal_to([1, 2, 3, 4]))
+        headers = {'Accept': 'application/json'}
+        assert_that(
+            self.session.get.call_args_list,
+            contains_exactly(
+                call(
+                    'base-url',
+                    params={'order': 'name', 'limit': 2, 'offset': 0},
+                    headers=headers,
+                ),
+                call(
+                    'base-url',
+                    params={'order': 'name', 'limit': 2, 'offset': 2},
+                    headers=headers,
+                ),
+            ),
+        )
+
+    def test_stops_on_short_page(self):
+        self.set_pages({'items': [1, 2]}, {'items': [3]})
+
+        items = list(self.command.paginate(page_size=2, prefetch=False))
+
+        assert_that(items, equal_to([1, 2, 3]))
+        assert_that(self.session.get.call_count, equal_to(2))
+
+    def test_next_page_is_prefetched(self):
+        self.set_pages({'items': [1, 2]}, {'items': []})
+
+        pages = self.command.paginate(page_size=2)
+        first = next(pages)
+        for _ in range(100):
+            if self.session.get.call_count == 2:
+                break
+            threading.Event().wait(0.01)
+
+        assert_that(first, equal_to(1))
+        assert_that(self.session.get.call_count, equal_to(2))
+        assert_that(list(pages), equal_to([2]))
+
+    def test_custom_next_page_and_tenant(self):
+        self.set_pages({'items': [1], 'next': 'c1'}, {'items': [2], 'next': None})
+
+        def next_page(params, page):
+            return {**params, 'cursor': page['next']} if page['next'] else None
+
+        items = list(self.command.paginate(next_page=next_page, tenant_uuid='t'))
+
+        assert_that(items, equal_to([1, 2]))
+        last_call = self.session.get.call_args
+        assert_that(last_call.kwargs['params']['cursor'], equal_to('c1'))
+        assert_that(last_call.kwargs['headers']['Wazo-Tenant'], equal_to('t'))
+
+    def test_error_is_raised(self):
+        self.session.get.return_value = new_response(401, b'{}')
+
+        assert_that(
+            calling(list).with_args(self.command.paginate()),
+            raises(HTTPError),
+        )
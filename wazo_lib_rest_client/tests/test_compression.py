@@ -0,0 +1,179 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import gzip
+import unittest
+from unittest.mock import Mock
+
+import httpx
+from hamcrest import assert_that, equal_to, greater_than, has_entries, has_properties
+
+from ..adapters import current_command
+from ..async_client import AsyncBaseClient, CompressionTransport
+from ..client import BaseClient
+from ..command import RESTCommand
+from ..compression import (
+    COMPRESSORS,
+    NO_COMPRESSION,
+    CompressionCounters,
+    CompressionPolicy,
+)
+from .stub_server import StubResponse, StubServer
+
+BODY = b'{"items": [' + b', '.join([b'{"name": "alice"}'] * 2000) + b']}'
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+class AsyncClient(AsyncBaseClient):
+    namespace = 'test_rest_client.async_commands'
+
+
+def respond(request):
+    if request.method == 'POST':
+        return StubResponse(204)
+    accepted = request.headers.get('Accept-Encoding', '').split(', ')
+    encoding = next((e for e in accepted if e in COMPRESSORS), None)
+    if encoding is None:
+        return StubResponse(body=BODY)
+    return StubResponse(
+        body=COMPRESSORS[encoding](BODY), headers={'Content-Encoding': encoding}
+    )
+
+
+class UncompressedCommand(RESTCommand):
+    resource = 'recordings'
+    compression_policy = NO_COMPRESSION
+
+
+class TestCompressionPolicy(unittest.TestCase):
+    def test_accept_encoding(self):
+        policy = CompressionPolicy(accept_encodings=('zstd', 'br', 'gzip'))
+
+        assert_that(policy.accept_encoding({'gzip', 'zstd'}), equal_to('zstd, gzip'))
+        assert_that(NO_COMPRESSION.accept_encoding({'gzip'}), equal_to('identity'))
+
+    def test_compress_from_min_request_size(self):
+        policy = CompressionPolicy(min_request_size=10)
+
+        assert_that(policy.compress(b'123456789') is None, equal_to(True))
+        compressed = policy.compress(b'1234567890') or b''
+        assert_that(gzip.decompress(compressed), equal_to(b'1234567890'))
+
+    def test_unsupported_request_encoding(self):
+        self.assertRaises(ValueError, CompressionPolicy, request_encoding='lzma')
+
+
+class TestCompressingAdapter(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(respond).start(self)
+
+    def new_client(self, policy):
+        return Client(
+            '127.0.0.1', self.server.port, https=False, compression_policy=policy
+        )
+
+    def test_responses_decoded(self):
+        for encoding in ('zstd', 'br', 'gzip', 'deflate'):
+            with self.subTest(encoding=encoding):
+                client = self.new_client(
+                    CompressionPolicy(accept_encodings=(encoding,))
+                )
+
+                response = client.session().get(client.url())
+
+                assert_that(response.content, equal_to(BODY))
+                assert_that(response.headers['Content-Encoding'], equal_to(encoding))
+                stats = client.compression_stats()
+                assert_that(stats.response_bytes, equal_to(len(BODY)))
+                assert_that(stats.bytes_saved, greater_than(len(BODY) // 2))
+
+    def test_streamed_responses_decoded_while_read(self):
+        client = self.new_client(CompressionPolicy())
+
+        response = client.session().get(client.url(), stream=True)
+
+        assert_that(b''.join(response.iter_content(1024)), equal_to(BODY))
+        assert_that(client.compression_stats().responses_compressed, equal_to(0))
+
+    def test_large_request_bodies_compressed(self):
+        client = self.new_client(CompressionPolicy(min_request_size=100))
+
+        client.session().post(client.url(), data=b'small')
+        client.session().post(client.url(), data=BODY)
+
+        small, large = self.server.requests
+        assert_that(small.body, equal_to(b'small'))
+        assert_that('Content-Encoding' in small.headers, equal_to(False))
+        assert_that(large.headers['Content-Encoding'], equal_to('gzip'))
+        assert_that(gzip.decompress(large.body or b''), equal_to(BODY))
+        assert_that(
+            client.compression_stats(),
+            has_properties(
+                requests_compressed=1,
+                request_bytes=len(BODY),
+                request_bytes_sent=len(large.body or b''),
+            ),
+        )
+
+    def test_command_overrides_policy(self):
+        client = self.new_client(CompressionPolicy(min_request_size=100))
+        session = client.session()
+        token = current_command.set(UncompressedCommand(Mock()))
+        self.addCleanup(current_command.reset, token)
+
+        session.get(client.url())
+        session.post(client.url(), data=BODY)
+
+        get, post = self.server.requests
+        assert_that(get.headers['Accept-Encoding'], equal_to('identity'))
+        assert_that(post.body, equal_to(BODY))
+        assert_that('Content-Encoding' in post.headers, equal_to(False))
+
+    def test_no_policy(self):
+        client = self.new_client(None)
+
+        client.session().get(client.url())
+
+        (request,) = self.server.requests
+        assert_that(request.headers['Accept-Encoding'], equal_to('identity'))
+
+
+class TestCompressionTransport(unittest.IsolatedAsyncioTestCase):
+    async def test_negotiation_and_request_compression(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                200,
+                headers={'Content-Encoding': 'br'},
+                content=COMPRESSORS['br'](BODY),
+            )
+
+        counters = CompressionCounters()
+        policy = CompressionPolicy(accept_encodings=('br', 'lzma', 'gzip'))
+        transport = CompressionTransport(httpx.MockTransport(handler), policy, counters)
+
+        async with httpx.AsyncClient(transport=transport) as session:
+            response = await session.post('https://wazo/api', content=BODY)
+
+        assert_that(response.content, equal_to(BODY))
+        (request,) = requests
+        assert_that(
+            request.headers,
+            has_entries({'Accept-Encoding': 'br, gzip', 'Content-Encoding': 'gzip'}),
+        )
+        assert_that(gzip.decompress(request.read()), equal_to(BODY))
+        assert_that(counters.stats().requests_compressed, equal_to(1))
+
+    def test_client_builds_transport(self):
+        client = AsyncClient('wazo', 443, compression_policy=CompressionPolicy())
+
+        transport = client._build_transport()
+
+        assert_that(isinstance(transport, CompressionTransport), equal_to(True))
@@ -0,0 +1,163 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import os
+import unittest
+from typing import Any
+
+from hamcrest import assert_that, equal_to, is_, only_contains
+
+from ..balancing import EndpointGroup
+from ..breaker import CircuitBreaker, CircuitBreakerConfig, CircuitState
+from ..cache import ResponseCache
+from ..client import PLUGINS_CACHE, BaseClient
+from ..coalescing import RequestCoalescer
+from ..compression import CompressionCounters
+from ..fork import ForkAware
+from ..instrumentation import HistogramCollector
+from ..plugins import PluginRegistry
+from ..pool import ConnectionPoolRegistry
+from ..retry import RetryBudget
+from .stub_server import StubResponse, StubServer
+
+NAMESPACE = 'test_rest_client.commands'
+
+
+class Client(BaseClient):
+    namespace = NAMESPACE
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'fork() is not available')
+class TestFork(unittest.TestCase):
+    children = 20
+
+    def setUp(self):
+        self.server = StubServer(
+            lambda request: StubResponse(body=b'ok'), keep_alive=True
+        ).start(self)
+
+    def new_client(self, **kwargs):
+        return Client(
+            '127.0.0.1', self.server.port, version='1.0', https=False, **kwargs
+        )
+
+    def fork(self, child):
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                status = 0 if child() else 1
+            finally:
+                os._exit(status)
+        return pid
+
+    def wait(self, pids):
+        return [os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) for pid in pids]
+
+    def test_children_send_requests_on_connections_of_their_own(self):
+        registry = ConnectionPoolRegistry()
+        self.addCleanup(registry.close)
+        clients = [
+            self.new_client(keep_alive=True, request_coalescer=RequestCoalescer()),
+            self.new_client(connection_pools=registry),
+        ]
+        for client in clients:
+            client.warm_up()
+            client.example.test()
+        parent_sessions = [client.session() for client in clients]
+        misses = PLUGINS_CACHE.stats().misses
+
+        def child():
+            for _ in range(3):
+                for client in clients:
+                    if client.example.test() != b'ok':
+                        return False
+            sessions = [client.session() for client in clients]
+            # New clients use the plugins loaded by the parent
+            self.new_client()
+            return (
+                all(s is not p for s, p in zip(sessions, parent_sessions))
+                and PLUGINS_CACHE.stats().misses == misses
+            )
+
+        # Locks held by the parent when it forks are not held in the children
+        with clients[0]._cached_session_lock, PLUGINS_CACHE._lock:
+            pids = [self.fork(child) for _ in range(self.children)]
+        exit_codes = self.wait(pids)
+
+        assert_that(exit_codes, only_contains(0))
+        assert_that(len(self.server.requests), equal_to(2 + self.children * 6))
+        # One connection per client, in the parent and in each child
+        assert_that(self.server.connections, equal_to(2 + self.children * 2))
+
+        for client in clients:
+            assert_that(client.example.test(), equal_to(b'ok'))
+        assert_that(self.server.connections, equal_to(2 + self.children * 2))
+
+
+class TestForkDetection(unittest.TestCase):
+    def test_reset_after_fork_required(self):
+        class Incomplete(ForkAware):
+            pass
+
+        self.assertRaises(TypeError, Incomplete)
+
+    def test_client_session_reset(self):
+        client = Client('localhost', 443)
+        session = client.session()
+
+        # As if inherited through a fork that did not run the fork hooks
+        client._pid = -1
+
+        assert_that(client.session() is session, is_(False))
+
+    def test_plugin_registry_keeps_plugins(self):
+        registry = PluginRegistry()
+        plugins = registry.get(NAMESPACE)
+
+        registry._pid = -1
+
+        assert_that(registry.get(NAMESPACE) is plugins, is_(True))
+        assert_that(registry.stats().misses, equal_to(1))
+
+    def test_shared_locks_reset(self):
+        objects: list[Any] = [
+            CircuitBreaker('localhost:443', CircuitBreakerConfig()),
+            ResponseCache(),
+            RetryBudget(),
+            EndpointGroup([('localhost', 443)]),
+            HistogramCollector(),
+            CompressionCounters(),
+        ]
+        for obj in objects:
+            with self.subTest(type(obj).__name__):
+                # As if held by another thread of the parent when it forked
+                obj._lock.acquire()
+                obj._pid = -1
+
+                obj._check_fork()
+
+                assert_that(obj._lock.locked(), is_(False))
+
+    def test_breaker_forgets_probes_in_flight(self):
+        config = CircuitBreakerConfig(minimum_calls=1, open_duration=0)
+        breaker = CircuitBreaker('localhost:443', config)
+        breaker.record_failure()
+        breaker.before_request()
+
+        breaker._pid = -1
+
+        assert_that(breaker.state, equal_to(CircuitState.HALF_OPEN))
+        breaker.before_request()
+
+    def test_endpoint_group_forgets_requests_in_flight(self):
+        group = EndpointGroup([('localhost', 443)])
+        endpoint = group.acquire()
+        endpoint._probing = True
+
+        group._pid = -1
+
+        assert_that(group.acquire().outstanding, equal_to(1))
+        assert_that(endpoint._probing, is_(False))
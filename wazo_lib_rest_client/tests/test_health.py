@@ -0,0 +1,165 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import asyncio
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    has_entries,
+    has_properties,
+    is_,
+    less_than,
+)
+
+from ..async_client import AsyncBaseClient
+from ..async_health import AsyncHealthMonitor
+from ..async_health import check_reachability as check_reachability_async
+from ..balancing import EndpointGroup
+from ..client import BaseClient
+from ..health import HealthMonitor, check_reachability
+from .stub_server import StubResponse, StubServer, unused_port
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+class AsyncClient(AsyncBaseClient):
+    namespace = 'test_rest_client.async_commands'
+
+    def __init__(self, handler, **kwargs):
+        super().__init__('localhost', 1234, https=False, **kwargs)
+        self._handler = handler
+
+    def _build_transport(self):
+        return httpx.MockTransport(self._handler)
+
+
+class TestHealth(unittest.TestCase):
+    def start_server(self, delay=0.0):
+        def respond(request):
+            time.sleep(delay)
+            return StubResponse()
+
+        return StubServer(respond).start(self)
+
+    def new_client(self, port, **kwargs):
+        return Client('127.0.0.1', port, https=False, timeout=10, **kwargs)
+
+    def test_check_reachability_concurrently_within_deadline(self):
+        slow = self.start_server(delay=1)
+        fast = self.start_server()
+        clients = [
+            self.new_client(slow.server_address[1]),
+            self.new_client(unused_port()),
+            self.new_client(fast.server_address[1]),
+        ] * 3
+
+        start = time.monotonic()
+        results = check_reachability(clients, deadline=0.2)
+
+        assert_that(time.monotonic() - start, less_than(0.5))
+        assert_that(results, contains_exactly(*[False, False, True] * 3))
+
+    def test_monitor_checks_each_endpoint(self):
+        server = self.start_server()
+        live = ('127.0.0.1', server.port)
+        dead = ('127.0.0.1', unused_port())
+        group = EndpointGroup([dead, live])
+        balanced = Client('wazo', 443, https=False, endpoints=group)
+        unreachable = self.new_client(unused_port())
+        monitor = HealthMonitor([balanced], deadline=0.5)
+
+        monitor.check()
+
+        assert_that(
+            monitor.states(),
+            has_entries(
+                {
+                    f'http://{dead[0]}:{dead[1]}': has_properties(reachable=False),
+                    f'http://{live[0]}:{live[1]}': has_properties(reachable=True),
+                }
+            ),
+        )
+        assert_that(group.endpoints[0].healthy, is_(False))
+        assert_that(group.endpoints[1].healthy, is_(True))
+        assert_that(monitor.is_ready(), is_(True))
+        assert_that(monitor.is_ready(max_age=0), is_(False))
+
+        monitor.clients.append(unreachable)
+        monitor.check()
+
+        assert_that(monitor.is_ready(), is_(False))
+
+    def test_monitor_runs_in_background(self):
+        server = self.start_server()
+        client = self.new_client(server.port)
+
+        with HealthMonitor([client], interval=0.01) as monitor:
+            while not monitor.states():
+                time.sleep(0.01)
+
+        assert_that(monitor.is_ready(), is_(True))
+
+    @patch('wazo_lib_rest_client.health.ThreadPoolExecutor', wraps=ThreadPoolExecutor)
+    def test_monitor_checks_from_one_executor(self, executor_class):
+        server = self.start_server()
+        client = self.new_client(server.port)
+        monitor = HealthMonitor([client], interval=0.01)
+        checked_at: set[float] = set()
+
+        with monitor:
+            executor = monitor._executor
+            while len(checked_at) < 3:
+                checked_at.update(
+                    state.checked_at for state in monitor.states().values()
+                )
+                time.sleep(0.01)
+
+        assert_that(executor_class.call_count, equal_to(1))
+        assert_that(executor is not None and executor._shutdown, is_(True))
+        assert_that(monitor._executor is None, is_(True))
+
+
+class TestAsyncHealth(unittest.IsolatedAsyncioTestCase):
+    async def test_check_reachability_concurrently_within_deadline(self):
+        async def slow(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200)
+
+        def refused(request):
+            raise httpx.ConnectError('refused', request=request)
+
+        clients = [
+            AsyncClient(slow),
+            AsyncClient(refused),
+            AsyncClient(lambda request: httpx.Response(200)),
+        ]
+
+        start = time.monotonic()
+        results = await check_reachability_async(clients, deadline=0.2)
+
+        assert_that(time.monotonic() - start, less_than(0.5))
+        assert_that(results, contains_exactly(False, False, True))
+
+    async def test_monitor(self):
+        client = AsyncClient(lambda request: httpx.Response(200))
+
+        async with AsyncHealthMonitor([client], interval=0.01) as monitor:
+            while not monitor.states():
+                await asyncio.sleep(0.01)
+
+        assert_that(
+            monitor.states(),
+            has_entries({'http://localhost:1234': has_properties(reachable=True)}),
+        )
+        assert_that(monitor.is_ready(), is_(True))
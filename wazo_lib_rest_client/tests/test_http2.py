@@ -0,0 +1,282 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import h2.config
+import h2.connection
+import h2.events
+from hamcrest import (
+    assert_that,
+    calling,
+    equal_to,
+    has_entries,
+    is_,
+    only_contains,
+    raises,
+)
+from requests.exceptions import ConnectionError, HTTPError
+
+from ..async_client import AsyncBaseClient
+from ..client import BaseClient
+from ..command import RESTCommand
+from ..http2 import HTTP2Adapter
+from ..retry import RetryPolicy
+from .stub_server import StubResponse, StubServer
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+class AsyncClient(AsyncBaseClient):
+    namespace = 'test_rest_client.async_commands'
+
+
+class H2Server:
+    """HTTP/2 only server, answering {"path": <path>} to every request
+
+    The status codes in `statuses` are sent first, one per request.
+    """
+
+    def __init__(self, certificate):
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(*certificate)
+        self.context.set_alpn_protocols(['h2'])
+        self.socket = socket.create_server(('127.0.0.1', 0))
+        self.port = self.socket.getsockname()[1]
+        self.connections = 0
+        self.requests = 0
+        self.statuses = []
+        self._closed = False
+
+    def start(self):
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        # Closing the socket alone does not wake up accept(): connections
+        # could still be accepted until it returns
+        self._closed = True
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.socket.close()
+        self._thread.join()
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                sock, _ = self.socket.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        with self.context.wrap_socket(sock, server_side=True) as tls:
+            config = h2.config.H2Configuration(client_side=False)
+            connection = h2.connection.H2Connection(config=config)
+            connection.initiate_connection()
+            tls.sendall(connection.data_to_send())
+            paths = {}
+            while data := tls.recv(65535):
+                for event in connection.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        paths[event.stream_id] = dict(event.headers)[b':path']
+                    elif isinstance(event, h2.events.StreamEnded):
+                        self._respond(
+                            connection, event.stream_id, paths.pop(event.stream_id)
+                        )
+                tls.sendall(connection.data_to_send())
+
+    def _respond(self, connection, stream_id, path):
+        self.requests += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = json.dumps({'path': path.decode(), 'message': 'from h2'}).encode()
+        headers = [
+            (':status', str(status)),
+            ('content-type', 'application/json'),
+            ('content-length', str(len(body))),
+        ]
+        connection.send_headers(stream_id, headers)
+        connection.send_data(stream_id, body, end_stream=True)
+
+
+def self_signed_certificate(directory):
+    certificate = os.path.join(directory, 'server.crt')
+    key = os.path.join(directory, 'server.key')
+    # fmt: off
+    subprocess.run(
+        [
+            'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+            '-keyout', key, '-out', certificate, '-days', '1',
+            '-subj', '/CN=localhost',
+            '-addext', 'subjectAltName=IP:127.0.0.1',
+        ],
+        check=True,
+        capture_output=True,
+    )
+    # fmt: on
+    return certificate, key
+
+
+@unittest.skipIf(shutil.which('openssl') is None, 'openssl is not installed')
+class TestHTTP2(unittest.TestCase):
+    certificate: tuple[str, str]
+
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        cls.certificate = self_signed_certificate(directory.name)
+
+    def setUp(self):
+        # requests prefers these variables to the verify setting of the session
+        environ = patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop('REQUESTS_CA_BUNDLE', None)
+        os.environ.pop('CURL_CA_BUNDLE', None)
+
+        self.server = H2Server(self.certificate)
+        self.server.start()
+        self.addCleanup(self.server.close)
+
+    def new_client(self, port, **kwargs):
+        client = Client(
+            '127.0.0.1',
+            port,
+            version='1.0',
+            verify_certificate=self.certificate[0],
+            http2=True,
+            **kwargs,
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def test_concurrent_requests_multiplexed_on_one_connection(self):
+        client = self.new_client(self.server.port)
+
+        def get(_):
+            return client.session().get(client.url('test'))
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            responses = list(executor.map(get, range(10)))
+
+        assert_that({r.raw.http_version for r in responses}, equal_to({'HTTP/2'}))
+        assert_that([r.json()['path'] for r in responses], only_contains('/1.0/test'))
+        assert_that(self.server.requests, equal_to(10))
+        assert_that(self.server.connections, equal_to(1))
+
+    def test_commands_unchanged(self):
+        client = self.new_client(self.server.port)
+
+        content = client.example.test()
+
+        assert_that(json.loads(content), has_entries(path='/1.0/test'))
+
+    def test_raise_from_response(self):
+        client = self.new_client(self.server.port)
+        self.server.statuses = [404]
+
+        response = client.session().get(client.url('test'))
+
+        assert_that(
+            calling(RESTCommand.raise_from_response).with_args(response),
+            raises(HTTPError, 'from h2'),
+        )
+
+    def test_retry_policy(self):
+        policy = RetryPolicy(backoff_factor=0, budget=None)
+        client = self.new_client(self.server.port, retry_policy=policy)
+        self.server.statuses = [503, 503]
+
+        response = client.session().get(client.url('test'))
+
+        assert_that(response.status_code, equal_to(200))
+        assert_that(len(response.raw.retries.history), equal_to(2))
+
+    def test_falls_back_to_http1(self):
+        def respond(request):
+            body = json.dumps({'path': request.path}).encode()
+            return StubResponse(body=body, headers={'Content-Type': 'application/json'})
+
+        server = StubServer(respond, keep_alive=True)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(*self.certificate)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        server.start(self)
+        client = self.new_client(server.port)
+
+        response = client.session().get(client.url('test'))
+
+        assert_that(response.raw.http_version, equal_to('HTTP/1.1'))
+        assert_that(response.json(), equal_to({'path': '/1.0/test'}))
+
+    def test_connection_error(self):
+        self.server.close()
+        client = self.new_client(self.server.port)
+
+        assert_that(
+            calling(client.session().get).with_args(client.url('test')),
+            raises(ConnectionError),
+        )
+
+    def test_connection_close_header_not_sent(self):
+        client = self.new_client(self.server.port)
+
+        session = client.session()
+
+        assert_that('Connection' in session.headers, is_(False))
+        assert_that(
+            isinstance(session.get_adapter('https://').adapter, HTTP2Adapter),
+            is_(True),
+        )
+
+
+@unittest.skipIf(shutil.which('openssl') is None, 'openssl is not installed')
+class TestAsyncHTTP2(unittest.IsolatedAsyncioTestCase):
+    certificate: tuple[str, str]
+
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        cls.certificate = self_signed_certificate(directory.name)
+
+    async def test_concurrent_requests_multiplexed_on_one_connection(self):
+        server = H2Server(self.certificate)
+        server.start()
+        self.addCleanup(server.close)
+        client = AsyncClient(
+            '127.0.0.1',
+            server.port,
+            version='1.0',
+            verify_certificate=self.certificate[0],
+            http2=True,
+        )
+
+        async with client:
+            responses = [await client.session().get(client.url('test'))]
+            responses += await asyncio.gather(
+                *(client.session().get(client.url('test')) for _ in range(9))
+            )
+
+        assert_that({r.http_version for r in responses}, equal_to({'HTTP/2'}))
+        assert_that(server.requests, equal_to(10))
+        assert_that(server.connections, equal_to(1))
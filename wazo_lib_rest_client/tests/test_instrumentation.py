@@ -0,0 +1,164 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+import time
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import (
+    assert_that,
+    contains_string,
+    equal_to,
+    greater_than_or_equal_to,
+    has_properties,
+    is_,
+    less_than_or_equal_to,
+)
+from requests import Request, Response
+from requests.exceptions import ConnectionError
+
+from ..adapters import current_command
+from ..client import BaseClient
+from ..instrumentation import (
+    HistogramCollector,
+    Instrumentation,
+    InstrumentingAdapter,
+    RequestEvent,
+    RequestInfo,
+    RequestTimings,
+)
+from ..ratelimit import RateLimitExceeded
+from .stub_server import StubResponse, StubServer
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+class UsersCommand:
+    resource = 'users'
+
+
+class TestInstrumentingAdapter(unittest.TestCase):
+    def setUp(self):
+        self.inner = Mock()
+        self.instrumentation = Instrumentation()
+        self.infos: list[RequestInfo] = []
+        self.events: list[RequestEvent] = []
+        self.instrumentation.add_pre_request_hook(self.infos.append)
+        self.instrumentation.add_post_request_hook(self.events.append)
+        self.adapter = InstrumentingAdapter(self.inner, self.instrumentation)
+        self.request = Request(
+            'POST', 'http://localhost/users', data=b'12345'
+        ).prepare()
+
+    def test_hooks_called_with_request_details(self):
+        response = Response()
+        response.status_code = 201
+        response._content = b'123'
+
+        def send(request, **kwargs):
+            time.sleep(0.05)
+            return response
+
+        self.inner.send.side_effect = send
+        current_command.set(UsersCommand())
+
+        self.adapter.send(self.request)
+
+        expected_info = has_properties(
+            method='POST',
+            url='http://localhost/users',
+            command='UsersCommand',
+            resource='users',
+            bytes_sent=5,
+        )
+        assert_that(self.infos[0], expected_info)
+        assert_that(
+            self.events[0],
+            has_properties(
+                request=expected_info,
+                status_code=201,
+                bytes_received=3,
+                timings=has_properties(first_byte=greater_than_or_equal_to(0.05)),
+            ),
+        )
+
+    def test_error_reported(self):
+        error = ConnectionError()
+        self.inner.send.side_effect = error
+
+        self.assertRaises(ConnectionError, self.adapter.send, self.request)
+
+        assert_that(self.events[0], has_properties(status_code=None, error=error))
+
+    def test_other_error_reported(self):
+        error = RateLimitExceeded('all tenants', None)
+        self.inner.send.side_effect = error
+
+        self.assertRaises(RateLimitExceeded, self.adapter.send, self.request)
+
+        assert_that(self.events[0], has_properties(status_code=None, error=error))
+
+    def test_failing_hook_does_not_fail_request(self):
+        self.inner.send.return_value = Response()
+        self.instrumentation.add_post_request_hook(Mock(side_effect=Exception))
+
+        response = self.adapter.send(self.request, stream=True)
+
+        assert_that(response, is_(self.inner.send.return_value))
+
+
+class TestClientInstrumentation(unittest.TestCase):
+    def test_timings_of_a_request(self):
+        server = StubServer(lambda request: StubResponse(body=b'x' * 1000))
+        server.start(self)
+        instrumentation = Instrumentation()
+        events: list[RequestEvent] = []
+        instrumentation.add_post_request_hook(events.append)
+        client = Client(
+            '127.0.0.1', server.port, https=False, instrumentation=instrumentation
+        )
+
+        client.session().get(client.url())
+
+        (event,) = events
+        assert_that(event.bytes_received, equal_to(1000))
+        assert_that(event.timings.first_byte is None, is_(False))
+        assert_that(
+            event.timings.first_byte or 0.0,
+            less_than_or_equal_to(event.timings.total),
+        )
+
+
+class TestHistogramCollector(unittest.TestCase):
+    def test_prometheus_output(self):
+        collector = HistogramCollector(buckets=[0.1, 1])
+        info = RequestInfo('GET', 'url', 'Users"Command', 'users', 0)
+        for total in (0.05, 0.5, 5):
+            collector(RequestEvent(info, RequestTimings(total), 200, 10))
+
+        text = collector.to_prometheus()
+
+        labels = 'command="Users\\"Command",method="GET",status="200"'
+        duration = 'wazo_rest_client_request_duration_seconds'
+        assert_that(
+            text, contains_string(f'{duration}_bucket{{{labels},le="0.1"}} 1\n')
+        )
+        assert_that(
+            text, contains_string(f'{duration}_bucket{{{labels},le="1.0"}} 2\n')
+        )
+        assert_that(
+            text, contains_string(f'{duration}_bucket{{{labels},le="+Inf"}} 3\n')
+        )
+        assert_that(text, contains_string(f'{duration}_sum{{{labels}}} 5.55\n'))
+        assert_that(text, contains_string(f'{duration}_count{{{labels}}} 3\n'))
+        assert_that(
+            text,
+            contains_string(f'wazo_rest_client_response_bytes_total{{{labels}}} 30\n'),
+        )
+
+    def test_empty(self):
+        text = HistogramCollector().to_prometheus()
+
+        assert_that(text.count('# TYPE'), equal_to(3))
@@ -0,0 +1,213 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    has_entry,
+    has_properties,
+    instance_of,
+    is_,
+)
+
+from ..example_cmd import ExampleCommand
+from ..plugins import (
+    PLUGIN_INDEX_ENV,
+    IndexedExtension,
+    PluginRegistry,
+    RegistryStats,
+    build_index,
+    load_extensions,
+    write_index,
+)
+
+NAMESPACE = 'test_rest_client.commands'
+
+
+class TestPluginIndex(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.index_path = os.path.join(directory.name, 'index.json')
+
+        env = patch.dict(os.environ, {PLUGIN_INDEX_ENV: self.index_path})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_build_index(self):
+        index = build_index([NAMESPACE])
+
+        assert_that(
+            index['namespaces'],
+            has_entry(
+                NAMESPACE,
+                {'example': 'wazo_lib_rest_client.example_cmd:ExampleCommand'},
+            ),
+        )
+
+    def test_load_extensions_from_index(self):
+        write_index(self.index_path, [NAMESPACE])
+
+        extensions = load_extensions(NAMESPACE)
+
+        assert_that(
+            extensions,
+            contains_exactly(
+                has_properties(name='example', plugin=ExampleCommand),
+            ),
+        )
+        assert_that(extensions[0], instance_of(IndexedExtension))
+
+    def test_index_written_from_another_script_directory(self):
+        # The index is written into a sys.path directory by another script
+        installed = [self.directory, *sys.path[1:]]
+        with patch.object(sys, 'path', ['/usr/local/bin', *installed]):
+            write_index(self.index_path, [NAMESPACE])
+
+        with patch.object(sys, 'path', ['/srv/my-app', *installed]):
+            extensions = load_extensions(NAMESPACE)
+
+        assert_that(extensions[0], instance_of(IndexedExtension))
+
+    def test_index_stale_after_installing_a_distribution(self):
+        with patch.object(sys, 'path', [sys.path[0], self.directory, *sys.path[1:]]):
+            write_index(self.index_path, [NAMESPACE])
+            os.mkdir(os.path.join(self.directory, 'package-1.0.dist-info'))
+
+            extensions = load_extensions(NAMESPACE)
+
+        assert_that(isinstance(extensions[0], IndexedExtension), is_(False))
+
+    def test_stale_index_falls_back_to_entry_points(self):
+        index = build_index([NAMESPACE])
+        index['fingerprint'] = 'stale'
+        with open(self.index_path, 'w') as f:
+            json.dump(index, f)
+
+        extensions = load_extensions(NAMESPACE)
+
+        assert_that(isinstance(extensions[0], IndexedExtension), is_(False))
+        assert_that(extensions[0].plugin, equal_to(ExampleCommand))
+
+    def test_missing_index_falls_back_to_entry_points(self):
+        extensions = load_extensions(NAMESPACE)
+
+        assert_that(isinstance(extensions[0], IndexedExtension), is_(False))
+        assert_that(extensions[0].plugin, equal_to(ExampleCommand))
+
+
+class TestIndexedExtension(unittest.TestCase):
+    @patch('wazo_lib_rest_client.plugins.importlib.import_module')
+    def test_plugin_imported_on_first_access(self, import_module):
+        ext = IndexedExtension('example', 'some.module:Outer.Inner')
+
+        import_module.assert_not_called()
+        plugin = ext.plugin
+
+        import_module.assert_called_once_with('some.module')
+        assert_that(plugin, is_(import_module.return_value.Outer.Inner))
+
+
+def _extension(name):
+    ext = Mock()
+    ext.name = name
+    return ext
+
+
+@patch('wazo_lib_rest_client.plugins.load_extensions')
+class TestPluginRegistry(unittest.TestCase):
+    def test_get_loads_namespace_once(self, load_extensions):
+        ext = _extension('example')
+        load_extensions.return_value = [ext]
+        registry = PluginRegistry()
+
+        first = registry.get('ns')
+        second = registry.get('ns')
+
+        assert_that(first, equal_to({'example': ext}))
+        assert_that(second, is_(first))
+        load_extensions.assert_called_once_with('ns')
+        assert_that(registry.stats(), equal_to(RegistryStats(1, 1, 1)))
+
+    def test_concurrent_get_loads_namespace_once(self, load_extensions):
+        def slow_load(namespace):
+            time.sleep(0.05)
+            return [_extension('example')]
+
+        load_extensions.side_effect = slow_load
+        registry = PluginRegistry()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.get('ns')))
+            for _ in range(10)
+        ]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        load_extensions.assert_called_once_with('ns')
+        assert_that(all(result is results[0] for result in results), is_(True))
+        assert_that(registry.stats(), equal_to(RegistryStats(9, 1, 1)))
+
+    def test_invalidate_and_reload(self, load_extensions):
+        load_extensions.side_effect = lambda namespace: [_extension('example')]
+        registry = PluginRegistry()
+        first = registry.get('ns')
+
+        registry.invalidate('ns')
+        assert_that('ns' in registry, is_(False))
+        second = registry.get('ns')
+        third = registry.reload('ns')
+
+        assert_that(second is first, is_(False))
+        assert_that(third is second, is_(False))
+        assert_that(load_extensions.call_count, equal_to(3))
+
+    def test_least_recently_used_namespace_evicted(self, load_extensions):
+        load_extensions.return_value = []
+        registry = PluginRegistry(max_namespaces=2)
+
+        registry.get('ns1')
+        registry.get('ns2')
+        registry.get('ns1')
+        registry.get('ns3')
+
+        assert_that('ns1' in registry, is_(True))
+        assert_that('ns2' in registry, is_(False))
+        assert_that(len(registry), equal_to(2))
+
+    def test_namespace_locks_not_kept(self, load_extensions):
+        load_extensions.return_value = []
+        registry = PluginRegistry(max_namespaces=2)
+
+        for i in range(100):
+            registry.get(f'ns{i}')
+        load_extensions.side_effect = ImportError()
+        self.assertRaises(ImportError, registry.get, 'broken')
+
+        assert_that(registry._namespace_locks, equal_to({}))
+
+    def test_prewarm_imports_plugins(self, load_extensions):
+        ext = IndexedExtension(
+            'example', 'wazo_lib_rest_client.example_cmd:ExampleCommand'
+        )
+        load_extensions.return_value = [ext]
+        registry = PluginRegistry()
+
+        registry.prewarm(['ns'])
+
+        assert_that(ext._plugin, equal_to(ExampleCommand))
+        assert_that(registry['ns'], equal_to([ext]))
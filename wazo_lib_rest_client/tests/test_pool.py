@@ -0,0 +1,128 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import Mock, patch
+
+from hamcrest import assert_that, equal_to, is_, same_instance
+
+from ..client import BaseClient
+from ..pool import (
+    ConnectionPoolRegistry,
+    PoolKey,
+    SharedPoolAdapter,
+)
+from ..retry import RetryPolicy
+from .stub_server import StubServer
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+def key(host='localhost', **kwargs):
+    kwargs.setdefault('port', 443)
+    kwargs.setdefault('verify', True)
+    return PoolKey('https', host, **kwargs)
+
+
+class TestConnectionPoolRegistry(unittest.TestCase):
+    def test_adapter_shared_by_key(self):
+        registry = ConnectionPoolRegistry()
+        factory = Mock()
+
+        first = registry.acquire(key(), factory)
+        second = registry.acquire(key(), factory)
+        other = registry.acquire(key(verify='/ca.crt'), factory)
+
+        assert_that(first, same_instance(second))
+        assert_that(factory.call_count, equal_to(2))
+        assert_that(len(registry), equal_to(2))
+        assert_that(other, same_instance(factory.return_value))
+
+    def test_least_recently_used_pool_closed_past_max_pools(self):
+        registry = ConnectionPoolRegistry(max_pools=2)
+        adapters = {host: Mock() for host in ('a', 'b', 'c')}
+
+        registry.acquire(key('a'), lambda: adapters['a'])
+        registry.acquire(key('b'), lambda: adapters['b'])
+        registry.acquire(key('a'), lambda: adapters['a'])
+        registry.acquire(key('c'), lambda: adapters['c'])
+
+        adapters['b'].close.assert_called_once_with()
+        assert_that(key('b') in registry, is_(False))
+        assert_that(key('a') in registry, is_(True))
+
+    @patch('wazo_lib_rest_client.pool.time.monotonic')
+    def test_idle_pool_drops_its_connections(self, monotonic):
+        registry = ConnectionPoolRegistry(idle_timeout=60)
+        adapter = Mock()
+        monotonic.return_value = 100
+        registry.acquire(key(), lambda: adapter)
+
+        monotonic.return_value = 150
+        registry.acquire(key(), Mock())
+        adapter.close.assert_not_called()
+
+        monotonic.return_value = 300
+        registry.evict_idle()
+        adapter.close.assert_called_once_with()
+        assert_that(registry.acquire(key(), Mock()) is adapter, is_(True))
+
+    def test_registry_emptied_after_fork(self):
+        registry = ConnectionPoolRegistry()
+        adapter = Mock()
+        registry.acquire(key(), lambda: adapter)
+
+        registry._reset_after_fork()
+
+        assert_that(len(registry), equal_to(0))
+        adapter.close.assert_not_called()
+
+    def test_closing_a_session_leaves_the_pool_open(self):
+        registry = ConnectionPoolRegistry()
+        adapter = Mock()
+        registry.acquire(key(), lambda: adapter)
+
+        SharedPoolAdapter(registry, key(), Mock()).close()
+
+        adapter.close.assert_not_called()
+
+
+class TestSharedPools(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(keep_alive=True).start(self)
+        self.registry = ConnectionPoolRegistry()
+        self.addCleanup(self.registry.close)
+
+    def new_client(self, **kwargs):
+        return Client(
+            '127.0.0.1',
+            self.server.port,
+            https=False,
+            connection_pools=self.registry,
+            **kwargs,
+        )
+
+    def test_clients_of_an_endpoint_reuse_connections(self):
+        for token in ('token-1', 'token-2', 'token-3'):
+            client = self.new_client(token=token)
+            client.session().get(client.url('test'))
+
+        assert_that(self.server.connections, equal_to(1))
+        tokens = [request.headers['X-Auth-Token'] for request in self.server.requests]
+        assert_that(tokens, equal_to(['token-1', 'token-2', 'token-3']))
+
+    def test_retry_policies_do_not_share_pools(self):
+        self.new_client().session().get(self.new_client().url('test'))
+        client = self.new_client(retry_policy=RetryPolicy(total=1))
+        client.session().get(client.url('test'))
+
+        assert_that(len(self.registry), equal_to(2))
+
+    def test_no_connection_close_header(self):
+        session = self.new_client().session()
+
+        assert_that('Connection' in session.headers, is_(False))
@@ -0,0 +1,237 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from email.utils import formatdate
+from unittest.mock import patch
+
+import httpx
+from hamcrest import (
+    assert_that,
+    close_to,
+    contains_exactly,
+    equal_to,
+    greater_than,
+    instance_of,
+    is_,
+)
+
+from ..async_client import AsyncBaseClient, RateLimitingTransport
+from ..batch import BatchRequest
+from ..breaker import CircuitBreakerConfig, CircuitState
+from ..client import BaseClient
+from ..ratelimit import (
+    RateLimit,
+    RateLimiter,
+    RateLimitExceeded,
+    parse_retry_after,
+)
+from .stub_server import StubResponse, StubServer
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+@patch('wazo_lib_rest_client.ratelimit.time.monotonic')
+class TestRateLimiter(unittest.TestCase):
+    def acquire_error(self, limiter, tenant=None):
+        with self.assertRaises(RateLimitExceeded) as context:
+            limiter.acquire(tenant)
+        return context.exception
+
+    def test_token_bucket(self, monotonic):
+        monotonic.return_value = 100
+        limiter = RateLimiter(RateLimit(rate=10, burst=2), blocking=False)
+
+        limiter.acquire()
+        limiter.acquire()
+        error = self.acquire_error(limiter)
+
+        assert_that(error.retry_after, close_to(0.1, 1e-9))
+
+        monotonic.return_value = 100.2
+        limiter.acquire()
+
+    def test_max_concurrency(self, monotonic):
+        monotonic.return_value = 100
+        limiter = RateLimiter(RateLimit(max_concurrency=1), blocking=False)
+
+        limiter.acquire()
+        error = self.acquire_error(limiter)
+
+        assert_that(error.retry_after is None, is_(True))
+
+        limiter.release()
+        limiter.acquire()
+
+    def test_limits_per_tenant(self, monotonic):
+        monotonic.return_value = 100
+        limiter = RateLimiter(
+            RateLimit(max_concurrency=3),
+            tenant_limit=RateLimit(max_concurrency=1),
+            tenant_limits={'bulk': RateLimit(max_concurrency=2)},
+            blocking=False,
+        )
+
+        limiter.acquire('t1')
+        self.acquire_error(limiter, 't1')
+        limiter.acquire('bulk')
+        limiter.acquire('bulk')
+        error = self.acquire_error(limiter, 't2')
+
+        assert_that(error.key, equal_to('tenant t2'))
+
+    def test_429_pauses_and_slows_down_its_tenant(self, monotonic):
+        monotonic.return_value = 100
+        limiter = RateLimiter(
+            tenant_limit=RateLimit(rate=10, max_concurrency=4), blocking=False
+        )
+        limiter.acquire('t1')
+
+        limiter.release('t1', 429, retry_after=5)
+
+        error = self.acquire_error(limiter, 't1')
+        assert_that(error.retry_after, close_to(5, 1e-9))
+        limiter.acquire('t2')
+        bucket = limiter._tenants['t1']
+        assert_that(bucket.rate, equal_to(5.0))
+        assert_that(bucket.concurrency, equal_to(2))
+
+        monotonic.return_value = 105
+        limiter.acquire('t1')
+        limiter.release('t1', 200)
+
+        assert_that(bucket.rate, equal_to(6.0))
+        assert_that(bucket.concurrency, equal_to(3))
+
+
+class TestBlockingAcquire(unittest.TestCase):
+    def test_waits_for_release(self):
+        limiter = RateLimiter(RateLimit(max_concurrency=1))
+        limiter.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            limiter.acquire()
+            acquired.set()
+
+        threading.Thread(target=acquire, daemon=True).start()
+
+        assert_that(acquired.wait(0.05), is_(False))
+        limiter.release()
+        assert_that(acquired.wait(5), is_(True))
+
+        start = time.monotonic()
+        self.assertRaises(RateLimitExceeded, limiter.acquire, timeout=0.05)
+        assert_that(time.monotonic() - start, greater_than(0.04))
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    def test_parse_retry_after(self):
+        in_a_minute = formatdate(time.time() + 60, usegmt=True)
+
+        assert_that(parse_retry_after('120'), equal_to(120.0))
+        assert_that(parse_retry_after(in_a_minute) or 0.0, close_to(60, 2))
+        assert_that(parse_retry_after('soon') is None, is_(True))
+        assert_that(parse_retry_after(None) is None, is_(True))
+
+
+def respond(request):
+    if request.headers['Wazo-Tenant'] == 'bulk':
+        return StubResponse(429, headers={'Retry-After': '30'})
+    return StubResponse()
+
+
+class TestRateLimitingAdapter(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(respond).start(self)
+
+    def test_throttled_tenant_paused(self):
+        limiter = RateLimiter(blocking=False)
+        port = self.server.port
+        client = Client(
+            '127.0.0.1', port, https=False, tenant='bulk', rate_limiter=limiter
+        )
+        url = client.url()
+
+        client.session().get(url)
+        self.assertRaises(RateLimitExceeded, client.session().get, url)
+        # Like a command called with another tenant_uuid
+        client.session().get(url, headers={'Wazo-Tenant': 'other'})
+
+        tenants = [request.headers['Wazo-Tenant'] for request in self.server.requests]
+        assert_that(tenants, contains_exactly('bulk', 'other'))
+
+    def test_throttled_requests_do_not_open_the_circuit(self):
+        limiter = RateLimiter(RateLimit(rate=0.001, burst=1), blocking=False)
+        config = CircuitBreakerConfig(minimum_calls=2, window_size=2)
+        port = self.server.port
+        client = Client(
+            '127.0.0.1',
+            port,
+            https=False,
+            rate_limiter=limiter,
+            circuit_breaker=config,
+        )
+        url = client.url()
+
+        client.session().get(url)
+        for _ in range(5):
+            self.assertRaises(RateLimitExceeded, client.session().get, url)
+
+        breaker = client._get_circuit_breaker()
+        assert_that(breaker.state, equal_to(CircuitState.CLOSED))
+
+    def test_throttled_batch_items_fail_alone(self):
+        limiter = RateLimiter(RateLimit(rate=0.001, burst=2), blocking=False)
+        port = self.server.port
+        client = Client('127.0.0.1', port, https=False, rate_limiter=limiter)
+        requests = [BatchRequest('GET', client.url()) for _ in range(4)]
+
+        results = list(client.example.batch(requests, max_workers=1))
+
+        assert_that(
+            [result.ok for result in results],
+            contains_exactly(True, True, False, False),
+        )
+        assert_that(results[2].error, instance_of(RateLimitExceeded))
+
+
+class TestRateLimitingTransport(unittest.IsolatedAsyncioTestCase):
+    async def test_requests_limited(self):
+        def handler(request):
+            return httpx.Response(429, headers={'Retry-After': '30'})
+
+        limiter = RateLimiter(blocking=False)
+        transport = RateLimitingTransport(httpx.MockTransport(handler), limiter)
+
+        async with httpx.AsyncClient(transport=transport) as session:
+            await session.get('https://wazo/api', headers={'Wazo-Tenant': 't1'})
+            with self.assertRaises(RateLimitExceeded):
+                await session.get('https://wazo/api', headers={'Wazo-Tenant': 't1'})
+            await session.get('https://wazo/api', headers={'Wazo-Tenant': 't2'})
+
+    async def test_blocking_acquire_waits(self):
+        limiter = RateLimiter(RateLimit(rate=20, burst=1))
+
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire_async()
+            limiter.release()
+
+        assert_that(time.monotonic() - start, greater_than(0.09))
+
+    def test_client_builds_transport(self):
+        class AsyncClient(AsyncBaseClient):
+            namespace = 'test_rest_client.async_commands'
+
+        client = AsyncClient('wazo', 443, rate_limiter=RateLimiter())
+
+        transport = client._build_transport()
+
+        assert_that(isinstance(transport, RateLimitingTransport), is_(True))
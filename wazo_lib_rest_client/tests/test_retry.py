@@ -0,0 +1,111 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+from __future__ import annotations
+
+import threading
+import unittest
+
+from hamcrest import assert_that, equal_to, is_, less_than_or_equal_to
+from urllib3.util.retry import RequestHistory
+
+from ..client import BaseClient
+from ..command import RESTCommand
+from ..retry import RetryBudget, RetryPolicy
+from .stub_server import StubResponse, StubServer
+
+
+class Client(BaseClient):
+    namespace = 'test_rest_client.commands'
+
+
+class NoRetryCommand(RESTCommand):
+    resource = 'test'
+    retry_policy = RetryPolicy(total=0)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        # Statuses of the next responses, then 200
+        self.statuses: list[int] = []
+        self.server = StubServer(self.respond).start(self)
+
+    def respond(self, request):
+        return StubResponse(self.statuses.pop(0) if self.statuses else 200)
+
+    def new_client(self, **policy):
+        policy.setdefault('backoff_factor', 0)
+        policy.setdefault('budget', None)
+        return Client(
+            '127.0.0.1',
+            self.server.port,
+            https=False,
+            retry_policy=RetryPolicy(**policy),
+        )
+
+    def methods(self):
+        return [request.method for request in self.server.requests]
+
+    def test_retryable_status_is_retried(self):
+        self.statuses = [503, 502]
+        client = self.new_client()
+
+        response = client.session().get(client.url('test'))
+
+        assert_that(response.status_code, equal_to(200))
+        assert_that(self.methods(), equal_to(['GET'] * 3))
+
+    def test_last_response_returned_when_retries_exhausted(self):
+        self.statuses = [503] * 5
+        client = self.new_client(total=2)
+
+        response = client.session().get(client.url('test'))
+
+        assert_that(response.status_code, equal_to(503))
+        assert_that(len(self.server.requests), equal_to(3))
+
+    def test_non_idempotent_method_is_not_retried(self):
+        self.statuses = [503]
+        client = self.new_client()
+
+        response = client.session().post(client.url('test'))
+
+        assert_that(response.status_code, equal_to(503))
+        assert_that(self.methods(), equal_to(['POST']))
+
+    def test_budget_stops_retries(self):
+        self.statuses = [503] * 5
+        client = self.new_client(budget=RetryBudget(capacity=1, refill_rate=0))
+
+        response = client.session().get(client.url('test'))
+
+        assert_that(response.status_code, equal_to(503))
+        assert_that(len(self.server.requests), equal_to(2))
+
+    def test_command_policy_overrides_client_policy(self):
+        self.statuses = [503]
+        client = self.new_client()
+        command = NoRetryCommand(client)
+
+        response = command.session.get(command.base_url)
+
+        assert_that(response.status_code, equal_to(503))
+        assert_that(len(self.server.requests), equal_to(1))
+
+
+class TestBudgetedRetry(unittest.TestCase):
+    def test_backoff_with_jitter_is_capped(self):
+        retry = RetryPolicy(backoff_factor=10, backoff_max=8).retry
+        history = tuple(RequestHistory('GET', '/', None, 503, None) for _ in range(3))
+
+        backoff = retry.new(history=history).get_backoff_time()
+
+        assert_that(4 <= backoff, is_(True))
+        assert_that(backoff, less_than_or_equal_to(8))
+
+    def test_budget_refills(self):
+        budget = RetryBudget(capacity=1, refill_rate=1000)
+
+        assert_that(budget.try_acquire(), is_(True))
+        threading.Event().wait(0.01)
+        assert_that(budget.try_acquire(), is_(True))
@@ -0,0 +1,120 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0+
+
+import io
+import json
+import unittest
+from unittest.mock import MagicMock, Mock
+
+from hamcrest import assert_that, calling, equal_to, raises
+from requests.exceptions import HTTPError
+
+from ..command import HTTPCommand
+from ..streaming import iter_json_array
+
+DOCUMENT = {
+    'filtered': 3,
+    'items': [{'uuid': 'é-1', 'tags': [1, 2]}, 12345, 'three'],
+    'total': 3,
+}
+
+
+def split(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJSONArray(unittest.TestCase):
+    def test_items_of_key_for_every_chunk_size(self):
+        data = json.dumps(DOCUMENT, indent=1).encode()
+
+        for size in range(1, len(data) + 1):
+            items = list(iter_json_array(split(data, size), key='items'))
+
+            assert_that(items, equal_to(DOCUMENT['items']), f'chunk size {size}')
+
+    def test_numbers_split_at_every_offset(self):
+        numbers = [10.5, 2, -3e12, 1e-2, 0.25, -0, 1e3]
+        data = b'{"items": [10.5, 2, -3E+12, 1e-2, 0.25, -0, 1e3]}'
+
+        for offset in range(1, len(data)):
+            chunks = [data[:offset], data[offset:]]
+
+            items = list(iter_json_array(chunks, key='items'))
+
+            assert_that(items, equal_to(numbers), f'offset {offset}')
+
+    def test_top_level_array(self):
+        items = list(iter_json_array([b' [1, ', b'2', b'3] '], key=None))
+
+        assert_that(items, equal_to([1, 23]))
+
+    def test_empty_array(self):
+        items = list(iter_json_array([b'{"items": []}'], key='items'))
+
+        assert_that(items, equal_to([]))
+
+    def test_missing_key(self):
+        chunks = [b'{"total": 0}']
+
+        assert_that(
+            calling(list).with_args(iter_json_array(chunks, key='items')),
+            raises(ValueError, 'not found'),
+        )
+
+    def test_truncated_document(self):
+        chunks = [b'{"items": [1, {"a"']
+
+        assert_that(
+            calling(list).with_args(iter_json_array(chunks, key='items')),
+            raises(ValueError),
+        )
+
+
+class TestHTTPCommandStreaming(unittest.TestCase):
+    def setUp(self):
+        self.client = Mock()
+        self.session = self.client.session.return_value
+        self.response = MagicMock(status_code=200)
+        self.response.__enter__.return_value = self.response
+        self.session.request.return_value = self.response
+        self.command = HTTPCommand(self.client)
+
+    def test_stream_chunks(self):
+        self.response.iter_content.return_value = iter([b'ab', b'cd'])
+
+        chunks = list(self.command.stream('GET', 'url', chunk_size=2, params={'a': 1}))
+
+        assert_that(chunks, equal_to([b'ab', b'cd']))
+        self.session.request.assert_called_once_with(
+            'GET', 'url', stream=True, params={'a': 1}
+        )
+        self.response.iter_content.assert_called_once_with(2)
+
+    def test_stream_error(self):
+        self.response.status_code = 404
+        self.response.headers = {'Content-Type': 'application/json'}
+        self.response.content = b'{"message": "Not found"}'
+        self.response.raise_for_status.side_effect = HTTPError()
+
+        assert_that(
+            calling(list).with_args(self.command.stream('GET', 'url')),
+            raises(HTTPError),
+        )
+        self.response.iter_content.assert_not_called()
+        assert_that(self.response.reason, equal_to('Not found'))
+
+    def test_download(self):
+        self.response.iter_content.return_value = iter([b'ab', b'cd'])
+        fileobj = io.BytesIO()
+
+        size = self.command.download(fileobj, 'GET', 'url')
+
+        assert_that(size, equal_to(4))
+        assert_that(fileobj.getvalue(), equal_to(b'abcd'))
+
+    def test_iter_json_items(self):
+        self.response.iter_content.return_value = iter([b'{"items": [1,', b' 2]}'])
+
+        items = list(self.command.iter_json_items('GET', 'url'))
+
+        assert_that(items, equal_to([1, 2]))